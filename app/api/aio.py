@@ -0,0 +1,103 @@
+import inspect
+from fastapi import APIRouter, Depends, Response
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+from app.api.auth import get_current_user, get_current_user_async, get_current_user_read, get_current_user_read_async
+from app.db.session import get_db, get_async_db, get_read_db, get_async_read_db
+
+# Conversão dos routers síncronos em routers assíncronos (ASYNC_DB=true).
+# Cada rota passa a ser uma `async def` que recebe uma AsyncSession e executa o
+# corpo original via AsyncSession.run_sync: as mesmas validações e regras de
+# negócio, mas sem bloquear uma thread do threadpool por requisição.
+
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+    get_current_user: get_current_user_async,
+    get_current_user_read: get_current_user_read_async,
+}
+
+
+def _call_endpoint(session, endpoint, db_param, kwargs, adapter):
+    """
+    Executa a rota síncrona com a Session fornecida por run_sync.
+
+    A resposta é validada aqui dentro para que relacionamentos lazy
+    (ex.: Order.items) sejam carregados ainda no contexto assíncrono.
+    """
+    result = endpoint(**{**kwargs, db_param: session})
+    if adapter is None or isinstance(result, Response):
+        return result
+    return adapter.validate_python(result, from_attributes=True)
+
+
+def _async_endpoint(route: APIRoute):
+    signature = inspect.signature(route.endpoint)
+    db_param = None
+    parameters = []
+    for param in signature.parameters.values():
+        dependency = getattr(param.default, "dependency", None)
+        if isinstance(param.default, DependsParam) and dependency in ASYNC_DEPENDENCIES:
+            if dependency in (get_db, get_read_db):
+                db_param = param.name
+            param = param.replace(default=Depends(ASYNC_DEPENDENCIES[dependency]))
+        parameters.append(param)
+
+    adapter = TypeAdapter(route.response_model) if route.response_model else None
+
+    async def endpoint(**kwargs):
+        if db_param is None:
+            return route.endpoint(**kwargs)
+        db = kwargs[db_param]
+        return await db.run_sync(_call_endpoint, route.endpoint, db_param, kwargs, adapter)
+
+    endpoint.__name__ = route.endpoint.__name__
+    endpoint.__doc__ = route.endpoint.__doc__
+    endpoint.__signature__ = signature.replace(parameters=parameters)
+    return endpoint
+
+
+def keep_sync(endpoint):
+    """
+    Marca uma rota para continuar síncrona com ASYNC_DB (no threadpool, sobre
+    a Session síncrona): rotas com trabalho de CPU longo, que dentro de
+    run_sync bloqueariam o event loop.
+    """
+    endpoint.keep_sync = True
+    return endpoint
+
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    """
+    Retorna um novo APIRouter com as rotas de `router` convertidas para `async def`.
+
+    - Dependências get_db/get_read_db/get_current_user(_read) são trocadas pelas versões assíncronas.
+    - Rotas que já são assíncronas, ou marcadas com `keep_sync`, são mantidas como estão.
+    - Caminhos, modelos de resposta e o schema OpenAPI permanecem idênticos.
+    """
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute) or inspect.iscoroutinefunction(route.endpoint) or getattr(route.endpoint, "keep_sync", False):
+            async_router.routes.append(route)
+            continue
+        async_router.add_api_route(
+            route.path,
+            _async_endpoint(route),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            methods=route.methods,
+            operation_id=route.operation_id,
+            response_class=route.response_class,
+            name=route.name,
+            include_in_schema=route.include_in_schema,
+        )
+    return async_router
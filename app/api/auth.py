@@ -1,11 +1,13 @@
 from jose.exceptions import JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.principal_cache import cache_principal, load_cached_principal
 from app.core.security import decode_token
 from app.crud.users import get_user_by_email
 from app.db.models.users import User
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db, get_read_db, get_async_read_db
 
 # Dependência que extrai e valida o usuário autenticado a partir do token JWT
 # Utilizada em rotas protegidas para garantir que apenas usuários autenticados tenham acesso
@@ -19,7 +21,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     - Extrai o token do header Authorization: Bearer <token>
     - Valida o token usando a função decode_token
     - Recupera o e-mail do payload do token (campo 'sub')
-    - Busca o usuário no banco de dados
+    - Busca o usuário no cache de principals e, em caso de miss, no banco de dados
     - Retorna o objeto User se válido, ou lança HTTP 401 em caso de erro
     """
     credentials_exception = HTTPException(
@@ -37,9 +39,43 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
+    # Usuário em cache: reanexado à sessão atual sem consultar o banco
+    user = load_cached_principal(db, email)
+    if user is not None:
+        return user
+
     # Busca o usuário pelo e-mail extraído do token
     user = get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
 
-    return user  # Retorna o usuário autenticado
\ No newline at end of file
+    cache_principal(email, user)
+    return user  # Retorna o usuário autenticado
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    """
+    Versão assíncrona de get_current_user, usada quando ASYNC_DB está habilitado.
+
+    - Executa a mesma validação sobre a AsyncSession da requisição
+    - O usuário retornado fica vinculado a essa sessão
+    """
+    return await db.run_sync(lambda session: get_current_user(token, session))
+
+
+def get_current_user_read(token: str = Depends(oauth2_scheme), db: Session = Depends(get_read_db)) -> User:
+    """
+    get_current_user para rotas somente leitura.
+
+    - Resolve o usuário na mesma sessão da rota (get_read_db, uma por
+      requisição): em caso de miss no cache, a consulta não abre uma segunda
+      conexão no primário
+    """
+    return get_current_user(token, db)
+
+
+async def get_current_user_read_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_read_db)) -> User:
+    """
+    Versão assíncrona de get_current_user_read, usada quando ASYNC_DB está habilitado.
+    """
+    return await db.run_sync(lambda session: get_current_user(token, session))
@@ -1,38 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.clients import ClientCreate, ClientOut, ClientUpdate
-from app.db.models.clients import Client
 from app.db.models.users import User
-from app.crud.clients import create_client, get_client_by_id
+from app.crud.clients import CLIENT_KEY, create_client, get_client_by_id, get_clients, get_clients_out, search_clients
+from app.crud.pagination import set_next_cursor
 from app.crud.users import get_user_by_email, get_user_by_cpf
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_read
+from app.api.fast_json import fast_json_enabled, render
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 
 @router.get("/", response_model=list[ClientOut])
 def list_clients(
+    response: Response,
     name: str | None = Query(default=None),
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
 ):
     """
     Listar todos os clientes.
 
     - Apenas administradores podem acessar esta rota.
-    - Suporte a filtros por nome e paginação via `skip` e `limit`.
+    - Suporte a filtros por nome e paginação via `skip` e `limit`, ou por `cursor`.
+    - O cursor da próxima página é retornado no header `X-Next-Cursor`.
+    - Com `FAST_JSON`, a página é lida por colunas e serializada com orjson.
     """
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Acesso negado")
 
-    query = db.query(Client)
-    if name:
-        query = query.filter(Client.name.ilike(f"%{name}%"))
-    return query.offset(skip).limit(limit).all()
+    fetch = get_clients_out if fast_json_enabled() else get_clients
+    clients = fetch(db, skip, limit, name=name, cursor=cursor)
+    return render(set_next_cursor(response, clients, limit, CLIENT_KEY), response)
+
+
+@router.get("/search", response_model=list[ClientOut])
+def search(
+    q: str = Query(min_length=1),
+    skip: int = 0,
+    limit: int = Query(default=10, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
+):
+    """
+    Buscar clientes por trecho de nome ou endereço.
+
+    - Apenas administradores podem acessar esta rota.
+    - No Postgres, usa os índices trigram e ordena pela similaridade com `q`.
+    - Paginação via `skip` e `limit`.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    return search_clients(db, q, skip, limit)
 
 
 @router.post("/", response_model=ClientOut, status_code=status.HTTP_201_CREATED)
@@ -60,8 +85,8 @@ def create_new_client(
 @router.get("/{id}", response_model=ClientOut)
 def get_client(
     id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
 ):
     """
     Obter informações de um cliente específico.
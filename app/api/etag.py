@@ -0,0 +1,56 @@
+import hashlib
+from fastapi import Request, Response
+
+# GETs condicionais (ETag / If-None-Match).
+# O ETag é um hash dos valores que definem o conteúdo da resposta (colunas ou
+# snapshots em cache), calculado sem serializar o corpo. Quando o cliente já
+# possui a versão atual, a rota responde 304 sem corpo.
+
+
+def make_etag(*parts) -> str:
+    """
+    Gera um ETag forte a partir dos valores informados.
+    """
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def if_none_match(request: Request | None) -> str | None:
+    """
+    Retorna o header If-None-Match da requisição, se houver.
+    """
+    if request is None:
+        return None
+    return request.headers.get("if-none-match")
+
+
+def etag_matches(request: Request | None, etag: str) -> bool:
+    """
+    Verifica se o If-None-Match da requisição contém o ETag atual.
+
+    - Aceita `*` e listas separadas por vírgula.
+    - Usa comparação fraca (ignora o prefixo `W/`), como exige o If-None-Match.
+    """
+    header = if_none_match(request)
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def conditional_response(request: Request | None, response: Response | None, etag: str, body):
+    """
+    Retorna 304 se o cliente já possui `etag`; caso contrário, retorna `body`
+    com o header ETag.
+    """
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if response is not None:
+        response.headers["ETag"] = etag
+    return body
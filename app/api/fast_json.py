@@ -0,0 +1,42 @@
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from app.settings import settings
+
+# Caminho rápido de serialização das listagens (FAST_JSON=true).
+# As rotas montam os modelos de resposta uma única vez (via model_construct,
+# a partir das colunas selecionadas) e devolvem uma Response já serializada
+# com orjson. Como a rota retorna uma Response, o FastAPI não valida de novo
+# o conteúdo contra o response_model nem passa pelo jsonable_encoder.
+# O response_model continua declarado, então o schema OpenAPI não muda.
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def fast_json_enabled() -> bool:
+    return bool(settings.FAST_JSON)
+
+
+def render(content, response: Response | None = None):
+    """
+    Com FAST_JSON, serializa `content` com orjson, copiando os headers já
+    definidos em `response` (cursor, ETag). Sem FAST_JSON, ou se `content` já
+    for uma Response (ex.: 304), devolve `content` sem alterações.
+    """
+    if isinstance(content, Response) or not fast_json_enabled():
+        return content
+    headers = None
+    if response is not None:
+        headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return FastJSONResponse(content, headers=headers)
@@ -0,0 +1,38 @@
+import asyncio
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.db import session
+from app.db.warmup import readiness, ping
+from app.settings import settings
+
+# Sondas para o orquestrador. Não são convertidas por asyncify_router e não
+# exigem autenticação.
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness: o processo está de pé e respondendo.
+
+    - Não consulta o banco.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """
+    Readiness: o worker pode receber tráfego.
+
+    - Retorna 503 enquanto o pool não foi aquecido.
+    - Retorna 503 se o banco não responder a um SELECT 1 dentro do timeout.
+    """
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **readiness.snapshot()})
+    try:
+        await asyncio.wait_for(asyncio.to_thread(ping, session.engine), timeout=settings.READINESS_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "error": f"{type(e).__name__}: {e}"})
+    return {"status": "ready", "pool": session.get_pool_stats()}
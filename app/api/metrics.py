@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import request_metrics
+from app.db import session
+
+# Exposição das métricas para o Prometheus. Assim como as sondas de saúde,
+# não é convertida por asyncify_router e não exige autenticação: deve ficar
+# acessível apenas na rede interna.
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render_pool_metrics(stats: dict) -> str:
+    """
+    Métricas do pool de conexões (session.get_pool_stats) no formato texto.
+    """
+    lines = []
+    for name in ("checkouts", "checkins", "connects", "invalidations", "timeouts"):
+        lines += [f"# TYPE db_pool_{name}_total counter", f"db_pool_{name}_total {stats[name]}"]
+    for name in ("size", "checked_out", "idle", "overflow"):
+        if name in stats:
+            lines += [f"# TYPE db_pool_{name} gauge", f"db_pool_{name} {stats[name]}"]
+
+    wait = stats["wait_seconds"]
+    lines.append("# TYPE db_pool_wait_seconds histogram")
+    for bound, count in wait["buckets"].items():
+        le = bound if bound == "+Inf" else repr(float(bound))
+        lines.append(f'db_pool_wait_seconds_bucket{{le="{le}"}} {count}')
+    lines += [f"db_pool_wait_seconds_sum {wait['sum']}", f"db_pool_wait_seconds_count {wait['count']}"]
+    return "\n".join(lines) + "\n"
+
+
+def render_replica_metrics(stats: dict) -> str:
+    """
+    Estado das réplicas de leitura (session.get_replica_set) no formato texto.
+    """
+    lines = [
+        "# TYPE db_read_routed_total counter",
+        f'db_read_routed_total{{target="replica"}} {stats["replica_reads"]}',
+        f'db_read_routed_total{{target="primary"}} {stats["primary_reads"]}',
+        "# TYPE db_replica_healthy gauge",
+    ]
+    lines += [f'db_replica_healthy{{replica="{r["name"]}"}} {int(r["healthy"])}' for r in stats["replicas"]]
+    lines.append("# TYPE db_replica_lag_seconds gauge")
+    lines += [
+        f'db_replica_lag_seconds{{replica="{r["name"]}"}} {r["lag"]}'
+        for r in stats["replicas"] if r["lag"] is not None
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Métricas HTTP por rota, de SQL por requisição, do pool de conexões e
+    das réplicas de leitura.
+    """
+    body = (
+        request_metrics.render()
+        + render_pool_metrics(session.get_pool_stats())
+        + render_replica_metrics(session.get_replica_set().snapshot())
+    )
+    return Response(content=body, media_type=CONTENT_TYPE)
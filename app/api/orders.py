@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.schemas.orders import OrderCreate, OrderOut, OrderUpdate
-from app.crud.orders import create_order, get_order_by_id, list_orders, update_order, delete_order
-from app.api.auth import get_current_user
+from app.db import session
+from app.db.session import get_db, get_read_db
+from app.schemas.orders import OrderCreate, OrderOut, OrderUpdate, OrderBatchCreate, OrderBatchResult
+from app.crud.orders import ORDER_KEY, create_order, create_orders_batch, get_order_by_id, get_order_version, list_order_versions, list_orders, list_orders_out, update_order, delete_order
+from app.crud.pagination import set_next_cursor
+from app.crud.order_export import MEDIA_TYPES, export_orders
+from app.api.auth import get_current_user, get_current_user_read
+from app.api.etag import make_etag, if_none_match, etag_matches, not_modified, conditional_response
+from app.api.fast_json import fast_json_enabled, render
 from app.db.models.users import User
-from app.db.models.orders import Order
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+def order_etag(order) -> str:
+    """
+    ETag de um pedido a partir das colunas de versão (ORM ou linha de get_order_version).
+    """
+    return make_etag(order.id, order.client_id, order.status, order.created_at)
+
+
+def _can_access(user: User, client_id: int) -> bool:
+    return user.is_admin or (user.client is not None and client_id == user.client.id)
+
+
 @router.post("/", response_model=OrderOut)
 def create(
     client_order: OrderCreate,
@@ -27,56 +44,133 @@ def create(
     return create_order(db, current_user.client.id, client_order)
 
 
+@router.post("/batch", response_model=OrderBatchResult)
+def create_batch(
+    batch: OrderBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Criar vários pedidos em uma única requisição.
+
+    - Apenas clientes logados podem criar pedidos.
+    - `atomic=true` (padrão): se algum pedido falhar, nenhum é criado.
+    - `atomic=false`: cria os pedidos válidos e relata os que falharam.
+    - Retorna o resultado de cada pedido, na ordem enviada.
+    """
+    if not current_user.client:
+        raise HTTPException(status_code=403, detail="Apenas clientes podem criar pedidos")
+
+    results = create_orders_batch(db, current_user.client.id, batch.orders, atomic=batch.atomic)
+    created = sum(1 for result in results if result["order"] is not None)
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": [{**result, "success": result["order"] is not None} for result in results],
+    }
+
+
 @router.get("/", response_model=list[OrderOut])
 def list_all(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """
     Listar pedidos.
 
     - Administradores visualizam todos os pedidos.
     - Clientes visualizam apenas seus próprios pedidos.
-    - Suporte a paginação com `skip` e `limit`.
+    - Suporte a paginação com `skip` e `limit`, ou por `cursor`.
+    - O cursor da próxima página é retornado no header `X-Next-Cursor`.
+    - Retorna o header `ETag`; com `If-None-Match` igual, responde 304
+      consultando apenas as colunas de versão da página (sem os itens).
+    - Com `FAST_JSON`, a página é lida por colunas e serializada com orjson.
     """
     if current_user.is_admin:
-        return list_orders(db, skip, limit)
-
-    if not current_user.client:
+        filters = {}
+    elif current_user.client:
+        filters = {"client_id": current_user.client.id}
+    else:
         raise HTTPException(status_code=403, detail="Acesso negado: cliente não associado")
 
-    return (
-        db.query(Order)
-        .filter(Order.client_id == current_user.client.id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    if if_none_match(request):
+        versions = list_order_versions(db, skip, limit, cursor=cursor, **filters)
+        etag = make_etag([order_etag(version) for version in versions])
+        if etag_matches(request, etag):
+            result = not_modified(etag)
+            set_next_cursor(result, versions, limit, ORDER_KEY)
+            return result
+
+    fetch = list_orders_out if fast_json_enabled() else list_orders
+    orders = fetch(db, skip, limit, **filters, cursor=cursor)
+    set_next_cursor(response, orders, limit, ORDER_KEY)
+    etag = make_etag([order_etag(order) for order in orders])
+    return render(conditional_response(request, response, etag, orders), response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export(
+    request: Request,
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    status: str | None = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Exportar pedidos com seus itens em CSV ou NDJSON.
+
+    - Apenas administradores podem exportar pedidos.
+    - Filtros: período de criação (`start` inclusivo, `end` exclusivo) e `status`.
+    - O arquivo é gerado em stream a partir de um único snapshot do banco
+      (réplica de leitura, quando houver).
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+    return StreamingResponse(
+        export_orders(session.get_read_sessionmaker(request), format, start, end, status),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="pedidos.{format}"'},
     )
 
 
 @router.get("/{id}", response_model=OrderOut)
 def get(
     id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
 ):
     """
     Obter detalhes de um pedido específico.
 
     - Clientes podem acessar apenas seus próprios pedidos.
     - Administradores podem acessar qualquer pedido.
+    - Retorna o header `ETag`; com `If-None-Match` igual, responde 304
+      consultando apenas as colunas de versão do pedido.
     """
+    if if_none_match(request):
+        version = get_order_version(db, id)
+        if version and _can_access(current_user, version.client_id):
+            etag = order_etag(version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
     order = get_order_by_id(db, id)
     if not order:
         raise HTTPException(status_code=404, detail="Pedido não encontrado")
 
-    if not current_user.is_admin:
-        if not current_user.client or order.client_id != current_user.client.id:
-            raise HTTPException(status_code=403, detail="Acesso negado")
+    if not _can_access(current_user, order.client_id):
+        raise HTTPException(status_code=403, detail="Acesso negado")
 
-    return order
+    return conditional_response(request, response, order_etag(order), order)
 
 
 @router.put("/{id}", response_model=OrderOut)
@@ -1,36 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from app.db.session import get_db, get_read_db
+from app.api.aio import keep_sync
 from app.api.auth import get_current_user
-from app.schemas.products import ProductCreate, ProductUpdate, ProductOut
+from app.schemas.products import ProductCreate, ProductUpdate, ProductOut, ProductImportResult
 from app.crud.products import *
+from app.crud.pagination import set_next_cursor
+from app.api.etag import make_etag, conditional_response
+from app.api.fast_json import render
+from app.crud.product_import import FORMATS, detect_format, import_products
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 
 @router.get("/", response_model=list[ProductOut])
-def list_products(skip=0, limit=10, category=None, price=None, available=None, db=Depends(get_db)):
+def list_products(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    category: str | None = None,
+    price: float | None = None,
+    available: bool | None = None,
+    cursor: str | None = None,
+    db=Depends(get_read_db),
+):
     """
     Listar produtos com suporte a filtros.
 
     - Filtros disponíveis: categoria, preço e disponibilidade (`available`).
-    - Paginação com os parâmetros `skip` e `limit`.
+    - Paginação com os parâmetros `skip` e `limit`, ou por `cursor`.
+    - O cursor da próxima página é retornado no header `X-Next-Cursor`.
+    - Retorna o header `ETag`; com `If-None-Match` igual, responde 304.
+    - Com `FAST_JSON`, a página é serializada com orjson, sem revalidação.
     - Acessível a qualquer usuário autenticado.
     """
-    return get_products(db, skip, limit, category, price, available)
+    products = get_products_cached(db, skip, limit, category, price, available, cursor=cursor)
+    set_next_cursor(response, products, limit, PRODUCT_KEY)
+    return render(conditional_response(request, response, make_etag(products), products), response)
 
 
 @router.get("/{id}", response_model=ProductOut)
-def get(id: int, db=Depends(get_db)):
+def get(id: int, request: Request, response: Response, db=Depends(get_read_db)):
     """
     Obter informações de um produto específico pelo ID.
 
     - Retorna detalhes do produto.
+    - Retorna o header `ETag`; com `If-None-Match` igual, responde 304.
     - Retorna erro 404 se o produto não for encontrado.
     """
-    product = get_product_by_id(db, id)
+    product = get_product_cached(db, id)
     if not product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
-    return product
+    return conditional_response(request, response, make_etag(product), product)
 
 
 @router.post("/", response_model=ProductOut)
@@ -47,6 +68,37 @@ def create(product_in: ProductCreate, db=Depends(get_db), current_user=Depends(g
     return create_product(db, product_in)
 
 
+@router.post("/import", response_model=ProductImportResult)
+@keep_sync
+def import_file(
+    file: UploadFile = File(...),
+    format: str | None = Query(default=None, description="csv ou ndjson; padrão: deduzido do arquivo"),
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Importar produtos em massa a partir de um arquivo CSV ou NDJSON.
+
+    - Apenas administradores podem importar produtos.
+    - Colunas/campos iguais aos de criação de produto.
+    - Produtos com código de barras já cadastrado são atualizados.
+    - Código de barras repetido no arquivo: vale a última linha; as
+      anteriores são contadas em `duplicates`, não em `imported`.
+    - Linhas inválidas são ignoradas e listadas em `errors`.
+    - Os produtos são gravados em blocos; se o banco recusar um bloco, a
+      importação para e `aborted` indica as linhas do bloco, com os blocos
+      anteriores já gravados e contados.
+    - Continua síncrona com ASYNC_DB: a leitura e a validação do arquivo rodam
+      no threadpool, fora do event loop.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Acesso negado")
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail="Formato não suportado: use csv ou ndjson")
+    return import_products(db, file.file, fmt)
+
+
 @router.put("/{id}", response_model=ProductOut)
 def update(id: int, product_in: ProductUpdate, db=Depends(get_db), current_user=Depends(get_current_user)):
     """
@@ -0,0 +1,77 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.db.session import get_read_db
+from app.schemas.reports import DailySales, ProductSales, SectionSales
+from app.crud.sales import sales_by_day, sales_by_product, sales_by_section
+from app.api.auth import get_current_user_read
+from app.db.models.users import User
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+def _require_admin(user: User):
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Acesso permitido apenas para administradores")
+
+
+def _check_period(start: date | None, end: date | None):
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(status_code=400, detail="Período inválido: `start` deve ser anterior a `end`")
+
+
+@router.get("/sales/daily", response_model=list[DailySales])
+def daily(
+    start: date | None = None,
+    end: date | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
+):
+    """
+    Vendas por dia.
+
+    - Apenas administradores.
+    - Período: `start` inclusivo, `end` exclusivo (dias em UTC).
+    - Pedidos cancelados não contam.
+    """
+    _require_admin(current_user)
+    _check_period(start, end)
+    return sales_by_day(db, start, end)
+
+
+@router.get("/sales/products", response_model=list[ProductSales])
+def by_product(
+    start: date | None = None,
+    end: date | None = None,
+    section: str | None = None,
+    limit: int = Query(default=20, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
+):
+    """
+    Produtos com maior receita no período.
+
+    - Apenas administradores.
+    - Filtro opcional por `section`; `limit` produtos (padrão 20).
+    - `orders` é o número de pedidos que contêm o produto.
+    """
+    _require_admin(current_user)
+    _check_period(start, end)
+    return sales_by_product(db, start, end, section=section, limit=limit)
+
+
+@router.get("/sales/sections", response_model=list[SectionSales])
+def by_section(
+    start: date | None = None,
+    end: date | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
+):
+    """
+    Vendas por seção no período (seção atual de cada produto).
+
+    - Apenas administradores.
+    """
+    _require_admin(current_user)
+    _check_period(start, end)
+    return sales_by_section(db, start, end)
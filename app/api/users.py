@@ -1,31 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.core.security import verify_password, create_access_token
-from app.db.session import get_db
+from app.core.security import verify_password, password_needs_rehash, get_password_hash, create_access_token
+from app.db.session import get_db, get_read_db
 from app.db.models.users import User
 from app.schemas.users import UserCreate, UserOut
-from app.crud.users import create_user, get_user_by_id, get_user_by_cpf, get_user_by_email
-from app.api.auth import get_current_user
+from app.crud.users import USER_KEY, create_user, get_users, get_user_by_id, get_user_by_cpf, get_user_by_email
+from app.crud.pagination import set_next_cursor
+from app.api.auth import get_current_user, get_current_user_read
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.get("/users", response_model=list[UserOut])
 def list_users(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    response: Response,
+    skip: int = 0,
+    limit: int | None = None,
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user_read),
+    db: Session = Depends(get_read_db),
 ):
     """
     Lista todos os usuários cadastrados.
 
     - Requer autenticação.
     - Apenas administradores podem visualizar a lista.
+    - Sem `limit`, retorna todos; com `limit`, pagina por `skip` ou `cursor`.
+    - O cursor da próxima página é retornado no header `X-Next-Cursor`.
     """
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Acesso permitido apenas para administradores")
-    return db.query(User).all()
+    users = get_users(db, skip, limit, cursor=cursor)
+    return set_next_cursor(response, users, limit, USER_KEY)
 
 
 @router.get("/user", response_model=UserOut)
@@ -33,8 +41,8 @@ def get_user(
     id: int = Query(None),
     email: str = Query(None),
     cpf: str = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read),
 ):
     """
     Busca um usuário específico pelo ID, email ou CPF.
@@ -87,10 +95,14 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     - Requer campos `username` (email) e `password`.
     - Verifica as credenciais e retorna token JWT se válidas.
     - Retorna erro 401 se as credenciais forem inválidas.
+    - Regrava o hash da senha se o custo do bcrypt configurado tiver mudado.
     """
     user = get_user_by_email(db, form_data.username)
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(form_data.password)
+        db.commit()
     token = create_access_token({"sub": user.email})
     return {"access_token": token, "token_type": "bearer"}
 
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache em memória com expiração por tempo (TTL) e descarte LRU.
+
+    - `maxsize`: número máximo de entradas; ao exceder, a menos usada sai.
+      Com maxsize <= 0 o cache fica desabilitado (nada é armazenado).
+    - `ttl`: validade padrão das entradas, em segundos.
+    - Seguro para uso entre threads.
+    - Contadores de hits/misses/evictions/expirations para observabilidade.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self.timer():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None, expires_at: float | None = None):
+        """
+        Armazena `value`. A validade pode ser sobrescrita por `ttl` (segundos)
+        ou por `expires_at` (instante absoluto no relógio `timer`).
+        """
+        if self.maxsize <= 0:
+            return
+        if expires_at is None:
+            expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key) -> bool:
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def invalidate_where(self, predicate) -> int:
+        """
+        Remove todas as entradas cuja chave satisfaz `predicate`.
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
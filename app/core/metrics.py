@@ -0,0 +1,240 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+# Métricas HTTP por rota no formato texto do Prometheus (GET /metrics).
+# - latência por rota (histograma), requisições por status e em andamento
+# - comandos SQL e tempo de banco por requisição (histogramas), medidos pelos
+#   eventos before/after_cursor_execute dos engines instrumentados
+# A rota é o template do path (ex.: /orders/{id}), não a URL, para manter a
+# cardinalidade das séries limitada. O custo por requisição é um lock e
+# algumas somas; por comando SQL, dois perf_counter.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Rótulo das requisições que não casaram com nenhuma rota (404)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """
+    Acumulado de uma requisição: comandos SQL executados e tempo no banco.
+    A rota é lida do scope ASGI, preenchido pelo roteador do FastAPI.
+    """
+
+    __slots__ = ("scope", "statements", "db_seconds")
+
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope if scope is not None else {}
+        self.statements = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+# Requisição atual: visível também nas threads do threadpool e nas greenlets
+# do modo assíncrono, que copiam o contexto de quem as dispara
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """
+    Contagens por bucket (não cumulativas), soma e total de observações.
+    Não é thread-safe: protegido pelo lock do registro.
+    """
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip([*map(_format_bound, self.buckets), "+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _format_bound(bound) -> str:
+    return repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class RequestMetrics:
+    """
+    Registro das métricas HTTP do worker.
+
+    - requests: total por (método, rota, status)
+    - latency / statements / db_seconds: histogramas por (método, rota)
+    - in_progress: requisições em andamento por método (a rota só é
+      conhecida depois do roteamento)
+    """
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS, statement_buckets=STATEMENT_BUCKETS):
+        self.latency_buckets = tuple(latency_buckets)
+        self.statement_buckets = tuple(statement_buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests: dict[tuple, int] = {}
+            self.latency: dict[tuple, Histogram] = {}
+            self.statements: dict[tuple, Histogram] = {}
+            self.db_seconds: dict[tuple, Histogram] = {}
+            self.in_progress: dict[str, int] = {}
+            self.untracked_statements = 0
+            self.untracked_db_seconds = 0.0
+
+    def start(self, method: str):
+        with self._lock:
+            self.in_progress[method] = self.in_progress.get(method, 0) + 1
+
+    def finish(self, method: str, status: int, elapsed: float, stats: RequestStats):
+        key = (method, stats.route)
+        with self._lock:
+            self.in_progress[method] -= 1
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(self.latency_buckets)
+                self.statements[key] = Histogram(self.statement_buckets)
+                self.db_seconds[key] = Histogram(self.latency_buckets)
+            self.latency[key].observe(elapsed)
+            self.statements[key].observe(stats.statements)
+            self.db_seconds[key].observe(stats.db_seconds)
+
+    def observe_untracked(self, seconds: float):
+        """
+        Comandos SQL fora de uma requisição (warmup, tarefas de fundo).
+        """
+        with self._lock:
+            self.untracked_statements += 1
+            self.untracked_db_seconds += seconds
+
+    def render(self) -> str:
+        """
+        Exposição no formato texto do Prometheus (versão 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requisições HTTP concluídas.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+            lines += [
+                "# HELP http_requests_in_progress Requisições HTTP em andamento.",
+                "# TYPE http_requests_in_progress gauge",
+            ]
+            for method, count in sorted(self.in_progress.items()):
+                lines.append(f"http_requests_in_progress{{{_labels(method=method)}}} {count}")
+
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Latência das requisições HTTP.", self.latency),
+                ("http_request_db_statements", "Comandos SQL por requisição.", self.statements),
+                ("http_request_db_seconds", "Tempo no banco por requisição.", self.db_seconds),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    labels = _labels(method=method, route=route)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {sum(histogram.counts)}")
+
+            lines += [
+                "# HELP db_untracked_statements_total Comandos SQL fora de requisições HTTP.",
+                "# TYPE db_untracked_statements_total counter",
+                f"db_untracked_statements_total {self.untracked_statements}",
+                "# HELP db_untracked_seconds_total Tempo no banco fora de requisições HTTP.",
+                "# TYPE db_untracked_seconds_total counter",
+                f"db_untracked_seconds_total {self.untracked_db_seconds}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def instrument_engine(engine, metrics: RequestMetrics = request_metrics):
+    """
+    Registra os eventos de cursor que contam comandos SQL e tempo de banco
+    na requisição atual. Aceita o engine síncrono ou o `sync_engine` de um
+    AsyncEngine.
+    """
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request.get()
+        if stats is None:
+            metrics.observe_untracked(elapsed)
+            return
+        stats.statements += 1
+        stats.db_seconds += elapsed
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    return engine
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP e registra em `metrics`.
+
+    - O status é o da resposta enviada (500 se a aplicação falhar antes).
+    - A latência inclui o envio do corpo (respostas em stream).
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.start(method)
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            self.metrics.finish(method, status, time.perf_counter() - start, stats)
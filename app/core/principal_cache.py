@@ -0,0 +1,79 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import TTLCache
+from app.db.models.users import User
+from app.settings import settings
+
+# Cache dos usuários autenticados (principals), indexado pelo `sub` do token.
+# Guarda apenas os valores das colunas; a cada requisição o usuário é
+# reanexado à sessão atual via merge(load=False), sem SELECT. Relacionamentos
+# (ex.: user.client) continuam sendo carregados sob demanda pela sessão.
+#
+# O cache é por processo: as invalidações abaixo valem para o worker que fez
+# a alteração e o TTL limita por quanto tempo os demais podem ver dados antigos.
+
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL)
+
+# Alterações nestes campos mudam quem o usuário é ou o que ele pode fazer
+PRINCIPAL_FIELDS = ("email", "is_active", "is_admin", "hashed_password")
+
+_PENDING_KEY = "invalidated_principals"
+
+
+def cache_principal(subject: str, user: User):
+    """
+    Armazena um snapshot das colunas do usuário para o `sub` informado.
+    """
+    principal_cache.set(subject, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+
+
+def load_cached_principal(db: Session, subject: str) -> User | None:
+    """
+    Retorna o usuário do cache vinculado à sessão `db`, ou None em caso de miss.
+    """
+    data = principal_cache.get(subject)
+    if data is None:
+        return None
+    user = User(**data)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_principal(subject: str):
+    principal_cache.invalidate(subject)
+
+
+def _schedule_invalidation(target: User, emails: set):
+    session = Session.object_session(target)
+    if session is None:
+        for email in emails:
+            invalidate_principal(email)
+    else:
+        session.info.setdefault(_PENDING_KEY, set()).update(emails)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in PRINCIPAL_FIELDS):
+        return
+    # Invalida o e-mail atual e, em caso de troca, o anterior
+    emails = {target.email, *state.attrs.email.history.deleted}
+    _schedule_invalidation(target, {email for email in emails if email})
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User):
+    _schedule_invalidation(target, {target.email})
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    # Só invalida depois do commit: antes disso o valor antigo ainda é o vigente
+    for email in session.info.pop(_PENDING_KEY, ()):
+        invalidate_principal(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
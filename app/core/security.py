@@ -1,17 +1,109 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from app.core.cache import TTLCache
 from app.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max iguais ao custo configurado: hashes gerados com outro custo são
+# marcados por needs_update e regravados no próximo login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Fila do pool de hashing cheia: a requisição deve ser rejeitada (503)
+    em vez de esperar atrás das demais.
+    """
+
+
+class PasswordHasher:
+    """
+    Pool dedicado e limitado para as operações de bcrypt.
+
+    - O bcrypt libera o GIL, então threads bastam para tirar o custo de CPU
+      do threadpool de requisições e do event loop.
+    - `max_workers` limita quantos hashes rodam em paralelo.
+    - `max_pending` limita quantos podem aguardar na fila; acima disso a
+      chamada falha imediatamente com PasswordHasherBusy.
+    - No modo síncrono quem espera ocupa uma thread do threadpool: no máximo
+      `max_workers + max_pending` threads ficam presas em hashing.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+
+    def submit(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Fila de hashing de senhas cheia")
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, func, *args):
+        """
+        Executa `func` no pool e aguarda o resultado.
+
+        Dentro de AsyncSession.run_sync (ASYNC_DB) a espera é feita com
+        await, liberando o event loop; fora dele, bloqueia a thread atual.
+        """
+        future = self.submit(func, *args)
+        if in_greenlet():
+            return await_only(asyncio.wrap_future(future))
+        return future.result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_password_hasher = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _password_hasher
+    if _password_hasher is None:
+        with _password_hasher_lock:
+            if _password_hasher is None:
+                _password_hasher = PasswordHasher(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+                )
+    return _password_hasher
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_hasher().run(pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_hasher().run(pwd_context.verify, plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Indica se o hash foi gerado com um custo diferente do configurado.
+    Não executa bcrypt, apenas inspeciona o hash.
+    """
+    return pwd_context.needs_update(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=1000)) -> str:
@@ -21,8 +113,34 @@ def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+# Claims de tokens já verificados, indexados pelo SHA-256 do token.
+# Usa o relógio de parede para que cada entrada expire exatamente no `exp`.
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=0, timer=time.time)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 def decode_token(token: str) -> dict:
+    """
+    Decodifica e valida o token JWT.
+
+    Tokens já verificados são servidos do cache até o seu `exp`, sem repetir
+    a decodificação e a checagem da assinatura. Tokens sem `exp` não são
+    armazenados.
+    """
+    key = _token_digest(token)
+    claims = token_cache.get(key)
+    if claims is not None:
+        return dict(claims)
+
     try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError as e:
         raise e
+
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, dict(claims), expires_at=exp)
+    return claims
@@ -1,14 +1,88 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, joinedload
 from typing import Optional, List
-from app.db.models.clients import Client
-from app.schemas.clients import ClientCreate
+# app.db.base registra todos os modelos, necessário para configurar o
+# relacionamento usado nas opções de carregamento abaixo
+from app.db.base import Client, User
+from app.schemas.clients import ClientCreate, ClientOut
+from app.schemas.users import UserOut
+from app.crud.pagination import paginate
 
 
-def get_client_by_id(db: Session, client_id: int) -> Optional[Client]:
+# ClientOut inclui o usuário: carregado com JOIN na mesma consulta do cliente
+CLIENT_OPTIONS = (joinedload(Client.user),)
+
+# Chave de ordenação/cursor das listagens de clientes
+CLIENT_KEY = (Client.id,)
+
+def get_client_by_id(db: Session, client_id: int, options=CLIENT_OPTIONS) -> Optional[Client]:
+    """
+    Retorna um cliente pelo seu ID, com o usuário já carregado.
+    """
+    return db.query(Client).options(*options).filter(Client.id == client_id).first()
+
+def get_clients(db: Session, skip=0, limit=10, name: str | None = None, cursor=None, options=CLIENT_OPTIONS) -> List[Client]:
+    """
+    Lista clientes com filtro opcional por nome e paginação (skip/limit ou cursor).
+
+    O usuário de cada cliente vem na mesma consulta (uma ida ao banco por página).
+    No Postgres, o filtro por nome é atendido pelo índice trigram de `name`.
+    """
+    query = db.query(Client).options(*options)
+    if name:
+        query = query.filter(Client.name.ilike(f"%{name}%"))
+    return paginate(query, CLIENT_KEY, skip, limit, cursor).all()
+
+# Colunas de ClientOut e de UserOut (usuário do cliente, via JOIN)
+CLIENT_OUT_COLUMNS = tuple(getattr(Client, field) for field in ClientOut.model_fields if field != "user")
+USER_OUT_COLUMNS = tuple(getattr(User, field).label(f"user_{field}") for field in UserOut.model_fields)
+
+def get_clients_out(db: Session, skip=0, limit=10, name: str | None = None, cursor=None) -> List[ClientOut]:
+    """
+    Mesma listagem de `get_clients`, já como ClientOut.
+
+    Lê apenas as colunas da resposta (cliente JOIN usuário) e monta os modelos
+    sem validação (model_construct).
+    """
+    query = db.query(*CLIENT_OUT_COLUMNS, *USER_OUT_COLUMNS).join(User, Client.user_id == User.id)
+    if name:
+        query = query.filter(Client.name.ilike(f"%{name}%"))
+    clients = []
+    for row in paginate(query, CLIENT_KEY, skip, limit, cursor):
+        user = UserOut.model_construct(**{field: getattr(row, f"user_{field}") for field in UserOut.model_fields})
+        clients.append(ClientOut.model_construct(
+            **{column.key: getattr(row, column.key) for column in CLIENT_OUT_COLUMNS}, user=user,
+        ))
+    return clients
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _search_query(db: Session, q: str, dialect: str, options=CLIENT_OPTIONS):
+    """
+    Monta a consulta de busca de clientes por nome ou endereço.
+
+    - Postgres: ILIKE e similaridade trigram (`%`), ambos atendidos pelos
+      índices GIN pg_trgm, ordenados pela maior similaridade.
+    - Outros bancos: apenas ILIKE, ordenado por ID.
+    """
+    pattern = _like_pattern(q)
+    conditions = [Client.name.ilike(pattern, escape="\\"), Client.address.ilike(pattern, escape="\\")]
+    query = db.query(Client).options(*options)
+    if dialect == "postgresql":
+        score = func.greatest(func.similarity(Client.name, q), func.similarity(Client.address, q))
+        conditions += [Client.name.op("%")(q), Client.address.op("%")(q)]
+        return query.filter(or_(*conditions)).order_by(score.desc(), Client.id)
+    return query.filter(or_(*conditions)).order_by(Client.id)
+
+def search_clients(db: Session, q: str, skip=0, limit=10, options=CLIENT_OPTIONS) -> List[Client]:
     """
-    Retorna um cliente pelo seu ID.
+    Busca clientes por trecho de nome ou endereço, dos mais semelhantes aos
+    menos semelhantes (no Postgres), com paginação por skip/limit.
     """
-    return db.query(Client).filter(Client.id == client_id).first()
+    dialect = db.get_bind().dialect.name
+    return _search_query(db, q, dialect, options).offset(skip).limit(limit).all()
 
 def get_client_by_name(db: Session, name: str) -> List[Client]:
     """
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.base import Order, OrderItem
+
+# Exportação de pedidos com seus itens (CSV ou NDJSON) em stream.
+# Uma única consulta (pedidos JOIN itens) é lida com cursor do lado do
+# servidor (`yield_per`), em blocos de `batch_size` linhas, dentro de uma
+# transação somente leitura com snapshot (REPEATABLE READ no Postgres): o
+# arquivo reflete um único instante do banco e a memória usada não depende
+# da quantidade de pedidos exportados.
+
+FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+CSV_COLUMNS = (
+    "order_id", "client_id", "status", "created_at",
+    "item_id", "product_id", "quantity", "price",
+)
+
+
+def export_query(start: datetime | None = None, end: datetime | None = None, status: str | None = None):
+    """
+    Pedidos e itens no período [start, end), opcionalmente por status,
+    na ordem de criação.
+    """
+    query = (
+        select(
+            Order.id, Order.client_id, Order.status, Order.created_at,
+            OrderItem.id, OrderItem.product_id, OrderItem.quantity, OrderItem.price,
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .order_by(Order.created_at, Order.id, OrderItem.id)
+    )
+    if start is not None:
+        query = query.where(Order.created_at >= start)
+    if end is not None:
+        query = query.where(Order.created_at < end)
+    if status:
+        query = query.where(Order.status == status)
+    return query
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    """
+    created_at é anulável (pedidos antigos): vazio no CSV, null no NDJSON.
+    """
+    return value.isoformat() if value is not None else None
+
+
+def _csv_chunks(rows, batch_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        order_id, client_id, status, created_at, *item = row
+        writer.writerow([order_id, client_id, status, _isoformat(created_at), *item])
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows, batch_size: int) -> Iterator[str]:
+    """
+    Um objeto JSON por pedido, com os itens aninhados. As linhas chegam
+    ordenadas por pedido, então só o pedido atual fica em memória.
+    """
+    lines: list[str] = []
+    current = None
+    for order_id, client_id, status, created_at, item_id, product_id, quantity, price in rows:
+        if current is None or current["id"] != order_id:
+            if current is not None:
+                lines.append(json.dumps(current))
+            current = {
+                "id": order_id, "client_id": client_id, "status": status,
+                "created_at": _isoformat(created_at), "items": [],
+            }
+            if len(lines) >= batch_size:
+                yield "\n".join(lines) + "\n"
+                lines.clear()
+        if item_id is not None:
+            current["items"].append({"id": item_id, "product_id": product_id, "quantity": quantity, "price": price})
+    if current is not None:
+        lines.append(json.dumps(current))
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def export_orders(
+    session_factory: Callable[[], Session],
+    fmt: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    status: str | None = None,
+    batch_size: int = 1000,
+) -> Iterator[str]:
+    """
+    Gera o arquivo de exportação em blocos de texto.
+
+    - Abre a própria sessão: o stream continua depois que a rota retorna.
+    - No Postgres, a transação é REPEATABLE READ e somente leitura.
+    """
+    chunks = _csv_chunks if fmt == "csv" else _ndjson_chunks
+    with session_factory() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True})
+        rows = db.execute(export_query(start, end, status).execution_options(yield_per=batch_size))
+        yield from chunks(rows, batch_size)
@@ -1,59 +1,310 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from app.db.models.orders import Order, OrderItem
-from app.db.models.products import Product
-from app.schemas.orders import OrderCreate, OrderUpdate
+from sqlalchemy import case, false, insert, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+# app.db.base registra todos os modelos, necessário para configurar os
+# relacionamentos usados nas opções de carregamento abaixo
+from app.db.base import Order, OrderItem, Product
+from app.schemas.orders import OrderCreate, OrderItemOut, OrderOut, OrderUpdate
+from app.crud.pagination import paginate
+from app.crud.products import invalidate_products
+from app.crud.sales import add_order, apply_sales, is_cancelled, order_sales
 
 
-def create_order(db: Session, client_id: int, order_data: OrderCreate) -> Order:
+def decrement_stock(db: Session, quantities: dict[int, int]) -> dict[int, int]:
     """
-    Cria um pedido e seus itens, validando estoque e atualizando quantidades.
+    Baixa o estoque de vários produtos em um único UPDATE condicional:
+
+        SELECT id FROM products WHERE id IN (...) ORDER BY id FOR UPDATE  -- só Postgres
+
+        UPDATE products
+        SET stock = stock - CASE id WHEN ... END,
+            is_available = CASE WHEN stock - ... <= 0 THEN false ELSE is_available END
+        WHERE id IN (...) AND stock >= CASE id WHEN ... END
+        RETURNING id, stock, is_available
+
+    Só as linhas com estoque suficiente são alteradas; a checagem e a baixa
+    acontecem no mesmo comando, sem janela para venda acima do estoque e com
+    as linhas bloqueadas apenas até o fim da transação.
+    O Postgres não garante a ordem em que o UPDATE bloqueia as linhas do IN:
+    o SELECT ... FOR UPDATE as bloqueia antes, em ordem de id, para pedidos
+    concorrentes com produtos em comum não entrarem em deadlock.
+    Retorna {product_id: novo_estoque} das linhas atualizadas.
     """
-    order = Order(client_id=client_id)
-    db.add(order)
-    db.flush()
+    product_ids = sorted(quantities)
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(Product.id).where(Product.id.in_(product_ids)).order_by(Product.id).with_for_update())
 
+    quantity = case(quantities, value=Product.id)
+    remaining = Product.stock - quantity
+    stmt = (
+        update(Product)
+        .where(Product.id.in_(product_ids), Product.stock >= quantity)
+        .values(stock=remaining, is_available=case((remaining <= 0, false()), else_=Product.is_available))
+        .returning(Product.id, Product.stock, Product.is_available)
+        # Mantém coerentes os produtos já carregados na sessão
+        .execution_options(synchronize_session="fetch")
+    )
+    return {product_id: stock for product_id, stock, _ in db.execute(stmt).all()}
+
+def _quantities(order_data: OrderCreate) -> dict[int, int]:
+    """
+    Quantidade total por produto (o mesmo produto pode aparecer em várias linhas).
+    """
+    quantities = {}
     for item in order_data.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    return quantities
+
+def _load_products(db: Session, product_ids) -> dict[int, Product]:
+    if not product_ids:
+        return {}
+    return {product.id: product for product in db.query(Product).filter(Product.id.in_(sorted(product_ids))).all()}
+
+def _check_stock(quantities: dict[int, int], products: dict[int, Product], stock: dict[int, int]):
+    """
+    Lança HTTPException se algum produto não existir ou não tiver estoque
+    suficiente em `stock`.
+    """
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
         if not product:
-            raise HTTPException(status_code=404, detail=f"Produto ID {item.product_id} não encontrado")
+            raise HTTPException(status_code=404, detail=f"Produto ID {product_id} não encontrado")
 
-        if product.stock <= 0:
+        if stock[product_id] <= 0:
             raise HTTPException(status_code=400, detail=f"O produto '{product.description}' está esgotado")
 
-        if product.stock < item.quantity:
+        if stock[product_id] < quantity:
             raise HTTPException(status_code=400, detail=f"Estoque insuficiente para '{product.description}'")
 
-        product.stock -= item.quantity
+def create_order(db: Session, client_id: int, order_data: OrderCreate) -> Order:
+    """
+    Cria um pedido e seus itens, validando estoque e atualizando quantidades.
+
+    O número de idas ao banco não depende da quantidade de itens: os produtos
+    são lidos em uma consulta, o estoque é baixado em um UPDATE condicional,
+    os itens são inseridos em lote e o resumo de vendas é atualizado em um
+    único upsert.
+    """
+    quantities = _quantities(order_data)
+    products = _load_products(db, quantities)
+
+    # Validação antecipada com os valores lidos, para rejeitar sem escrever nada
+    _check_stock(quantities, products, {product_id: product.stock for product_id, product in products.items()})
 
-        order_item = OrderItem(
-            order_id=order.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            price=product.sale_price,
-        )
-        db.add(order_item)
+    if quantities:
+        updated = decrement_stock(db, quantities)
+        rejected = [product_id for product_id in quantities if product_id not in updated]
+        if rejected:
+            # Outro pedido consumiu o estoque entre a leitura e o UPDATE. A
+            # descrição é lida antes do rollback, que expira os produtos
+            description = products[rejected[0]].description
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"Estoque insuficiente para '{description}'")
+
+    order = Order(client_id=client_id)
+    db.add(order)
+    db.flush()
+
+    # Inserção de todos os itens em um único executemany
+    if order_data.items:
+        rows = [
+            {
+                "order_id": order.id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "price": products[item.product_id].sale_price,
+            }
+            for item in order_data.items
+        ]
+        db.execute(insert(OrderItem), rows)
+        apply_sales(db, add_order({}, order.created_at, ((row["product_id"], row["quantity"], row["price"]) for row in rows)))
 
     db.commit()
+    # Estoque (e possivelmente disponibilidade) mudou: invalida o catálogo
+    invalidate_products(quantities)
     db.refresh(order)
     return order
 
-def get_order_by_id(db: Session, order_id: int):
+# Resultado dos pedidos de um lote atômico que não falharam, mas não foram gravados
+BATCH_ABORTED = (424, "Lote não processado: outro pedido do lote falhou")
+
+# Tentativas de baixa de estoque quando pedidos concorrentes consomem o estoque lido
+BATCH_STOCK_ATTEMPTS = 3
+
+def create_orders_batch(db: Session, client_id: int, orders: list[OrderCreate], atomic: bool = True) -> list[dict]:
+    """
+    Cria vários pedidos de um cliente em uma única transação.
+
+    - Os produtos de todo o lote são lidos em uma consulta e o estoque é
+      validado pedido a pedido, na ordem do lote, descontando o que os pedidos
+      anteriores já reservaram.
+    - O estoque de todos os pedidos aceitos é baixado em um único UPDATE
+      condicional; pedidos e itens são inseridos em lote, e o resumo de
+      vendas de todo o lote é atualizado em um único upsert.
+    - `atomic=True`: se algum pedido falhar, nenhum é gravado.
+    - `atomic=False`: grava os pedidos válidos e relata os demais.
+
+    Retorna um resultado por pedido: {"index", "order", "status_code", "error"}.
+    """
+    quantities = [_quantities(order_data) for order_data in orders]
+    product_ids = set().union(*quantities) if quantities else set()
+    results = [{"index": index, "order": None, "status_code": None, "error": None} for index in range(len(orders))]
+
+    for attempt in range(BATCH_STOCK_ATTEMPTS):
+        products = _load_products(db, product_ids)
+        stock = {product_id: product.stock for product_id, product in products.items()}
+        accepted = []
+        for index, order_quantities in enumerate(quantities):
+            try:
+                _check_stock(order_quantities, products, stock)
+            except HTTPException as e:
+                results[index].update(status_code=e.status_code, error=e.detail)
+                continue
+            for product_id, quantity in order_quantities.items():
+                stock[product_id] -= quantity
+            results[index].update(status_code=None, error=None)
+            accepted.append(index)
+
+        if atomic and len(accepted) < len(orders):
+            for index in accepted:
+                results[index].update(status_code=BATCH_ABORTED[0], error=BATCH_ABORTED[1])
+            return results
+        if not accepted:
+            return results
+
+        totals = {}
+        for index in accepted:
+            for product_id, quantity in quantities[index].items():
+                totals[product_id] = totals.get(product_id, 0) + quantity
+        updated = decrement_stock(db, totals) if totals else {}
+        rejected = set(totals) - set(updated)
+        if not rejected:
+            break
+
+        # Outro pedido consumiu o estoque entre a leitura e o UPDATE: desfaz
+        # a baixa e valida de novo com o estoque atual
+        db.rollback()
+        if attempt == BATCH_STOCK_ATTEMPTS - 1:
+            for index in accepted:
+                results[index].update(status_code=409, error="Estoque alterado por outro pedido, tente novamente")
+            return results
+
+    # Pedidos do lote são idênticos até receberem itens: a ordem do RETURNING
+    # não importa, o que permite um único INSERT multi-linha
+    created = db.execute(insert(Order).returning(Order.id, Order.created_at), [{"client_id": client_id} for _ in accepted]).all()
+    order_ids = [order_id for order_id, _ in created]
+
+    # Itens de todos os pedidos em um único executemany
+    rows = [
+        {
+            "order_id": order_id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "price": products[item.product_id].sale_price,
+        }
+        for index, order_id in zip(accepted, order_ids)
+        for item in orders[index].items
+    ]
+    if rows:
+        db.execute(insert(OrderItem), rows)
+
+    deltas = {}
+    for index, (_, created_at) in zip(accepted, created):
+        items = orders[index].items
+        add_order(deltas, created_at, ((item.product_id, item.quantity, products[item.product_id].sale_price) for item in items))
+    apply_sales(db, deltas)
+
+    db.commit()
+    invalidate_products(totals)
+
+    loaded = {order.id: order for order in db.query(Order).options(*ORDER_LIST_OPTIONS).filter(Order.id.in_(order_ids))}
+    for index, order_id in zip(accepted, order_ids):
+        results[index]["order"] = loaded[order_id]
+    return results
+
+# Estratégias de carregamento de Order.items por tipo de consulta:
+# - pedido único: JOIN na mesma consulta
+# - listagens: um SELECT ... WHERE order_id IN (...) para a página inteira
+# Em ambos os casos a serialização de OrderOut.items não dispara novas consultas.
+ORDER_DETAIL_OPTIONS = (joinedload(Order.items),)
+ORDER_LIST_OPTIONS = (selectinload(Order.items),)
+
+# Chave de ordenação/cursor das listagens de pedidos
+ORDER_KEY = (Order.created_at, Order.id)
+
+def get_order_by_id(db: Session, order_id: int, options=ORDER_DETAIL_OPTIONS):
     """
-    Retorna um pedido pelo seu ID.
+    Retorna um pedido pelo seu ID, com os itens já carregados.
     """
-    return db.query(Order).filter(Order.id == order_id).first()
+    return db.query(Order).options(*options).filter(Order.id == order_id).first()
 
-def list_orders(db: Session, skip=0, limit=10):
+# Colunas que definem a versão de um pedido: os itens não mudam após a criação,
+# então id + status bastam para identificar o conteúdo (ETag)
+ORDER_VERSION_COLUMNS = (Order.id, Order.client_id, Order.status, Order.created_at)
+
+def get_order_version(db: Session, order_id: int):
+    """
+    Retorna apenas as colunas de versão de um pedido (sem carregar os itens).
+    """
+    return db.query(*ORDER_VERSION_COLUMNS).filter(Order.id == order_id).first()
+
+def list_orders(db: Session, skip=0, limit=10, client_id: int | None = None, cursor=None, options=ORDER_LIST_OPTIONS):
+    """
+    Lista pedidos com suporte a paginação (skip/limit ou cursor), opcionalmente
+    apenas de um cliente.
+
+    Os itens de todos os pedidos da página são carregados em uma única consulta.
+    """
+    query = db.query(Order).options(*options)
+    if client_id is not None:
+        query = query.filter(Order.client_id == client_id)
+    return paginate(query, ORDER_KEY, skip, limit, cursor).all()
+
+def list_order_versions(db: Session, skip=0, limit=10, client_id: int | None = None, cursor=None):
     """
-    Lista pedidos com suporte a paginação.
+    Colunas de versão dos pedidos da mesma página de `list_orders`, sem os itens.
     """
-    return db.query(Order).offset(skip).limit(limit).all()
+    query = db.query(*ORDER_VERSION_COLUMNS)
+    if client_id is not None:
+        query = query.filter(Order.client_id == client_id)
+    return paginate(query, ORDER_KEY, skip, limit, cursor).all()
+
+# Colunas de OrderItemOut, mais o pedido a que cada item pertence
+ORDER_ITEM_OUT_COLUMNS = (OrderItem.order_id, OrderItem.id, OrderItem.product_id, OrderItem.quantity, OrderItem.price)
+
+def list_orders_out(db: Session, skip=0, limit=10, client_id: int | None = None, cursor=None) -> list[OrderOut]:
+    """
+    Mesma listagem de `list_orders`, já como OrderOut.
+
+    - Lê apenas as colunas da resposta (sem entidades ORM na sessão).
+    - Duas consultas por página: pedidos e itens (WHERE order_id IN (...)).
+    - Os modelos são montados sem validação (model_construct): os valores
+      vêm do banco, já nos tipos declarados.
+    """
+    rows = list_order_versions(db, skip, limit, client_id=client_id, cursor=cursor)
+    if not rows:
+        return []
+
+    items: dict[int, list[OrderItemOut]] = {row.id: [] for row in rows}
+    item_rows = (
+        db.query(*ORDER_ITEM_OUT_COLUMNS)
+        .filter(OrderItem.order_id.in_(items))
+        .order_by(OrderItem.id)
+    )
+    for order_id, item_id, product_id, quantity, price in item_rows:
+        items[order_id].append(OrderItemOut.model_construct(id=item_id, product_id=product_id, quantity=quantity, price=price))
+    return [OrderOut.model_construct(**row._asdict(), items=items[row.id]) for row in rows]
 
 def update_order(db: Session, order: Order, order_in: OrderUpdate):
     """
     Atualiza o status de um pedido.
+
+    - Cancelar um pedido (CANCELLED_STATUSES) o retira do resumo de vendas;
+      reativá-lo o devolve.
     """
+    cancelled = is_cancelled(order_in.status)
+    if cancelled != is_cancelled(order.status):
+        apply_sales(db, add_order({}, order.created_at, order_sales(order), sign=-1 if cancelled else 1))
     order.status = order_in.status
     db.commit()
     db.refresh(order)
@@ -61,7 +312,9 @@ def update_order(db: Session, order: Order, order_in: OrderUpdate):
 
 def delete_order(db: Session, order: Order):
     """
-    Remove um pedido do banco de dados.
+    Remove um pedido do banco de dados, descontando-o do resumo de vendas.
     """
+    if not is_cancelled(order.status):
+        apply_sales(db, add_order({}, order.created_at, order_sales(order), sign=-1))
     db.delete(order)
     db.commit()
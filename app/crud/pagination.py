@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import date, datetime
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+# Paginação por cursor (keyset).
+# Em vez de OFFSET, que obriga o banco a ler e descartar `skip` linhas, a
+# próxima página é buscada a partir da chave da última linha vista:
+#     WHERE (created_at, id) > (:created_at, :id) ORDER BY created_at, id LIMIT :limit
+# o que é uma busca direta no índice, com custo constante em qualquer página.
+#
+# O cursor é opaco para o cliente: base64 (url-safe) do JSON com os valores
+# da chave. Ele é devolvido no header X-Next-Cursor, mantendo o corpo das
+# respostas (listas) inalterado para os clientes que usam skip/limit.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values) -> str:
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_columns) -> tuple:
+    """
+    Converte o cursor de volta para os valores da chave, no tipo de cada coluna.
+    Lança HTTP 400 se o cursor for inválido.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(key_columns):
+            raise ValueError(cursor)
+        values = []
+        for value, column in zip(raw, key_columns):
+            python_type = column.type.python_type
+            if python_type in (date, datetime):
+                values.append(python_type.fromisoformat(value))
+            else:
+                values.append(python_type(value))
+        return tuple(values)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def paginate(query, key_columns, skip=0, limit=10, cursor: str | None = None):
+    """
+    Ordena a consulta pela chave e aplica a página.
+
+    - Com `cursor`: filtra as linhas após a chave do cursor (skip é ignorado).
+    - Sem `cursor`: mantém o comportamento de skip/limit.
+    - limit=None retorna todas as linhas a partir do ponto inicial.
+    """
+    query = query.order_by(*key_columns)
+    if cursor:
+        values = decode_cursor(cursor, key_columns)
+        if len(key_columns) == 1:
+            query = query.filter(key_columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*key_columns) > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def next_cursor(items, limit, key_columns) -> str | None:
+    """
+    Cursor da próxima página, ou None se esta página for a última.
+    """
+    if limit is None or not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor([getattr(last, column.key) for column in key_columns])
+
+
+def set_next_cursor(response: Response | None, items, limit, key_columns):
+    """
+    Publica o cursor da próxima página no header X-Next-Cursor.
+    """
+    cursor = next_cursor(items, limit, key_columns)
+    if response is not None and cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return items
@@ -0,0 +1,218 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator
+from pydantic import ValidationError
+from sqlalchemy import Boolean, Column, Date, Float, Integer, MetaData, String, Table, Text, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+from app.db.models.products import Product
+from app.schemas.products import ProductCreate
+from app.crud.products import invalidate_products
+
+# Importação em massa do catálogo (CSV ou NDJSON).
+# O arquivo é lido como stream e validado em blocos de `chunk_size` linhas;
+# só um bloco fica em memória por vez, e o relatório guarda no máximo
+# `max_errors` erros, então o consumo de memória não depende do tamanho do
+# arquivo. Cada bloco é gravado e confirmado (commit) separadamente:
+# - Postgres: COPY para uma tabela temporária de staging, seguido de
+#   INSERT ... SELECT ... ON CONFLICT (barcode) DO UPDATE
+# - outros bancos: INSERT ... ON CONFLICT em lote
+# Se o banco recusar um bloco, ele é desfeito e a importação para: os blocos
+# anteriores continuam gravados e o relatório indica as linhas do bloco
+# (`aborted`).
+# Linhas repetidas com o mesmo código de barras: vale a última do arquivo.
+# `imported` conta os produtos gravados (linhas do upsert); as ocorrências
+# anteriores de um código repetido no mesmo bloco contam em `duplicates`.
+
+FORMATS = ("csv", "ndjson")
+
+# Campos de ProductCreate, na ordem das colunas de staging
+FIELDS = tuple(ProductCreate.model_fields)
+
+staging_table = Table(
+    "product_import_staging",
+    MetaData(),
+    Column("seq", Integer, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("sale_price", Float, nullable=False),
+    Column("barcode", String, nullable=False),
+    Column("section", String, nullable=False),
+    Column("stock", Integer, nullable=False),
+    Column("expiration_date", Date),
+    Column("image", String),
+    Column("is_available", Boolean, nullable=False),
+    prefixes=["TEMPORARY"],
+    # Esvaziada a cada commit: um bloco por transação
+    postgresql_on_commit="DELETE ROWS",
+)
+
+
+def detect_format(filename: str | None, content_type: str | None) -> str | None:
+    """
+    Deduz o formato pela extensão do arquivo ou pelo content type.
+    """
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def iter_rows(stream: BinaryIO, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Lê o arquivo linha a linha e gera (número da linha, dados, erro de leitura).
+
+    Em CSV, campos vazios viram None (campos opcionais ausentes).
+    """
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+    if fmt == "csv":
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            yield reader.line_num, {key: (value if value != "" else None) for key, value in row.items() if key}, None
+        return
+
+    for line_no, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"JSON inválido: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Cada linha deve ser um objeto JSON"
+            continue
+        yield line_no, data, None
+
+
+def _error_messages(error: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()]
+
+
+def _upsert_values(product: ProductCreate, seq: int) -> dict:
+    values = product.model_dump()
+    values["seq"] = seq
+    # Disponibilidade derivada do estoque importado
+    values["is_available"] = product.stock > 0
+    return values
+
+
+def _upsert_set(excluded) -> dict:
+    return {field: getattr(excluded, field) for field in FIELDS + ("is_available",)}
+
+
+def _load_copy(db: Session, rows: list[dict]) -> int:
+    """
+    Postgres: COPY do bloco para a staging e upsert a partir dela.
+    Retorna o número de produtos gravados.
+    """
+    conn = db.connection()
+    staging_table.create(conn, checkfirst=True)
+    columns = [column.name for column in staging_table.columns]
+
+    cursor = conn.connection.dbapi_connection.cursor()
+    if hasattr(cursor, "copy_expert"):
+        buffer = io.StringIO()
+        # Strings sempre entre aspas ("" é texto vazio); None também vira "",
+        # convertido em NULL pelo FORCE_NULL nas colunas opcionais
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerows([row[column] for column in columns] for row in rows)
+        buffer.seek(0)
+        nullable = ", ".join(column.name for column in staging_table.columns if column.nullable)
+        cursor.copy_expert(
+            f"COPY {staging_table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, FORCE_NULL ({nullable}))",
+            buffer,
+        )
+    else:
+        # Drivers sem COPY (ex.: asyncpg via run_sync): insert em lote na staging
+        db.execute(staging_table.insert(), rows)
+
+    source = ", ".join(FIELDS + ("is_available",))
+    updates = ", ".join(f"{field} = EXCLUDED.{field}" for field in FIELDS + ("is_available",))
+    result = db.execute(text(
+        f"INSERT INTO {Product.__tablename__} ({source}) "
+        f"SELECT DISTINCT ON (barcode) {source} FROM {staging_table.name} ORDER BY barcode, seq DESC "
+        f"ON CONFLICT (barcode) DO UPDATE SET {updates}"
+    ))
+    return result.rowcount
+
+
+def _load_insert(db: Session, rows: list[dict]) -> int:
+    """
+    Demais bancos (SQLite): upsert em lote, sem duplicatas no mesmo comando.
+    Retorna o número de produtos gravados.
+    """
+    latest = {row["barcode"]: row for row in rows}
+    values = [{key: value for key, value in row.items() if key != "seq"} for row in latest.values()]
+    stmt = sqlite.insert(Product)
+    stmt = stmt.on_conflict_do_update(index_elements=[Product.barcode], set_=_upsert_set(stmt.excluded))
+    db.execute(stmt, values)
+    # Cada código de barras distinto é inserido ou atualizado
+    return len(values)
+
+
+def _db_error(error: SQLAlchemyError) -> str:
+    """
+    Primeira linha do erro do driver (sem o SQL e os parâmetros do bloco).
+    """
+    original = getattr(error, "orig", None) or error
+    lines = str(original).strip().splitlines()
+    return f"{type(original).__name__}: {lines[0]}" if lines else type(original).__name__
+
+
+def import_products(db: Session, stream: BinaryIO, fmt: str, chunk_size: int = 5000, max_errors: int = 1000) -> dict:
+    """
+    Importa produtos de um arquivo CSV/NDJSON com upsert pelo código de barras.
+
+    - Valida cada linha com ProductCreate; linhas inválidas entram no relatório
+      de erros (até `max_errors`) e não interrompem a importação.
+    - Grava e confirma a cada `chunk_size` linhas válidas.
+    - Retorna contadores (`imported`: produtos gravados; `duplicates`: linhas
+      substituídas por uma ocorrência posterior do mesmo código de barras no
+      mesmo bloco) e a lista de erros por linha.
+    - Erro do banco em um bloco: o bloco é desfeito, a importação para e
+      `aborted` traz as linhas do bloco (`first_row`, `last_row`) e o erro;
+      os contadores refletem os blocos já confirmados.
+    """
+    load = _load_copy if db.get_bind().dialect.name == "postgresql" else _load_insert
+    result = {"processed": 0, "imported": 0, "duplicates": 0, "failed": 0, "errors": [], "aborted": None}
+    chunk: list[dict] = []
+
+    def flush() -> bool:
+        if not chunk:
+            return True
+        try:
+            written = load(db, chunk)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            result["aborted"] = {"first_row": chunk[0]["seq"], "last_row": chunk[-1]["seq"], "error": _db_error(e)}
+            return False
+        result["imported"] += written
+        result["duplicates"] += len(chunk) - written
+        chunk.clear()
+        return True
+
+    for line_no, data, error in iter_rows(stream, fmt):
+        result["processed"] += 1
+        messages = [error] if error else None
+        if data is not None:
+            try:
+                chunk.append(_upsert_values(ProductCreate.model_validate(data), line_no))
+            except ValidationError as e:
+                messages = _error_messages(e)
+        if messages:
+            result["failed"] += 1
+            if len(result["errors"]) < max_errors:
+                result["errors"].append({"row": line_no, "errors": messages})
+        if len(chunk) >= chunk_size and not flush():
+            break
+    else:
+        flush()
+
+    if result["imported"]:
+        invalidate_products()
+    return result
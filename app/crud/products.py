@@ -1,6 +1,61 @@
+import threading
 from sqlalchemy.orm import Session
 from app.db.models.products import Product
-from app.schemas.products import ProductCreate, ProductUpdate
+from app.schemas.products import ProductCreate, ProductUpdate, ProductOut
+from app.core.cache import TTLCache
+from app.crud.pagination import paginate
+from app.db.replicas import READ_YOUR_WRITES, REPLICA_SESSION
+from app.settings import settings
+
+# Chave de ordenação/cursor das listagens de produtos
+PRODUCT_KEY = (Product.id,)
+
+# Colunas de ProductOut, para montar respostas direto das linhas
+PRODUCT_OUT_COLUMNS = tuple(getattr(Product, field) for field in ProductOut.model_fields)
+
+# Cache do catálogo para as rotas de leitura.
+# Guarda snapshots ProductOut (nunca objetos ORM, que pertencem a uma sessão):
+# - ("product", id): detalhe de um produto
+# - ("products", category, price, available, skip, limit, cursor): uma página
+# Toda escrita em produtos (CRUD e baixa de estoque dos pedidos) invalida as
+# entradas afetadas após o commit. O TTL limita o tempo que outros workers
+# podem servir dados antigos.
+# Com réplicas de leitura, só leituras no primário preenchem o cache, e as
+# leituras logo após uma escrita do cliente (leia-o-que-escreveu) o ignoram.
+product_cache = TTLCache(maxsize=settings.PRODUCT_CACHE_SIZE, ttl=settings.PRODUCT_CACHE_TTL)
+
+# Incrementada a cada invalidação: uma leitura iniciada antes dela não grava
+# no cache o resultado (possivelmente antigo) que obteve do banco
+_cache_generation = 0
+_cache_generation_lock = threading.Lock()
+
+
+def invalidate_products(product_ids=None):
+    """
+    Remove do cache os produtos informados e todas as listagens.
+    Sem `product_ids`, limpa o cache inteiro.
+    """
+    global _cache_generation
+    with _cache_generation_lock:
+        _cache_generation += 1
+    if product_ids is None:
+        product_cache.clear()
+        return
+    ids = set(product_ids)
+    product_cache.invalidate_where(lambda key: key[0] == "products" or key[1] in ids)
+
+
+def product_cache_stats() -> dict:
+    return product_cache.stats()
+
+
+def _reads_cache(db: Session) -> bool:
+    return not db.info.get(READ_YOUR_WRITES, False)
+
+
+def _fills_cache(db: Session) -> bool:
+    return not db.info.get(REPLICA_SESSION, False)
+
 
 def get_product_by_id(db: Session, id: int):
     """
@@ -8,18 +63,67 @@ def get_product_by_id(db: Session, id: int):
     """
     return db.query(Product).filter(Product.id == id).first()
 
-def get_products(db: Session, skip=0, limit=10, category=None, price=None, available=None):
+def get_product_cached(db: Session, id: int) -> ProductOut | None:
     """
-    Lista produtos com suporte a filtros e paginação.
+    Versão em cache de get_product_by_id para rotas de leitura.
     """
-    query = db.query(Product)
+    key = ("product", id)
+    cached = product_cache.get(key) if _reads_cache(db) else None
+    if cached is not None:
+        return cached
+
+    generation = _cache_generation
+    product = get_product_by_id(db, id)
+    if product is None:
+        return None
+    snapshot = ProductOut.model_validate(product)
+    if generation == _cache_generation and _fills_cache(db):
+        product_cache.set(key, snapshot)
+    return snapshot
+
+def _filter_products(query, category=None, price=None, available=None):
     if category:
         query = query.filter(Product.section == category)
     if price is not None:
         query = query.filter(Product.sale_price <= price)
     if available is not None:
         query = query.filter(Product.is_available == available)
-    return query.offset(skip).limit(limit).all()
+    return query
+
+def get_products(db: Session, skip=0, limit=10, category=None, price=None, available=None, cursor=None):
+    """
+    Lista produtos com suporte a filtros e paginação (skip/limit ou cursor).
+    """
+    query = _filter_products(db.query(Product), category, price, available)
+    return paginate(query, PRODUCT_KEY, skip, limit, cursor).all()
+
+def get_products_cached(db: Session, skip=0, limit=10, category=None, price=None, available=None, cursor=None) -> list[ProductOut]:
+    """
+    Versão em cache de get_products para rotas de leitura, indexada pela
+    combinação normalizada de filtros e paginação.
+    """
+    key = (
+        "products",
+        category or None,
+        float(price) if price is not None else None,
+        bool(available) if available is not None else None,
+        skip if not cursor else 0,
+        limit,
+        cursor or None,
+    )
+    cached = product_cache.get(key) if _reads_cache(db) else None
+    if cached is not None:
+        return list(cached)
+
+    # Lê só as colunas de ProductOut e monta os snapshots sem validação nem
+    # acesso a atributos ORM (os valores vêm do banco, já nos tipos certos)
+    generation = _cache_generation
+    query = _filter_products(db.query(*PRODUCT_OUT_COLUMNS), category, price, available)
+    rows = paginate(query, PRODUCT_KEY, skip, limit, cursor).all()
+    snapshots = [ProductOut.model_construct(**row._asdict()) for row in rows]
+    if generation == _cache_generation and _fills_cache(db):
+        product_cache.set(key, tuple(snapshots))
+    return snapshots
 
 def create_product(db: Session, product_in: ProductCreate):
     """
@@ -28,6 +132,7 @@ def create_product(db: Session, product_in: ProductCreate):
     product = Product(**product_in.model_dump())
     db.add(product)
     db.commit()
+    invalidate_products(())
     db.refresh(product)
     return product
 
@@ -38,6 +143,7 @@ def update_product(db: Session, product: Product, product_in: ProductUpdate):
     for field, value in product_in.model_dump(exclude_unset=True).items():
         setattr(product, field, value)
     db.commit()
+    invalidate_products([product.id])
     db.refresh(product)
     return product
 
@@ -45,5 +151,7 @@ def delete_product(db: Session, product: Product):
     """
     Remove um produto do banco de dados.
     """
+    product_id = product.id
     db.delete(product)
     db.commit()
+    invalidate_products([product_id])
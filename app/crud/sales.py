@@ -0,0 +1,203 @@
+import argparse
+from datetime import date, datetime, time
+from sqlalchemy import delete, func, insert, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.db.base import Order, OrderItem, Product, SalesSummary
+
+# Resumo de vendas por (dia, produto) para os relatórios gerenciais.
+# - create_order, create_orders_batch, update_order (cancelamento) e
+#   delete_order aplicam a diferença no resumo na mesma transação do pedido,
+#   com um INSERT ... ON CONFLICT DO UPDATE em lote
+# - os relatórios leem só o resumo (e products, para descrição e seção), sem
+#   varrer order_items
+# - `rebuild_sales_summary` recalcula o resumo a partir do histórico
+#
+# Uso: python -m app.crud.sales [--start AAAA-MM-DD] [--end AAAA-MM-DD]
+
+# Pedidos com estes status não contam como venda
+CANCELLED_STATUSES = frozenset({"cancelled", "canceled", "cancelado"})
+
+SUMMARY_COLUMNS = ("orders", "quantity", "revenue")
+
+
+def is_cancelled(status) -> bool:
+    return status in CANCELLED_STATUSES
+
+
+def order_sales(order: Order):
+    """
+    Itens de um pedido já gravado como (product_id, quantity, price).
+    """
+    return ((item.product_id, item.quantity, item.price) for item in order.items)
+
+
+def add_order(deltas: dict, created_at: datetime, items, sign: int = 1) -> dict:
+    """
+    Acumula em `deltas` ({(dia, product_id): [pedidos, quantidade, receita]})
+    as vendas de um pedido.
+
+    - `items`: (product_id, quantity, price) de cada item.
+    - `sign=-1` desconta o pedido (remoção ou cancelamento).
+    - Pedidos antigos sem `created_at` não têm dia e ficam fora do resumo.
+    """
+    if created_at is None:
+        return deltas
+    day = created_at.date()
+    products = {}
+    for product_id, quantity, price in items:
+        entry = products.setdefault(product_id, [0, 0.0])
+        entry[0] += quantity
+        entry[1] += quantity * price
+    for product_id, (quantity, revenue) in products.items():
+        entry = deltas.setdefault((day, product_id), [0, 0, 0.0])
+        entry[0] += sign
+        entry[1] += sign * quantity
+        entry[2] += sign * revenue
+    return deltas
+
+
+def apply_sales(db: Session, deltas: dict):
+    """
+    Soma `deltas` ao resumo em um único INSERT ... ON CONFLICT DO UPDATE.
+
+    - As linhas são gravadas na ordem da chave, a mesma em todas as
+      transações, para pedidos concorrentes não se bloquearem em ciclo.
+    - Linhas que ficam sem pedidos (descontos) são removidas, filtrando só os
+      pares (dia, produto) descontados.
+    - Não faz commit: roda na transação de quem grava o pedido.
+    """
+    rows = [
+        {"day": day, "product_id": product_id, "orders": orders, "quantity": quantity, "revenue": revenue}
+        for (day, product_id), (orders, quantity, revenue) in sorted(deltas.items())
+    ]
+    if not rows:
+        return
+
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(SalesSummary)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SalesSummary.day, SalesSummary.product_id],
+        set_={column: getattr(SalesSummary, column) + getattr(stmt.excluded, column) for column in SUMMARY_COLUMNS},
+    )
+    db.execute(stmt, rows)
+
+    discounted = [(row["day"], row["product_id"]) for row in rows if row["orders"] < 0]
+    if discounted:
+        db.execute(
+            delete(SalesSummary).where(
+                SalesSummary.orders <= 0,
+                tuple_(SalesSummary.day, SalesSummary.product_id).in_(discounted),
+            )
+        )
+
+
+def rebuild_sales_summary(db: Session, start: date | None = None, end: date | None = None) -> int:
+    """
+    Recalcula o resumo a partir dos pedidos não cancelados e com data: todo o
+    histórico ou só os dias em [start, end). Retorna as linhas gravadas.
+
+    No Postgres, o resumo fica bloqueado para escrita (LOCK TABLE ... IN
+    EXCLUSIVE MODE) até o commit: pedidos gravados durante a reconstrução
+    esperam e são somados depois, sem contagem dupla nem perdida.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE sales_summary IN EXCLUSIVE MODE"))
+
+    remove = delete(SalesSummary)
+    conditions = [Order.created_at.isnot(None), or_(Order.status.is_(None), Order.status.notin_(CANCELLED_STATUSES))]
+    if start is not None:
+        remove = remove.where(SalesSummary.day >= start)
+        conditions.append(Order.created_at >= datetime.combine(start, time.min))
+    if end is not None:
+        remove = remove.where(SalesSummary.day < end)
+        conditions.append(Order.created_at < datetime.combine(end, time.min))
+    db.execute(remove)
+
+    day = func.date(Order.created_at)
+    history = (
+        select(
+            day,
+            OrderItem.product_id,
+            func.count(OrderItem.order_id.distinct()),
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.quantity * OrderItem.price),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(*conditions)
+        .group_by(day, OrderItem.product_id)
+    )
+    result = db.execute(insert(SalesSummary).from_select(["day", "product_id", *SUMMARY_COLUMNS], history))
+    db.commit()
+    return result.rowcount
+
+
+def _period(query, start: date | None, end: date | None):
+    if start is not None:
+        query = query.filter(SalesSummary.day >= start)
+    if end is not None:
+        query = query.filter(SalesSummary.day < end)
+    return query
+
+
+def sales_by_day(db: Session, start: date | None = None, end: date | None = None):
+    """
+    Quantidade e receita por dia no período [start, end).
+    """
+    query = db.query(
+        SalesSummary.day,
+        func.sum(SalesSummary.quantity).label("quantity"),
+        func.sum(SalesSummary.revenue).label("revenue"),
+    )
+    return _period(query, start, end).group_by(SalesSummary.day).order_by(SalesSummary.day).all()
+
+
+def sales_by_product(db: Session, start: date | None = None, end: date | None = None, section: str | None = None, limit: int = 20):
+    """
+    Produtos com maior receita no período, opcionalmente de uma seção.
+    """
+    revenue = func.sum(SalesSummary.revenue)
+    query = (
+        db.query(
+            SalesSummary.product_id,
+            Product.description,
+            Product.section,
+            func.sum(SalesSummary.orders).label("orders"),
+            func.sum(SalesSummary.quantity).label("quantity"),
+            revenue.label("revenue"),
+        )
+        .join(Product, Product.id == SalesSummary.product_id)
+    )
+    if section is not None:
+        query = query.filter(Product.section == section)
+    query = _period(query, start, end).group_by(SalesSummary.product_id, Product.description, Product.section)
+    return query.order_by(revenue.desc(), SalesSummary.product_id).limit(limit).all()
+
+
+def sales_by_section(db: Session, start: date | None = None, end: date | None = None):
+    """
+    Quantidade e receita por seção (seção atual do produto) no período.
+    """
+    revenue = func.sum(SalesSummary.revenue)
+    query = (
+        db.query(
+            Product.section,
+            func.sum(SalesSummary.quantity).label("quantity"),
+            revenue.label("revenue"),
+        )
+        .join(Product, Product.id == SalesSummary.product_id)
+    )
+    return _period(query, start, end).group_by(Product.section).order_by(revenue.desc()).all()
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Recalcula o resumo de vendas a partir dos pedidos.")
+    parser.add_argument("--start", type=date.fromisoformat, help="primeiro dia (padrão: todo o histórico)")
+    parser.add_argument("--end", type=date.fromisoformat, help="dia seguinte ao último")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rows = rebuild_sales_summary(db, args.start, args.end)
+    print(f"Resumo de vendas recalculado: {rows} linhas.")
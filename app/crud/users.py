@@ -2,7 +2,18 @@ from sqlalchemy.orm import Session
 from app.db.models.users import User
 from app.schemas.users import UserCreate
 from app.core.security import get_password_hash
+from app.crud.pagination import paginate
 
+# Chave de ordenação/cursor da listagem de usuários
+USER_KEY = (User.id,)
+
+
+def get_users(db: Session, skip=0, limit=None, cursor=None):
+    """
+    Lista usuários. Sem `limit`, retorna todos (comportamento original);
+    com `limit`, pagina por skip/limit ou cursor.
+    """
+    return paginate(db.query(User), USER_KEY, skip, limit, cursor).all()
 
 def get_user_by_id(db: Session, user_id: int):
     """
@@ -2,4 +2,5 @@ from app.db.base_class import Base
 from app.db.models.users import User
 from app.db.models.clients import Client
 from app.db.models.products import Product
-from app.db.models.orders import Order, OrderItem
\ No newline at end of file
+from app.db.models.orders import Order, OrderItem
+from app.db.models.sales import SalesSummary
\ No newline at end of file
@@ -0,0 +1,95 @@
+import argparse
+from contextlib import contextmanager
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from app.db.base import Base
+
+# Aplicação dos índices declarados nos modelos em um banco já existente.
+# `create_all` só cria índices junto com tabelas novas; aqui cada índice que
+# falta em uma tabela existente é criado individualmente, sem recriar nada.
+# No Postgres usa CREATE INDEX CONCURRENTLY, que não bloqueia escritas.
+#
+# Uso: python -m app.db.indexes [--dry-run]
+
+
+def _applies_to(index, dialect_name: str) -> bool:
+    """
+    Respeita `Index.ddl_if(dialect=...)` (ex.: índices trigram só no Postgres).
+    """
+    condition = index._ddl_if
+    if condition is None or condition.dialect is None:
+        return True
+    if isinstance(condition.dialect, str):
+        return condition.dialect == dialect_name
+    return dialect_name in condition.dialect
+
+
+def missing_indexes(engine: Engine) -> list:
+    """
+    Índices declarados nos modelos que ainda não existem no banco.
+    Tabelas inexistentes são ignoradas (serão criadas com seus índices).
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing:
+                continue
+            if not _applies_to(index, engine.dialect.name):
+                continue
+            missing.append(index)
+    return missing
+
+
+@contextmanager
+def _concurrently(index, dialect_name: str):
+    if dialect_name != "postgresql":
+        yield
+        return
+    options = index.dialect_options["postgresql"]
+    previous = options["concurrently"]
+    options["concurrently"] = True
+    try:
+        yield
+    finally:
+        options["concurrently"] = previous
+
+
+def apply_indexes(engine: Engine, dry_run: bool = False) -> list[str]:
+    """
+    Cria os índices que faltam e retorna seus nomes.
+
+    - Cada índice é criado em sua própria instrução (autocommit), então uma
+      falha não desfaz os anteriores e a execução pode ser repetida.
+    - `dry_run=True` apenas lista o que seria criado.
+    """
+    indexes = missing_indexes(engine)
+    if dry_run:
+        return [index.name for index in indexes]
+
+    dialect_name = engine.dialect.name
+    created = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if dialect_name == "postgresql":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index in indexes:
+            print(f"Criando índice {index.name} em {index.table.name}...")
+            with _concurrently(index, dialect_name):
+                index.create(conn, checkfirst=True)
+            created.append(index.name)
+    return created
+
+
+if __name__ == "__main__":
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Aplica ao banco os índices declarados nos modelos.")
+    parser.add_argument("--dry-run", action="store_true", help="apenas lista os índices que faltam")
+    args = parser.parse_args()
+
+    names = apply_indexes(engine, dry_run=args.dry_run)
+    print("\n".join(names) if names else "Nenhum índice pendente.")
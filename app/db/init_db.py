@@ -1,16 +1,28 @@
+import sys
 import time
 from sqlalchemy.exc import OperationalError
 from app.db.session import engine
 from app.db.base import Base
+from app.db.indexes import apply_indexes
 
-def init_db(max_retries: int = 10, delay: int = 2):
+# Bootstrap do schema, executado uma única vez por deploy (não pelos workers):
+#     python -m app.db.init_db
+# Cria as tabelas que faltam e os índices que faltam em tabelas existentes.
+
+def init_db(max_retries: int = 10, delay: int = 2) -> bool:
     for attempt in range(max_retries):
         try:
             print(f"Tentando conectar ao banco... Tentativa {attempt + 1}")
             Base.metadata.create_all(bind=engine)
             print("Tabelas criadas com sucesso.")
-            return
+            apply_indexes(engine)
+            return True
         except OperationalError as e:
             print(f"Banco ainda não está pronto: {e}")
             time.sleep(delay)
     print("Falha ao conectar ao banco após várias tentativas.")
+    return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if init_db() else 1)
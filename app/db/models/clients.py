@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -8,7 +8,23 @@ class Client(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     address = Column(String, nullable=False)
-    phone_number = Column(String, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    phone_number = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     user = relationship("User", back_populates="client")
-    orders = relationship("Order", back_populates="client")
\ No newline at end of file
+    orders = relationship("Order", back_populates="client")
+
+    # Índices trigram (pg_trgm) para busca por trechos de nome/endereço:
+    # atendem ILIKE '%termo%' e o operador de similaridade (%) sem varrer a
+    # tabela. Criados apenas no Postgres.
+    __table_args__ = (
+        Index("ix_clients_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_clients_address_trgm", "address", postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
+
+
+# A extensão precisa existir antes da criação dos índices GIN acima
+event.listen(
+    Client.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, Text, Index, text
 from app.db.base_class import Base
 
 
@@ -13,4 +13,17 @@ class Product(Base):
     stock = Column(Integer, nullable=False)
     expiration_date = Column(Date, nullable=True)
     image = Column(String, nullable=True)
-    is_available = Column(Boolean, default=True)
\ No newline at end of file
+    is_available = Column(Boolean, default=True)
+
+    # Índices para os filtros de get_products:
+    # - composto: seção + disponibilidade + faixa de preço
+    # - parcial: só produtos disponíveis, na ordem de paginação (id)
+    __table_args__ = (
+        Index("ix_products_section_available_price", "section", "is_available", "sale_price"),
+        Index(
+            "ix_products_available_id",
+            "id",
+            postgresql_where=text("is_available"),
+            sqlite_where=text("is_available = 1"),
+        ),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer
+from app.db.base_class import Base
+
+
+class SalesSummary(Base):
+    __tablename__ = "sales_summary"
+
+    # Vendas agregadas por dia (UTC, de Order.created_at) e produto, mantidas
+    # por app.crud.sales na mesma transação que grava ou remove os pedidos.
+    # `orders` conta os pedidos do dia que contêm o produto.
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+    # A chave primária atende aos períodos (day, ...); este índice, ao
+    # histórico de um produto
+    __table_args__ = (
+        Index("ix_sales_summary_product_day", "product_id", "day"),
+    )
@@ -0,0 +1,131 @@
+import bisect
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Instrumentação do pool de conexões.
+# Contadores alimentados pelos eventos de pool do SQLAlchemy e histograma do
+# tempo de espera no checkout, usados para dimensionar o pool por worker.
+
+# Limites (em segundos) dos buckets do histograma de espera
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """
+    Acumula métricas de um pool de conexões.
+
+    - checkouts/checkins/connects/invalidations: totais desde o início
+    - wait_buckets: histograma cumulativo do tempo de espera no checkout
+    - timeouts: checkouts que estouraram pool_timeout
+    """
+
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_counts = [0] * (len(self.buckets) + 1)
+            self.wait_sum = 0.0
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            self.wait_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.wait_sum += seconds
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool=None) -> dict:
+        """
+        Retorna um dicionário com os contadores e, se `pool` for informado,
+        o estado atual (conexões em uso, ociosas e em overflow).
+        """
+        with self._lock:
+            cumulative = []
+            total = 0
+            for count in self.wait_counts:
+                total += count
+                cumulative.append(total)
+            data = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds": {
+                    "buckets": dict(zip([*map(str, self.buckets), "+Inf"], cumulative)),
+                    "count": total,
+                    "sum": self.wait_sum,
+                },
+            }
+        if pool is not None:
+            data.update(pool_status(pool))
+        return data
+
+
+def pool_status(pool) -> dict:
+    """
+    Estado instantâneo de um QueuePool.
+    """
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mede quanto tempo cada checkout esperou por uma conexão.
+
+    - `recreate()` (engine.dispose(), invalidação do pool) repassa `metrics`
+      ao novo pool: os contadores continuam monotônicos.
+    """
+
+    metrics: PoolMetrics = None
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.increment("timeouts")
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - start)
+
+
+def instrument_pool(pool, metrics: PoolMetrics) -> PoolMetrics:
+    """
+    Registra os listeners de eventos do pool que alimentam `metrics`.
+
+    - Os listeners acompanham o pool recriado (o SQLAlchemy repassa o
+      dispatch em `recreate()`).
+    """
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics = metrics
+
+    event.listen(pool, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(pool, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(pool, "checkin", lambda *args: metrics.increment("checkins"))
+    event.listen(pool, "invalidate", lambda *args: metrics.increment("invalidations"))
+    return metrics
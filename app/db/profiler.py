@@ -0,0 +1,165 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from sqlalchemy import event
+
+# Perfil dos comandos SQL por requisição (SQL_PROFILER_ENABLED=true).
+# - agrupa os comandos de cada requisição pela "impressão digital" do SQL
+#   (literais e parâmetros trocados por ?, listas IN colapsadas)
+# - registra em log os comandos acima de SLOW_QUERY_MS, com a rota de origem
+# - ao fim da requisição, aponta formatos repetidos N_PLUS_ONE_THRESHOLD
+#   vezes ou mais como provável N+1
+# Nos testes, `record_queries` coleta tudo o que um engine executa dentro de
+# um bloco, para verificar o orçamento de consultas de cada rota.
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Formato normalizado de um comando SQL: mesmo texto para consultas que só
+    diferem nos valores (ex.: `WHERE id = 1` e `WHERE id = 2`).
+    """
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    sql = _ROWS.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryProfile:
+    """
+    Comandos executados em uma requisição (ou bloco), agrupados por
+    fingerprint: {fingerprint: [quantidade, segundos]}.
+    """
+
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope if scope is not None else {}
+        self.queries: dict[str, list] = {}
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "-")
+
+    @property
+    def count(self) -> int:
+        return sum(count for count, _ in self.queries.values())
+
+    @property
+    def seconds(self) -> float:
+        return sum(seconds for _, seconds in self.queries.values())
+
+    def record(self, statement: str, seconds: float):
+        entry = self.queries.setdefault(fingerprint(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Formatos executados `threshold` vezes ou mais (prováveis N+1), do mais
+        repetido para o menos.
+        """
+        found = [(sql, count) for sql, (count, _) in self.queries.items() if count >= threshold]
+        return sorted(found, key=lambda item: -item[1])
+
+    def summary(self) -> str:
+        lines = [f"{self.count} comandos SQL em {self.seconds * 1000:.1f} ms"]
+        for sql, (count, seconds) in sorted(self.queries.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {count}x {seconds * 1000:.1f} ms  {sql}")
+        return "\n".join(lines)
+
+    def assert_budget(self, max_queries: int):
+        """
+        Falha se o bloco executou mais de `max_queries` comandos.
+        """
+        if self.count > max_queries:
+            raise AssertionError(f"Orçamento de {max_queries} consultas excedido: {self.summary()}")
+
+
+# Perfil da requisição atual (None fora de requisições ou sem o profiler)
+current_profile: ContextVar[QueryProfile | None] = ContextVar("current_profile", default=None)
+
+
+def profile_engine(engine, slow_query_ms: float = 200):
+    """
+    Registra os eventos de cursor que alimentam o perfil da requisição atual
+    e o log de consultas lentas. Aceita o engine síncrono ou o `sync_engine`
+    de um AsyncEngine.
+    """
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profiler_start"].pop()
+        profile = current_profile.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+        if elapsed * 1000 >= slow_query_ms:
+            route = profile.route if profile is not None else "-"
+            logger.warning("Consulta lenta (%.1f ms) em %s: %s", elapsed * 1000, route, fingerprint(statement))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    return engine
+
+
+@contextmanager
+def record_queries(engine):
+    """
+    Coleta todos os comandos executados por `engine` dentro do bloco,
+    independentemente da thread (ex.: rotas chamadas via TestClient).
+    """
+    profile = QueryProfile()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile.record(statement, 0.0)
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield profile
+    finally:
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+
+class SQLProfilerMiddleware:
+    """
+    Middleware ASGI que abre um perfil por requisição HTTP e, ao final,
+    aponta prováveis N+1 (warning) e o resumo por fingerprint (debug).
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(scope)
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_profile.reset(token)
+            self.report(scope["method"], profile)
+
+    def report(self, method: str, profile: QueryProfile):
+        for sql, count in profile.repeated(self.n_plus_one_threshold):
+            logger.warning("Provável N+1 em %s %s: %dx %s", method, profile.route, count, sql)
+        if profile.queries and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s: %s", method, profile.route, profile.summary())
@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import itertools
+import threading
+import time
+from sqlalchemy import text
+from app.core.cache import TTLCache
+
+# Réplicas de leitura (DATABASE_REPLICA_URLS).
+# As rotas somente leitura recebem a sessão por `get_read_db`, que escolhe uma
+# réplica em round-robin entre as saudáveis e com atraso (lag) abaixo de
+# REPLICA_MAX_LAG_SECONDS; sem réplica disponível, a leitura vai para o
+# primário. O estado das réplicas é atualizado em segundo plano
+# (`ReplicaSet.monitor`), nunca no caminho da requisição: até a primeira
+# verificação, todas as leituras vão para o primário.
+#
+# Leia-o-que-escreveu: depois de uma escrita bem-sucedida, as leituras do
+# mesmo cliente vão para o primário durante READ_YOUR_WRITES_SECONDS. O
+# cliente é identificado pelo header Authorization (ou pelo IP, se anônimo)
+# no worker que atendeu a escrita, e por um cookie nos demais workers.
+
+# Atraso de replicação no Postgres: zero se a réplica já aplicou tudo o que
+# recebeu (ou se não está em recuperação); senão, idade da última transação
+# aplicada
+PG_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+WRITE_COOKIE = "primary_reads_until"
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Marcas em Session.info das sessões de leitura, usadas pelo cache de produtos:
+# - REPLICA_SESSION: sessão em uma réplica (pode estar atrasada); não preenche
+#   o cache, senão uma leitura antiga voltaria a ele depois da invalidação
+# - READ_YOUR_WRITES: leitura no primário logo após uma escrita do cliente;
+#   não lê do cache, que em outro worker pode ser anterior à escrita
+REPLICA_SESSION = "replica"
+READ_YOUR_WRITES = "read_your_writes"
+
+
+def replica_urls(value: str | None) -> list[str]:
+    """
+    URLs das réplicas a partir de DATABASE_REPLICA_URLS (separadas por vírgula).
+    """
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+
+def measure_lag(conn) -> float:
+    """
+    Atraso da réplica em segundos (0 fora do Postgres).
+    """
+    if conn.dialect.name != "postgresql":
+        conn.execute(text("SELECT 1"))
+        return 0.0
+    return float(conn.execute(PG_LAG_QUERY).scalar() or 0)
+
+
+class Replica:
+    """
+    Uma réplica: engine e sessões síncronas, sessões assíncronas (criadas sob
+    demanda) e o último estado verificado.
+    """
+
+    def __init__(self, name: str, engine, session_factory, async_session_factory=None):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self.healthy = False
+        self.lag: float | None = None
+        self.checked_at: float | None = None
+        self.last_error: str | None = None
+
+    def check(self, timer=time.monotonic):
+        try:
+            with self.engine.connect() as conn:
+                self.lag = measure_lag(conn)
+            self.healthy = True
+            self.last_error = None
+        except Exception as e:
+            self.healthy = False
+            self.last_error = f"{type(e).__name__}: {e}"
+        self.checked_at = timer()
+
+    def snapshot(self) -> dict:
+        return {"name": self.name, "healthy": self.healthy, "lag": self.lag, "last_error": self.last_error}
+
+
+class ReplicaSet:
+    """
+    Seleção das réplicas de leitura.
+
+    - `pick()`: próxima réplica saudável em round-robin com lag <= `max_lag`,
+      ou None (leitura no primário).
+    - `stale_after`: réplicas sem verificação recente (monitor parado) deixam
+      de ser usadas.
+    - Contadores de leituras em réplica e de desvios para o primário,
+      atualizados sob lock (chamados das threads do threadpool).
+    """
+
+    def __init__(self, replicas: list[Replica], max_lag: float, stale_after: float, timer=time.monotonic):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.stale_after = stale_after
+        self.timer = timer
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def usable(self, replica: Replica, now: float) -> bool:
+        return (
+            replica.healthy
+            and replica.lag is not None
+            and replica.lag <= self.max_lag
+            and now - replica.checked_at <= self.stale_after
+        )
+
+    def pick(self) -> Replica | None:
+        if self.replicas:
+            now = self.timer()
+            start = next(self._next)
+            for offset in range(len(self.replicas)):
+                replica = self.replicas[(start + offset) % len(self.replicas)]
+                if self.usable(replica, now):
+                    self.increment("replica_reads")
+                    return replica
+        self.increment("primary_reads")
+        return None
+
+    def check(self):
+        for replica in self.replicas:
+            replica.check(self.timer)
+
+    async def monitor(self, interval: float, sleep=asyncio.sleep):
+        """
+        Verifica as réplicas a cada `interval` segundos, fora do event loop.
+        """
+        while True:
+            await asyncio.to_thread(self.check)
+            await sleep(interval)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            replica_reads, primary_reads = self.replica_reads, self.primary_reads
+        return {
+            "replicas": [replica.snapshot() for replica in self.replicas],
+            "replica_reads": replica_reads,
+            "primary_reads": primary_reads,
+        }
+
+
+def client_key(headers, client) -> str:
+    """
+    Identifica o cliente pelas credenciais (Authorization) ou, sem elas, pelo IP.
+    """
+    authorization = headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    return f"ip:{client[0] if client else '-'}"
+
+
+class RecentWrites:
+    """
+    Clientes que escreveram nos últimos `window` segundos (neste worker).
+    """
+
+    def __init__(self, window: float, maxsize: int = 100_000):
+        self.window = window
+        self._cache = TTLCache(maxsize=maxsize, ttl=window)
+
+    def mark(self, key: str):
+        self._cache.set(key, True)
+
+    def recent(self, key: str) -> bool:
+        return self._cache.get(key, False)
+
+
+def wrote_recently(request, recent_writes: RecentWrites) -> bool:
+    """
+    A requisição vem de um cliente que escreveu dentro da janela? Confere o
+    registro deste worker e o cookie deixado pela escrita (outros workers).
+    """
+    if recent_writes.recent(client_key(request.headers, request.client)):
+        return True
+    try:
+        return float(request.cookies.get(WRITE_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que registra as escritas bem-sucedidas (métodos além de
+    GET/HEAD/OPTIONS com status < 400) e devolve o cookie com o fim da janela.
+    """
+
+    def __init__(self, app, recent_writes: RecentWrites):
+        self.app = app
+        self.recent_writes = recent_writes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+                self.recent_writes.mark(client_key(headers, scope.get("client")))
+                window = self.recent_writes.window
+                cookie = f"{WRITE_COOKIE}={time.time() + window:.3f}; Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,9 +1,46 @@
+from functools import partial
+from typing import Callable
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.metrics import instrument_engine
+from app.db.profiler import profile_engine
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics, instrument_pool
+from app.db.replicas import READ_YOUR_WRITES, REPLICA_SESSION, RecentWrites, Replica, ReplicaSet, replica_urls, wrote_recently
 from app.settings import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+def pool_options() -> dict:
+    """
+    Parâmetros de pool lidos de Settings, compartilhados pelos engines
+    síncrono e assíncrono.
+    """
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument(engine):
+    """
+    Métricas por requisição e profiler de SQL, conforme Settings. Aceita o
+    engine síncrono ou o `sync_engine` de um AsyncEngine.
+    """
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    if settings.SQL_PROFILER_ENABLED:
+        profile_engine(engine, settings.SLOW_QUERY_MS)
+    return engine
+
+
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options())
+pool_metrics = instrument_pool(engine.pool, PoolMetrics())
+instrument(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -13,3 +50,118 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Engine assíncrono: criado sob demanda para que o driver (asyncpg) só seja
+# exigido quando ASYNC_DB estiver habilitado.
+async_engine = None
+AsyncSessionLocal = None
+
+def get_async_database_url(url: str | None = None) -> str:
+    """
+    Retorna a URL do banco para o driver assíncrono.
+
+    - Usa ASYNC_DATABASE_URL quando definida (banco primário).
+    - Caso contrário, troca o driver de DATABASE_URL (ou de `url`) por asyncpg.
+    """
+    if url is None:
+        if settings.ASYNC_DATABASE_URL:
+            return settings.ASYNC_DATABASE_URL
+        url = settings.DATABASE_URL
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = create_async_engine(get_async_database_url(), **pool_options())
+        instrument(async_engine.sync_engine)
+        # expire_on_commit=False: atributos continuam acessíveis após o commit
+        # sem disparar I/O fora do contexto assíncrono
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    return AsyncSessionLocal
+
+def get_pool_stats() -> dict:
+    """
+    Métricas do pool do engine síncrono: conexões em uso, ociosas, overflow
+    e histograma de espera no checkout.
+    """
+    return pool_metrics.snapshot(engine.pool)
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+# Réplicas de leitura: criadas sob demanda (sem DATABASE_REPLICA_URLS, o
+# conjunto fica vazio e toda leitura vai para o primário)
+replica_set = None
+recent_writes = None
+
+def get_replica_set() -> ReplicaSet:
+    global replica_set
+    if replica_set is None:
+        replicas = []
+        for index, url in enumerate(replica_urls(settings.DATABASE_REPLICA_URLS), start=1):
+            replica_engine = instrument(create_engine(url, **pool_options()))
+            replicas.append(Replica(
+                f"replica-{index}",
+                replica_engine,
+                sessionmaker(autocommit=False, autoflush=False, bind=replica_engine, info={REPLICA_SESSION: True}),
+            ))
+        replica_set = ReplicaSet(
+            replicas,
+            max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+            stale_after=3 * settings.REPLICA_CHECK_INTERVAL,
+        )
+    return replica_set
+
+def get_recent_writes() -> RecentWrites:
+    global recent_writes
+    if recent_writes is None:
+        recent_writes = RecentWrites(settings.READ_YOUR_WRITES_SECONDS)
+    return recent_writes
+
+def route_read(request: Request | None) -> tuple[Replica | None, dict]:
+    """
+    Destino das leituras desta requisição: a réplica, ou None para o primário
+    (sem réplica saudável, ou cliente que escreveu há pouco), e o `info` da
+    sessão de leitura.
+    """
+    replicas = get_replica_set()
+    if request is not None and wrote_recently(request, get_recent_writes()):
+        replicas.increment("primary_reads")
+        return None, {READ_YOUR_WRITES: True}
+    return replicas.pick(), {}
+
+def get_read_sessionmaker(request: Request | None = None) -> Callable[[], Session]:
+    replica, info = route_read(request)
+    factory = replica.session_factory if replica else SessionLocal
+    return partial(factory, info=info) if info else factory
+
+def get_read_db(request: Request):
+    """
+    Sessão para rotas somente leitura: réplica quando disponível, senão o primário.
+    """
+    db = get_read_sessionmaker(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_async_replica_sessionmaker(replica: Replica) -> async_sessionmaker:
+    if replica.async_session_factory is None:
+        replica_engine = create_async_engine(get_async_database_url(replica.engine.url.render_as_string(hide_password=False)), **pool_options())
+        instrument(replica_engine.sync_engine)
+        replica.async_session_factory = async_sessionmaker(
+            bind=replica_engine, autoflush=False, expire_on_commit=False, info={REPLICA_SESSION: True},
+        )
+    return replica.async_session_factory
+
+async def get_async_read_db(request: Request):
+    replica, info = route_read(request)
+    factory = get_async_replica_sessionmaker(replica) if replica else get_async_sessionmaker()
+    async with factory(info=info) as db:
+        yield db
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import text
+
+# Aquecimento do pool na inicialização do worker.
+# O schema não é criado aqui (ver `python -m app.db.init_db`): o worker apenas
+# abre as primeiras conexões do pool, tentando de novo com backoff exponencial
+# assíncrono enquanto o banco não responde. Até lá /readyz responde 503 e o
+# orquestrador não envia tráfego para o worker.
+
+logger = logging.getLogger(__name__)
+
+
+class PoolReadiness:
+    """
+    Estado do aquecimento do pool, consultado por /readyz.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error: str | None = None
+        self.ready_at: float | None = None
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "ready_at": self.ready_at,
+        }
+
+
+readiness = PoolReadiness()
+
+
+def ping(engine) -> None:
+    """
+    Executa um SELECT 1 em uma conexão do pool.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def warm_pool(engine, connections: int) -> None:
+    """
+    Abre `connections` conexões ao mesmo tempo e as devolve ao pool, onde
+    ficam ociosas prontas para as primeiras requisições.
+    """
+    opened = []
+    try:
+        for _ in range(max(connections, 1)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+async def warm_async_pool(async_engine, connections: int) -> None:
+    opened = []
+    try:
+        for _ in range(max(connections, 1)):
+            conn = await async_engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
+async def warm_up(
+    engine,
+    connections: int = 2,
+    async_engine=None,
+    max_attempts: int = 0,
+    initial_delay: float = 0.5,
+    max_delay: float = 10,
+    state: PoolReadiness = readiness,
+    sleep=asyncio.sleep,
+) -> bool:
+    """
+    Aquece o pool com backoff exponencial sem bloquear o event loop.
+
+    - O checkout síncrono roda em uma thread (asyncio.to_thread).
+    - `max_attempts=0` tenta indefinidamente.
+    - Retorna True quando o pool está pronto; False se desistir.
+    """
+    delay = initial_delay
+    while True:
+        state.attempts += 1
+        try:
+            await asyncio.to_thread(warm_pool, engine, connections)
+            if async_engine is not None:
+                await warm_async_pool(async_engine, connections)
+        except Exception as e:
+            state.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("Banco ainda não está pronto (tentativa %d): %s", state.attempts, state.last_error)
+            if max_attempts and state.attempts >= max_attempts:
+                return False
+            await sleep(delay)
+            delay = min(delay * 2, max_delay)
+            continue
+        state.ready = True
+        state.last_error = None
+        state.ready_at = time.time()
+        return True
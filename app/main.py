@@ -1,15 +1,75 @@
-from fastapi import FastAPI
-from app.db.init_db import init_db
-from app.api import users, clients, products, orders
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.api import users, clients, products, orders, reports, health, metrics
+from app.api.aio import asyncify_router
+from app.core.metrics import MetricsMiddleware
+from app.core.security import PasswordHasherBusy
+from app.db import session
+from app.db.profiler import SQLProfilerMiddleware
+from app.db.replicas import ReadYourWritesMiddleware
+from app.db.warmup import warm_up
+from app.settings import settings
 
 app = FastAPI()
-app.include_router(users.router)
-app.include_router(clients.router)
-app.include_router(products.router)
-app.include_router(orders.router)
 
-init_db()
+routers = [users.router, clients.router, products.router, orders.router, reports.router]
+if settings.ASYNC_DB:
+    # Rotas `async def` sobre AsyncSession em vez do threadpool
+    routers = [asyncify_router(router) for router in routers]
 
+for router in routers:
+    app.include_router(router)
+
+app.include_router(health.router)
+
+if settings.METRICS_ENABLED:
+    # Latência, status e SQL por rota, expostos em /metrics
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if settings.SQL_PROFILER_ENABLED:
+    # SQL por requisição agrupado por fingerprint; consultas lentas e N+1 no log
+    app.add_middleware(SQLProfilerMiddleware, n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD)
+
+replicas = session.get_replica_set()
+if replicas.replicas:
+    # Leituras de quem acabou de escrever ficam no primário por alguns segundos
+    app.add_middleware(ReadYourWritesMiddleware, recent_writes=session.get_recent_writes())
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Fila de bcrypt cheia: falha rápida para o cliente tentar novamente
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Serviço de autenticação sobrecarregado, tente novamente"},
+        headers={"Retry-After": "1"},
+    )
+
+# O schema é criado pelo bootstrap (`python -m app.db.init_db`), não pelos
+# workers. Na inicialização o worker só aquece o pool, em segundo plano: ele
+# já responde /healthz e passa em /readyz quando o banco estiver acessível.
 @app.on_event("startup")
-def on_startup():
-    init_db()
+async def on_startup():
+    async_engine = None
+    if settings.ASYNC_DB:
+        session.get_async_sessionmaker()
+        async_engine = session.async_engine
+    app.state.warmup_task = asyncio.create_task(warm_up(
+        session.engine,
+        connections=settings.DB_WARMUP_CONNECTIONS,
+        async_engine=async_engine,
+        initial_delay=settings.DB_WARMUP_INITIAL_DELAY,
+        max_delay=settings.DB_WARMUP_MAX_DELAY,
+    ))
+    app.state.replica_task = None
+    if replicas.replicas:
+        app.state.replica_task = asyncio.create_task(replicas.monitor(settings.REPLICA_CHECK_INTERVAL))
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    app.state.warmup_task.cancel()
+    if app.state.replica_task is not None:
+        app.state.replica_task.cancel()
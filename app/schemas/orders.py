@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class OrderItemCreate(BaseModel):
@@ -28,4 +28,22 @@ class OrderOut(BaseModel):
         from_attributes = True
 
 class OrderUpdate(BaseModel):
-    status: str
\ No newline at end of file
+    status: str
+# Limite de pedidos por requisição em POST /orders/batch
+MAX_BATCH_ORDERS = 500
+
+class OrderBatchCreate(BaseModel):
+    orders: list[OrderCreate] = Field(min_length=1, max_length=MAX_BATCH_ORDERS)
+    atomic: bool = True
+
+class OrderBatchItemResult(BaseModel):
+    index: int
+    success: bool
+    order: OrderOut | None = None
+    status_code: int | None = None
+    error: str | None = None
+
+class OrderBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: list[OrderBatchItemResult]
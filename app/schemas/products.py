@@ -28,4 +28,20 @@ class ProductOut(ProductBase):
     is_available: bool
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+class ProductImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+class ProductImportAborted(BaseModel):
+    first_row: int
+    last_row: int
+    error: str
+
+class ProductImportResult(BaseModel):
+    processed: int
+    imported: int
+    duplicates: int
+    failed: int
+    errors: list[ProductImportRowError]
+    aborted: ProductImportAborted | None = None
@@ -0,0 +1,33 @@
+from typing import Annotated
+from pydantic import AfterValidator, BaseModel
+from datetime import date
+
+# Somas de preços em float: arredondadas para centavos na resposta
+Revenue = Annotated[float, AfterValidator(lambda value: round(value, 2))]
+
+class DailySales(BaseModel):
+    day: date
+    quantity: int
+    revenue: Revenue
+
+    class Config:
+        from_attributes = True
+
+class ProductSales(BaseModel):
+    product_id: int
+    description: str
+    section: str
+    orders: int
+    quantity: int
+    revenue: Revenue
+
+    class Config:
+        from_attributes = True
+
+class SectionSales(BaseModel):
+    section: str
+    quantity: int
+    revenue: Revenue
+
+    class Config:
+        from_attributes = True
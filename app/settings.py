@@ -8,6 +8,60 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
 
+    # Hashing de senhas (bcrypt)
+    # No modo síncrono, cada login admitido (WORKERS + MAX_PENDING) prende uma
+    # thread do threadpool do Starlette (40 por padrão) até o hash terminar:
+    # mantenha a soma bem abaixo desse limite, com MAX_PENDING em poucas
+    # vezes WORKERS
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 6
+
+    # Cache de usuários autenticados (get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: float = 60
+
+    # Cache de tokens já verificados (decode_token)
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Cache do catálogo de produtos
+    PRODUCT_CACHE_SIZE: int = 1024
+    PRODUCT_CACHE_TTL: float = 30
+
+    # Pool de conexões (por worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Réplicas de leitura (URLs separadas por vírgula) para as rotas GET
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    REPLICA_CHECK_INTERVAL: float = 5
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    # Aquecimento do pool na inicialização e sonda /readyz
+    DB_WARMUP_CONNECTIONS: int = 2
+    DB_WARMUP_INITIAL_DELAY: float = 0.5
+    DB_WARMUP_MAX_DELAY: float = 10
+    READINESS_TIMEOUT: float = 2
+
+    # Métricas por rota em /metrics (middleware + eventos de cursor)
+    METRICS_ENABLED: bool = True
+
+    # Perfil de SQL por requisição: log de consultas lentas e de prováveis N+1
+    SQL_PROFILER_ENABLED: bool = False
+    SLOW_QUERY_MS: float = 200
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Serialização das listagens com orjson, sem a validação do response_model
+    FAST_JSON: bool = False
+
+    # Camada assíncrona do banco (AsyncSession + asyncpg)
+    ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
     model_config = {
         "env_file": ".env",
         "extra": "allow"
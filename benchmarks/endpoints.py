@@ -0,0 +1,272 @@
+"""
+Benchmark das rotas mais usadas, com clientes concorrentes.
+
+Sobe app.main:app no próprio processo (transporte ASGI do httpx, sem rede)
+sobre um banco local populado com benchmarks.synthetic_data e mede, por
+cenário, latência p50/p95/p99, requisições por segundo e consultas SQL por
+requisição:
+
+    login          POST /auth/login
+    list_products  GET /products/?category=...
+    create_order   POST /orders/
+    list_orders    GET /orders/
+
+O resultado pode ser salvo como baseline JSON e comparado nas execuções
+seguintes; a execução falha (código 1) se algum cenário piorar além de
+--threshold. Baselines só são comparáveis na mesma máquina e banco.
+
+Uso:
+    python -m benchmarks.endpoints [--url sqlite:///...] [--concurrency 8] [--requests 400]
+        [--save-baseline] [--baseline benchmarks/baselines/sqlite.json] [--threshold 0.2]
+
+Sem --url, usa um SQLite temporário. Com --url, o schema é recriado (os
+dados são apagados), por isso exige --reset: use um banco descartável.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+SECTIONS = ("bebidas", "roupas", "calcados", "acessorios", "perfumaria")
+
+
+def configure(url: str, bcrypt_rounds: int | None, async_db: bool):
+    """
+    Settings são lidas na importação de app.*: o ambiente é ajustado antes.
+    """
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ["ASYNC_DB"] = "true" if async_db else "false"
+    if async_db and url.startswith("sqlite"):
+        os.environ["ASYNC_DATABASE_URL"] = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if bcrypt_rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(bcrypt_rounds)
+
+
+def prepare_database(products: int, orders: int, clients: int):
+    """
+    Recria o schema e popula com benchmarks.synthetic_data (hashes com o
+    mesmo custo de bcrypt da aplicação, para o login não regravá-los).
+    """
+    from sqlalchemy import text, update
+    from app.db.base import Base, Product
+    from app.db.init_db import init_db
+    from app.db.session import engine
+    from app.settings import settings
+    from benchmarks.synthetic_data import generate
+
+    Base.metadata.drop_all(engine)
+    init_db(max_retries=1)
+    generate(engine, clients, products, orders, bcrypt_rounds=settings.BCRYPT_ROUNDS)
+    with engine.begin() as conn:
+        # Estoque alto nos produtos pedidos, para POST /orders/ não esgotar
+        conn.execute(update(Product).where(Product.id <= 100).values(stock=10**9, is_available=True))
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("ANALYZE"))
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Percentil pelo método nearest-rank (valores já ordenados).
+    """
+    if not values:
+        return 0.0
+    rank = max(1, min(len(values), round(p / 100 * len(values) + 0.5)))
+    return values[rank - 1]
+
+
+async def run_scenario(client, name: str, request, total: int, concurrency: int, warmup: int) -> dict:
+    """
+    Executa `total` requisições com `concurrency` clientes simultâneos.
+    `request(client, worker, rng)` faz uma requisição e retorna a resposta.
+    """
+    from app.db import session
+    from app.db.profiler import record_queries
+
+    rngs = [random.Random(1000 + worker) for worker in range(concurrency)]
+    for i in range(warmup):
+        await request(client, i % concurrency, rngs[i % concurrency])
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(index: int):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await request(client, index, rngs[index])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    # No modo assíncrono as rotas usam o engine assíncrono (e o síncrono em
+    # partes como a exportação): os dois são contados
+    engines = [session.engine]
+    if session.async_engine is not None:
+        engines.append(session.async_engine.sync_engine)
+    with ExitStack() as stack:
+        profiles = [stack.enter_context(record_queries(engine)) for engine in engines]
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    queries = sum(profile.count for profile in profiles)
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": round(queries / max(len(latencies), 1), 2),
+    }
+
+
+async def benchmark(args) -> dict:
+    import httpx
+    from app.main import app
+    from benchmarks.synthetic_data import password_for
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login(client, worker, rng):
+            user = rng.randint(1, args.clients)
+            return await client.post("/auth/login", data={"username": f"user{user}@example.com", "password": password_for(user)})
+
+        # Um cliente (usuário) por worker nas rotas autenticadas
+        headers = []
+        for worker in range(args.concurrency):
+            response = await login(client, worker, random.Random(worker))
+            response.raise_for_status()
+            headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+        async def list_products(client, worker, rng):
+            return await client.get("/products/", params={"category": rng.choice(SECTIONS), "limit": 20}, headers=headers[worker])
+
+        async def create_order(client, worker, rng):
+            items = [{"product_id": product_id, "quantity": rng.randint(1, 3)} for product_id in rng.sample(range(1, 101), rng.randint(1, 3))]
+            return await client.post("/orders/", json={"items": items}, headers=headers[worker])
+
+        async def list_orders(client, worker, rng):
+            return await client.get("/orders/", params={"limit": 20}, headers=headers[worker])
+
+        scenarios = {
+            "login": (login, args.login_requests),
+            "list_products": (list_products, args.requests),
+            "create_order": (create_order, args.requests),
+            "list_orders": (list_orders, args.requests),
+        }
+        results = {}
+        for name, (request, total) in scenarios.items():
+            results[name] = await run_scenario(client, name, request, total, args.concurrency, args.warmup)
+            print_result(name, results[name])
+        return results
+
+
+def print_result(name: str, result: dict):
+    print(
+        f"{name:<14} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  {result['rps']:>8.1f} req/s  "
+        f"{result['queries_per_request']:>5.2f} consultas/req  {result['errors']} erros"
+    )
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Regressões de `current` em relação ao baseline: p95 ou p99 maiores, ou
+    vazão menor, em mais de `threshold` (fração); mais consultas por
+    requisição; ou erros em cenários que não tinham erros.
+    """
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        result = current["scenarios"].get(name)
+        if result is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {base[metric]} -> {result[metric]}")
+        if result["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {base['rps']} -> {result['rps']}")
+        if result["queries_per_request"] > base["queries_per_request"] + 0.01:
+            regressions.append(f"{name}: consultas/req {base['queries_per_request']} -> {result['queries_per_request']}")
+        if result["errors"] and not base["errors"]:
+            regressions.append(f"{name}: {result['errors']} erros")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="banco descartável (padrão: SQLite temporário)")
+    parser.add_argument("--reset", action="store_true", help="confirma a recriação do schema em --url")
+    parser.add_argument("--async-db", action="store_true", help="rotas sobre AsyncSession (ASYNC_DB=true)")
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400, help="requisições por cenário")
+    parser.add_argument("--login-requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--bcrypt-rounds", type=int, help="custo do bcrypt (padrão: o de Settings)")
+    parser.add_argument("--baseline", type=Path, help="arquivo de baseline (padrão: benchmarks/baselines/<banco>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="grava o resultado como baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="piora tolerada em relação ao baseline")
+    parser.add_argument("--output", type=Path, help="grava o resultado desta execução em JSON")
+    args = parser.parse_args()
+
+    if args.url and not args.reset:
+        parser.error("--url recria o schema e apaga os dados: confirme com --reset")
+    url = args.url or f"sqlite:///{tempfile.mkdtemp(prefix='lu-estilo-bench-')}/bench.db"
+
+    configure(url, args.bcrypt_rounds, args.async_db)
+    prepare_database(args.products, args.orders, args.clients)
+
+    from app.db.session import engine
+    dialect = engine.dialect.name
+    current = {
+        "meta": {
+            "database": dialect,
+            "async_db": args.async_db,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "volumes": {"products": args.products, "orders": args.orders, "clients": args.clients},
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "scenarios": asyncio.run(benchmark(args)),
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+
+    baseline_path = args.baseline or BASELINE_DIR / f"{dialect}{'-async' if args.async_db else ''}.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Baseline gravado em {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"Sem baseline em {baseline_path} (use --save-baseline).")
+        return
+
+    regressions = compare(current, json.loads(baseline_path.read_text()), args.threshold)
+    if regressions:
+        print(f"Regressões em relação a {baseline_path}:")
+        print("\n".join(f"  {line}" for line in regressions))
+        sys.exit(1)
+    print(f"Sem regressões em relação a {baseline_path} (tolerância {args.threshold:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
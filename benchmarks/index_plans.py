@@ -0,0 +1,132 @@
+"""
+Benchmark dos índices das consultas mais frequentes.
+
+Popula um banco (SQLite em memória por padrão), remove os índices secundários,
+mede plano e tempo das consultas, aplica os índices com app.db.indexes e mede
+de novo.
+
+Uso:
+    python -m benchmarks.index_plans [--url postgresql://... --reset] [--products 20000] [--orders 50000]
+
+Com --url, o schema é recriado (os dados são apagados), por isso exige
+--reset: use um banco descartável.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, insert, select, text
+from app.db.base import Base, User, Client, Product, Order, OrderItem
+from app.db.indexes import apply_indexes
+
+SECTIONS = ["bebidas", "roupas", "calcados", "acessorios", "perfumaria"]
+
+
+def seed(engine, products: int, orders: int, clients: int = 2000):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"u{i}@bench", "cpf": str(i), "hashed_password": "x"} for i in range(1, clients + 1)
+        ])
+        conn.execute(insert(Client), [
+            {"id": i, "name": f"Cliente {i}", "address": f"Rua {i}", "phone_number": f"11{i:08d}", "user_id": i}
+            for i in range(1, clients + 1)
+        ])
+        conn.execute(insert(Product), [
+            {
+                "id": i, "description": f"Produto {i}", "sale_price": round(rng.uniform(1, 500), 2),
+                "barcode": f"B{i}", "section": rng.choice(SECTIONS), "stock": rng.randint(0, 50),
+                "is_available": rng.random() < 0.8,
+            }
+            for i in range(1, products + 1)
+        ])
+        conn.execute(insert(Order), [
+            {"id": i, "client_id": rng.randint(1, clients), "status": "pending", "created_at": start + timedelta(minutes=i)}
+            for i in range(1, orders + 1)
+        ])
+        conn.execute(insert(OrderItem), [
+            {"order_id": i // 2 + 1, "product_id": rng.randint(1, products), "quantity": 1, "price": 1.0}
+            for i in range(orders * 2)
+        ])
+
+
+def hot_queries():
+    """
+    Mesmo formato das consultas de app/crud (filtros, ordenação e LIMIT).
+    """
+    return {
+        "get_products(category, price, available)": select(Product)
+            .where(Product.section == "bebidas", Product.sale_price <= 50, Product.is_available == True)
+            .order_by(Product.id).limit(10),
+        "get_products(available)": select(Product).where(Product.is_available == True).order_by(Product.id).limit(10),
+        "list_orders(client_id)": select(Order).where(Order.client_id == 42).order_by(Order.created_at, Order.id).limit(10),
+        "list_orders(admin)": select(Order).order_by(Order.created_at, Order.id).limit(10),
+        "Order.items": select(OrderItem).where(OrderItem.order_id == 1234),
+        "get_client_by_user_id": select(Client).where(Client.user_id == 1500),
+        "get_client_by_phone_number": select(Client).where(Client.phone_number == "1100001500"),
+    }
+
+
+def drop_secondary_indexes(engine):
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                # Mantém os índices que já existiam antes deste conjunto (PKs e unique)
+                if not index.unique and index.name != f"ix_{table.name}_id":
+                    index.drop(conn, checkfirst=True)
+
+
+def explain(conn, statement) -> str:
+    sql = str(statement.compile(conn, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    rows = conn.execute(text(prefix + sql)).all()
+    return "; ".join(str(row[-1]) for row in rows)
+
+
+def measure(engine, repeat: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for name, statement in hot_queries().items():
+            conn.execute(statement).all()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(statement).all()
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            results[name] = (elapsed, explain(conn, statement))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="banco descartável (padrão: SQLite em memória)")
+    parser.add_argument("--reset", action="store_true", help="confirma a recriação do schema em --url")
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.url and not args.reset:
+        parser.error("--url recria o schema e apaga os dados: confirme com --reset")
+    engine = create_engine(args.url or "sqlite://")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    seed(engine, args.products, args.orders)
+    drop_secondary_indexes(engine)
+    before = measure(engine, args.repeat)
+
+    apply_indexes(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+    after = measure(engine, args.repeat)
+
+    for name in before:
+        (t0, plan0), (t1, plan1) = before[name], after[name]
+        print(f"\n{name}: {t0:.3f} ms -> {t1:.3f} ms ({t0 / max(t1, 1e-9):.1f}x)")
+        print(f"  antes:  {plan0}")
+        print(f"  depois: {plan1}")
+
+
+if __name__ == "__main__":
+    main()
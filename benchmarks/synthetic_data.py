@@ -0,0 +1,350 @@
+"""
+Gerador de dados sintéticos em volume de produção.
+
+Popula users, clients, products, orders e order_items direto no banco, sem
+passar pela API (bcrypt e um commit por linha limitariam a poucas centenas
+de linhas por segundo):
+
+- senhas: um pequeno conjunto de hashes bcrypt calculados uma única vez e
+  reaproveitados (o usuário N tem a senha `password_for(N)`)
+- popularidade dos produtos com distribuição de Zipf (poucos produtos
+  concentram a maior parte dos itens), sem relação com o id
+- cestas de tamanho variável (1 a --max-basket itens, mais frequentes as
+  pequenas) e `created_at` crescente ao longo de --years anos, com volume de
+  pedidos aumentando com o tempo
+- carga em blocos: COPY no Postgres, executemany direto no driver nos
+  demais bancos
+- resumo de vendas (sales_summary) recalculado no final
+
+Os ids continuam a partir do maior id de cada tabela, então a carga pode ser
+repetida para acrescentar dados. Com --defer-indexes, os índices secundários
+são removidos antes da carga e recriados (app.db.indexes) no final.
+
+Uso:
+    python -m benchmarks.synthetic_data --url postgresql://... [--create-schema]
+        [--users 100000] [--products 50000] [--orders 1000000] [--years 3]
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+from app.crud.sales import rebuild_sales_summary
+from app.db.base import Base, User, Client, Product, Order, OrderItem, SalesSummary
+
+SECTIONS = ("roupas", "calcados", "acessorios", "bebidas", "perfumaria", "bolsas")
+SECTION_WEIGHTS = (40, 20, 15, 10, 10, 5)
+PERISHABLE = {"bebidas", "perfumaria"}
+STATUSES = ("pending", "paid", "shipped", "delivered", "cancelled")
+
+FIRST_NAMES = ("Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória", "Yuri")
+LAST_NAMES = ("Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Ferreira", "Costa", "Rodrigues", "Almeida", "Nascimento", "Carvalho", "Gomes", "Ribeiro", "Martins")
+STREETS = ("Rua das Flores", "Av. Brasil", "Rua XV de Novembro", "Av. Paulista", "Rua da Praia", "Rua Sete de Setembro", "Av. Atlântica", "Rua Augusta")
+CITIES = ("São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre", "Salvador", "Recife", "Fortaleza")
+ADJECTIVES = ("Básico", "Premium", "Slim", "Clássico", "Esportivo", "Casual", "Estampado", "Liso")
+NOUNS = {
+    "roupas": ("Camiseta", "Calça", "Vestido", "Blusa", "Jaqueta", "Saia"),
+    "calcados": ("Tênis", "Sandália", "Bota", "Sapato", "Chinelo"),
+    "acessorios": ("Cinto", "Óculos", "Relógio", "Boné", "Colar"),
+    "bebidas": ("Suco", "Água", "Refrigerante", "Chá", "Café"),
+    "perfumaria": ("Perfume", "Hidratante", "Sabonete", "Shampoo"),
+    "bolsas": ("Bolsa", "Mochila", "Carteira", "Necessaire"),
+}
+
+COLUMNS = {
+    User.__tablename__: ("id", "email", "cpf", "hashed_password", "is_active", "is_admin"),
+    Client.__tablename__: ("id", "name", "address", "phone_number", "user_id"),
+    Product.__tablename__: ("id", "description", "sale_price", "barcode", "section", "stock", "expiration_date", "image", "is_available"),
+    Order.__tablename__: ("id", "client_id", "status", "created_at"),
+    OrderItem.__tablename__: ("id", "order_id", "product_id", "quantity", "price"),
+}
+
+
+def password_for(user_id: int, hash_pool: int = 16) -> str:
+    """
+    Senha em texto do usuário gerado com id `user_id`.
+    """
+    return f"senha-{user_id % hash_pool}"
+
+
+def password_hashes(hash_pool: int, bcrypt_rounds: int) -> list[str]:
+    """
+    Um hash bcrypt por senha do conjunto. Use o mesmo custo de
+    Settings.BCRYPT_ROUNDS, ou o login regrava o hash a cada acesso.
+    """
+    from passlib.context import CryptContext
+
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=bcrypt_rounds)
+    return [context.hash(password_for(k, hash_pool)) for k in range(hash_pool)]
+
+
+def zipf_cum_weights(n: int, s: float) -> list[float]:
+    """
+    Pesos acumulados de Zipf (peso do posto k proporcional a 1/k^s), para
+    random.choices(cum_weights=...).
+    """
+    return list(accumulate(1 / k ** s for k in range(1, n + 1)))
+
+
+def _batched(rows, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load(conn, table: str, rows, batch_size: int) -> int:
+    """
+    Grava as tuplas de `rows` em `table`, em blocos de `batch_size`.
+
+    - Postgres (psycopg2): COPY ... FROM STDIN em CSV (campo vazio = NULL).
+    - Demais: executemany no cursor do driver, sem montar objetos do SQLAlchemy.
+    """
+    columns = COLUMNS[table]
+    cursor = conn.connection.dbapi_connection.cursor()
+    copy = conn.dialect.name == "postgresql" and hasattr(cursor, "copy_expert")
+    if not copy:
+        marker = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})"
+
+    count = 0
+    for batch in _batched(rows, batch_size):
+        if copy:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        else:
+            cursor.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def next_ids(conn) -> dict[str, int]:
+    return {
+        model.__tablename__: (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+        for model in (User, Client, Product, Order, OrderItem)
+    }
+
+
+def reset_sequences(conn):
+    """
+    Postgres: sequências dos ids ajustadas após inserts com ids explícitos.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    for table in COLUMNS:
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        ))
+
+
+def user_rows(rng: random.Random, first_id: int, count: int, hashes: list[str]):
+    for user_id in range(first_id, first_id + count):
+        yield (user_id, f"user{user_id}@example.com", f"{user_id:011d}", hashes[user_id % len(hashes)], True, False)
+
+
+def client_rows(rng: random.Random, first_id: int, first_user_id: int, count: int):
+    for offset in range(count):
+        client_id, user_id = first_id + offset, first_user_id + offset
+        yield (
+            client_id,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"{rng.choice(STREETS)}, {rng.randint(1, 3000)} - {rng.choice(CITIES)}",
+            f"119{client_id:08d}",
+            user_id,
+        )
+
+
+def product_rows(rng: random.Random, first_id: int, count: int, prices: dict[int, float]):
+    today = date.today()
+    sections = rng.choices(SECTIONS, weights=SECTION_WEIGHTS, k=count)
+    for product_id, section in zip(range(first_id, first_id + count), sections):
+        price = round(min(rng.lognormvariate(4.0, 0.8), 5000), 2)
+        prices[product_id] = price
+        stock = 0 if rng.random() < 0.05 else rng.randint(1, 500)
+        expiration = today + timedelta(days=rng.randint(30, 720)) if section in PERISHABLE else None
+        yield (
+            product_id,
+            f"{rng.choice(NOUNS[section])} {rng.choice(ADJECTIVES)} {product_id}",
+            price,
+            f"789{product_id:010d}",
+            section,
+            stock,
+            expiration,
+            f"https://cdn.example.com/products/{product_id}.jpg" if rng.random() < 0.7 else None,
+            stock > 0,
+        )
+
+
+def order_rows(
+    rng: random.Random,
+    first_order_id: int,
+    first_item_id: int,
+    count: int,
+    clients: tuple[int, int],
+    products: list[int],
+    prices: dict[int, float],
+    years: float,
+    zipf_s: float,
+    max_basket: int,
+    items: list,
+):
+    """
+    Gera os pedidos e acumula em `items` os itens de cada pedido gerado.
+
+    `created_at` segue uma densidade crescente no tempo (mais pedidos nos
+    anos recentes) e é monotônico com o id, como em produção.
+    """
+    end = datetime.now().replace(microsecond=0)
+    span = timedelta(days=365 * years).total_seconds()
+    start = end - timedelta(seconds=span)
+    first_client, last_client = clients
+    # Produtos em ordem aleatória: o posto de popularidade não segue o id
+    ranked = products[:]
+    rng.shuffle(ranked)
+    cum_weights = zipf_cum_weights(len(ranked), zipf_s)
+    basket_sizes = range(1, max_basket + 1)
+    basket_cum_weights = list(accumulate(1 / size ** 1.5 for size in basket_sizes))
+    clients_count = last_client - first_client + 1
+    random_ = rng.random
+    choices = rng.choices
+    item_id = first_item_id
+
+    for offset, size in enumerate(choices(basket_sizes, cum_weights=basket_cum_weights, k=count)):
+        order_id = first_order_id + offset
+        # Inversa da CDF t^1.5: volume cresce com o tempo
+        position = ((offset + random_()) / count) ** (1 / 1.5)
+        created_at = start + timedelta(seconds=position * span)
+        if position < 0.98:
+            status = "cancelled" if random_() < 0.05 else "delivered"
+        else:
+            status = STATUSES[int(random_() * len(STATUSES))]
+
+        for product_id in set(choices(ranked, cum_weights=cum_weights, k=size)):
+            items.append((item_id, order_id, product_id, 1 + int(random_() * 3), prices[product_id]))
+            item_id += 1
+        yield (order_id, first_client + int(random_() * clients_count), status, created_at)
+
+
+def generate(
+    engine,
+    users: int,
+    products: int,
+    orders: int,
+    years: float = 3,
+    zipf_s: float = 1.1,
+    max_basket: int = 8,
+    hash_pool: int = 16,
+    bcrypt_rounds: int = 12,
+    batch_size: int = 20000,
+    seed: int = 42,
+    log=print,
+) -> dict[str, int]:
+    """
+    Gera e grava os dados; retorna as linhas gravadas por tabela.
+
+    Cada usuário gerado tem um cliente associado. Os pedidos só usam
+    clientes e produtos gerados nesta execução.
+    """
+    rng = random.Random(seed)
+    hashes = password_hashes(hash_pool, bcrypt_rounds)
+    counts = {}
+
+    def timed(table, rows):
+        started = time.perf_counter()
+        counts[table] = load(conn, table, rows, batch_size)
+        elapsed = time.perf_counter() - started
+        log(f"{table}: {counts[table]} linhas em {elapsed:.1f} s ({counts[table] / max(elapsed, 1e-9):,.0f} linhas/s)")
+
+    with engine.begin() as conn:
+        ids = next_ids(conn)
+        prices: dict[int, float] = {}
+        timed(User.__tablename__, user_rows(rng, ids["users"], users, hashes))
+        timed(Client.__tablename__, client_rows(rng, ids["clients"], ids["users"], users))
+        timed(Product.__tablename__, product_rows(rng, ids["products"], products, prices))
+
+        # Pedidos e itens em blocos: os itens de um bloco de pedidos são
+        # gravados logo depois dele, então a memória não cresce com o total
+        client_range = (ids["clients"], ids["clients"] + users - 1)
+        product_ids = list(prices)
+        items: list = []
+        started = time.perf_counter()
+        counts[Order.__tablename__] = counts[OrderItem.__tablename__] = 0
+        item_id = ids["order_items"]
+        order_gen = order_rows(
+            rng, ids["orders"], item_id, orders, client_range, product_ids, prices,
+            years, zipf_s, max_basket, items,
+        )
+        for batch in _batched(order_gen, batch_size):
+            counts[Order.__tablename__] += load(conn, Order.__tablename__, batch, batch_size)
+            counts[OrderItem.__tablename__] += load(conn, OrderItem.__tablename__, items, batch_size)
+            items.clear()
+        elapsed = time.perf_counter() - started
+        rows = counts[Order.__tablename__] + counts[OrderItem.__tablename__]
+        log(f"orders + order_items: {rows} linhas em {elapsed:.1f} s ({rows / max(elapsed, 1e-9):,.0f} linhas/s)")
+
+        reset_sequences(conn)
+
+    # Pedidos gravados sem passar por create_order: o resumo de vendas é
+    # recalculado a partir do histórico
+    started = time.perf_counter()
+    with Session(engine) as db:
+        counts[SalesSummary.__tablename__] = rebuild_sales_summary(db)
+    log(f"{SalesSummary.__tablename__}: {counts[SalesSummary.__tablename__]} linhas em {time.perf_counter() - started:.1f} s")
+    return counts
+
+
+def main():
+    from benchmarks.index_plans import drop_secondary_indexes
+    from app.db.indexes import apply_indexes
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--create-schema", action="store_true", help="cria as tabelas que faltam")
+    parser.add_argument("--defer-indexes", action="store_true", help="recria os índices secundários só após a carga")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--zipf", type=float, default=1.1, help="expoente da popularidade dos produtos")
+    parser.add_argument("--max-basket", type=int, default=8)
+    parser.add_argument("--hash-pool", type=int, default=16, help="quantidade de senhas/hashes distintos")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="use o mesmo BCRYPT_ROUNDS da aplicação")
+    parser.add_argument("--batch-size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+    if args.defer_indexes:
+        drop_secondary_indexes(engine)
+
+    started = time.perf_counter()
+    counts = generate(
+        engine, args.users, args.products, args.orders, args.years, args.zipf, args.max_basket,
+        args.hash_pool, args.bcrypt_rounds, args.batch_size, args.seed,
+    )
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"Total: {total} linhas em {elapsed:.1f} s ({total / elapsed:,.0f} linhas/s)")
+
+    if args.defer_indexes:
+        apply_indexes(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import sys
+import asyncio
+import inspect
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+from app.api import clients, products
+from app.api.aio import asyncify_router
+from app.api.auth import get_current_user_async, get_current_user_read_async
+from app.db.session import get_async_db, get_async_read_db
+
+
+def _route(router, name):
+    return next(r for r in router.routes if isinstance(r, APIRoute) and r.name == name)
+
+
+@pytest.mark.describe("Testes para asyncify_router")
+class TestAsyncifyRouter:
+
+    @pytest.mark.it("Deve converter as rotas em corrotinas mantendo caminho e modelo de resposta")
+    def test_routes_are_async(self):
+        async_router = asyncify_router(products.router)
+        route = _route(async_router, "list_products")
+        original = _route(products.router, "list_products")
+
+        assert inspect.iscoroutinefunction(route.endpoint)
+        assert route.path == original.path
+        assert route.response_model == original.response_model
+        assert route.methods == original.methods
+
+    @pytest.mark.it("Deve resolver o usuário das rotas de leitura na sessão de leitura assíncrona")
+    def test_read_user_dependency(self):
+        route = _route(asyncify_router(clients.router), "get_client")
+        params = inspect.signature(route.endpoint).parameters
+
+        assert params["db"].default.dependency is get_async_read_db
+        assert params["current_user"].default.dependency is get_current_user_read_async
+
+    @pytest.mark.it("Deve manter síncronas as rotas marcadas com keep_sync")
+    def test_keep_sync(self):
+        route = _route(asyncify_router(products.router), "import_file")
+
+        assert route.endpoint is products.import_file
+        assert not inspect.iscoroutinefunction(route.endpoint)
+
+    @pytest.mark.it("Deve trocar get_db e get_current_user pelas dependências assíncronas")
+    def test_dependencies_are_swapped(self):
+        route = _route(asyncify_router(products.router), "create")
+        params = inspect.signature(route.endpoint).parameters
+
+        assert params["db"].default.dependency is get_async_db
+        assert params["current_user"].default.dependency is get_current_user_async
+
+    @pytest.mark.it("Deve executar a rota original via run_sync com a sessão síncrona")
+    @mock.patch("app.api.products.get_product_cached")
+    def test_endpoint_runs_in_run_sync(self, mock_get_product):
+        mock_get_product.return_value = mock.MagicMock(
+            id=1, description="d", sale_price=1.0, barcode="b", section="s",
+            stock=1, expiration_date=None, image=None, is_available=True,
+        )
+        sync_session = mock.MagicMock()
+        async_db = mock.MagicMock()
+        async_db.run_sync = mock.AsyncMock(side_effect=lambda fn, *args: fn(sync_session, *args))
+
+        route = _route(asyncify_router(products.router), "get")
+        result = asyncio.run(route.endpoint(id=1, request=mock.MagicMock(headers={}), response=Response(), db=async_db))
+
+        mock_get_product.assert_called_once_with(sync_session, 1)
+        assert result.id == 1
+        assert result.barcode == "b"
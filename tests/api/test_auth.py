@@ -9,6 +9,17 @@ mock_settings = mock.MagicMock()
 mock_settings.SECRET_KEY = "testsecret"
 mock_settings.ALGORITHM = "HS256"
 mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
 
 sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
 
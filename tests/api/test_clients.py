@@ -6,12 +6,23 @@ mock_settings = mock.MagicMock()
 mock_settings.SECRET_KEY = "fake"
 mock_settings.ALGORITHM = "HS256"
 mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
 sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from unittest import mock
-from app.api.clients import list_clients, create_new_client, get_client, update_client, delete_client
+from app.api.clients import list_clients, search, create_new_client, get_client, update_client, delete_client
 from app.schemas.clients import ClientUpdate
 
 
@@ -19,20 +30,36 @@ from app.schemas.clients import ClientUpdate
 class TestClient:
 
     @pytest.mark.it("Deve listar clientes quando o usuário for admin")
-    def test_list_clients_admin(self):
+    @mock.patch("app.api.clients.get_clients", return_value=["cliente1", "cliente2"])
+    def test_list_clients_admin(self, mock_get_clients):
         mock_db = mock.MagicMock()
         mock_user = mock.MagicMock(is_admin=True)
-        mock_query = mock_db.query.return_value
-        mock_filtered = mock_query.filter.return_value
-        mock_filtered.offset.return_value.limit.return_value.all.return_value = ["cliente1", "cliente2"]
 
-        result = list_clients(name="cli", skip=0, limit=10, db=mock_db, current_user=mock_user)
+        result = list_clients(response=Response(), name="cli", skip=0, limit=10, db=mock_db, current_user=mock_user)
+
+        mock_get_clients.assert_called_once_with(mock_db, 0, 10, name="cli", cursor=None)
         assert result == ["cliente1", "cliente2"]
 
     @pytest.mark.it("Deve negar acesso à listagem de clientes para não admin")
     def test_list_clients_non_admin(self):
         with pytest.raises(HTTPException) as exc:
-            list_clients(name=None, skip=0, limit=10, db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=False))
+            list_clients(response=Response(), name=None, skip=0, limit=10, db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=False))
+        assert exc.value.status_code == 403
+
+    @pytest.mark.it("Deve buscar clientes quando o usuário for admin")
+    @mock.patch("app.api.clients.search_clients", return_value=["cliente1"])
+    def test_search_clients_admin(self, mock_search_clients):
+        mock_db = mock.MagicMock()
+
+        result = search(q="mar", skip=0, limit=10, db=mock_db, current_user=mock.MagicMock(is_admin=True))
+
+        mock_search_clients.assert_called_once_with(mock_db, "mar", 0, 10)
+        assert result == ["cliente1"]
+
+    @pytest.mark.it("Deve negar a busca de clientes para não admin")
+    def test_search_clients_non_admin(self):
+        with pytest.raises(HTTPException) as exc:
+            search(q="mar", skip=0, limit=10, db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=False))
         assert exc.value.status_code == 403
 
     @pytest.mark.it("Deve criar novo cliente com dados válidos")
@@ -163,3 +190,50 @@ class TestClient:
         with pytest.raises(HTTPException) as exc:
             delete_client(id=1, db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=False))
         assert exc.value.status_code == 403
+
+
+@pytest.fixture
+def seeded_db():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base, User, Client
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for i in range(20):
+        user = User(email=f"c{i}@c.com", cpf=str(i), hashed_password="x")
+        session.add(user)
+        session.flush()
+        session.add(Client(name=f"Cliente {i}", address="R", phone_number=str(i), user_id=user.id))
+    session.commit()
+    session.expunge_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    yield session, statements
+    session.close()
+
+
+@pytest.mark.describe("Quantidade de consultas nas rotas de clientes")
+class TestClientQueryCount:
+
+    def _count(self, session, statements, call):
+        from app.schemas.clients import ClientOut
+        session.expunge_all()
+        statements.clear()
+        result = call()
+        for client in result if isinstance(result, list) else [result]:
+            ClientOut.model_validate(client)
+        return len(statements)
+
+    @pytest.mark.it("Listagem e detalhe devem carregar o usuário na mesma consulta")
+    def test_single_round_trip(self, seeded_db):
+        session, statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+
+        listed = self._count(session, statements, lambda: list_clients(response=Response(), name=None, skip=0, limit=20, db=session, current_user=admin))
+        filtered = self._count(session, statements, lambda: list_clients(response=Response(), name="Cliente 1", skip=0, limit=20, db=session, current_user=admin))
+        detail = self._count(session, statements, lambda: get_client(id=3, db=session, current_user=admin))
+
+        assert listed == filtered == detail == 1
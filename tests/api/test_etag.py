@@ -0,0 +1,49 @@
+import pytest
+from unittest import mock
+from fastapi import Response
+from app.api.etag import make_etag, etag_matches, conditional_response
+
+
+def _request(value):
+    return mock.MagicMock(headers={"if-none-match": value} if value is not None else {})
+
+
+@pytest.mark.describe("ETag / If-None-Match")
+class TestEtag:
+
+    @pytest.mark.it("Deve gerar ETags fortes e determinísticos")
+    def test_make_etag(self):
+        etag = make_etag(1, "pending")
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag(1, "pending")
+        assert etag != make_etag(1, "shipped")
+
+    @pytest.mark.it("Deve comparar com listas, `*` e prefixo W/")
+    def test_etag_matches(self):
+        etag = make_etag(1)
+
+        assert etag_matches(_request(etag), etag)
+        assert etag_matches(_request(f'"outro", W/{etag}'), etag)
+        assert etag_matches(_request("*"), etag)
+        assert not etag_matches(_request('"outro"'), etag)
+        assert not etag_matches(_request(None), etag)
+        assert not etag_matches(None, etag)
+
+    @pytest.mark.it("Deve responder 304 sem corpo quando o ETag confere")
+    def test_conditional_not_modified(self):
+        etag = make_etag(1)
+        result = conditional_response(_request(etag), Response(), etag, {"id": 1})
+
+        assert result.status_code == 304
+        assert result.body == b""
+        assert result.headers["ETag"] == etag
+
+    @pytest.mark.it("Deve retornar o corpo com header ETag quando não confere")
+    def test_conditional_modified(self):
+        etag = make_etag(1)
+        response = Response()
+        result = conditional_response(_request('"outro"'), response, etag, {"id": 1})
+
+        assert result == {"id": 1}
+        assert response.headers["ETag"] == etag
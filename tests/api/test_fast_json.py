@@ -0,0 +1,103 @@
+import sys
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+import json
+from datetime import date
+from fastapi import FastAPI, Response
+from app.api import fast_json, products, orders, clients
+from app.api.fast_json import FastJSONResponse, render
+from app.schemas.products import ProductOut
+
+
+def _product(id):
+    return ProductOut.model_construct(
+        id=id, description="d", sale_price=1.5, barcode=str(id), section="s", stock=1,
+        expiration_date=date(2030, 1, 1), image=None, is_available=True,
+    )
+
+
+@pytest.fixture
+def fast(monkeypatch):
+    monkeypatch.setattr(fast_json, "settings", mock.MagicMock(FAST_JSON=True))
+
+
+@pytest.mark.describe("Serialização rápida (FAST_JSON)")
+class TestFastJson:
+
+    @pytest.mark.it("Deve serializar modelos com orjson no mesmo formato do FastAPI")
+    def test_render_models(self, fast):
+        product = _product(1)
+        response = Response()
+        response.headers["X-Next-Cursor"] = "abc"
+
+        result = render([product], response)
+
+        assert isinstance(result, FastJSONResponse)
+        assert result.media_type == "application/json"
+        assert result.headers["X-Next-Cursor"] == "abc"
+        assert json.loads(result.body) == [json.loads(product.model_dump_json())]
+
+    @pytest.mark.it("Deve devolver o conteúdo intacto sem a flag ou se já for uma Response")
+    def test_render_passthrough(self, fast, monkeypatch):
+        not_modified = Response(status_code=304)
+        assert render(not_modified, Response()) is not_modified
+
+        monkeypatch.setattr(fast_json, "settings", mock.MagicMock(FAST_JSON=False))
+        content = [_product(1)]
+        assert render(content, Response()) is content
+
+    @pytest.mark.it("Deve responder a listagem de produtos com cursor e ETag")
+    def test_list_products(self, fast):
+        page = (_product(1), _product(2))
+        response = Response()
+        with mock.patch.object(products, "get_products_cached", return_value=page):
+            result = products.list_products(request=mock.MagicMock(headers={}), limit=2, response=response, db=mock.MagicMock())
+
+        assert isinstance(result, FastJSONResponse)
+        assert result.headers["ETag"] == response.headers["ETag"]
+        assert "X-Next-Cursor" in result.headers
+        assert [item["id"] for item in json.loads(result.body)] == [1, 2]
+
+    @pytest.mark.it("Deve usar a listagem por colunas de pedidos e clientes")
+    def test_column_listings(self, fast):
+        admin = mock.MagicMock(is_admin=True)
+        with mock.patch.object(orders, "list_orders_out", return_value=[]) as list_orders_out:
+            result = orders.list_all(request=mock.MagicMock(headers={}), response=Response(), db=mock.MagicMock(), current_user=admin)
+        list_orders_out.assert_called_once()
+        assert result.body == b"[]"
+
+        with mock.patch.object(clients, "get_clients_out", return_value=[]) as get_clients_out:
+            result = clients.list_clients(response=Response(), db=mock.MagicMock(), current_user=admin)
+        get_clients_out.assert_called_once()
+        assert result.body == b"[]"
+
+    @pytest.mark.it("Não deve alterar o schema OpenAPI")
+    def test_openapi_unchanged(self, monkeypatch):
+        def schema():
+            app = FastAPI()
+            for router in (products.router, orders.router, clients.router):
+                app.include_router(router)
+            return app.openapi()
+
+        before = schema()
+        monkeypatch.setattr(fast_json, "settings", mock.MagicMock(FAST_JSON=True))
+        assert schema() == before
@@ -0,0 +1,75 @@
+import sys
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+import asyncio
+import json
+from sqlalchemy import create_engine
+from app.api import health
+from app.db.warmup import PoolReadiness
+
+
+def _run(coro):
+    response = asyncio.run(coro)
+    if isinstance(response, dict):
+        return 200, response
+    return response.status_code, json.loads(response.body)
+
+
+@pytest.mark.describe("Sondas de liveness e readiness")
+class TestHealth:
+
+    @pytest.mark.it("/healthz deve responder sem consultar o banco")
+    def test_healthz(self):
+        assert _run(health.healthz()) == (200, {"status": "ok"})
+
+    @pytest.mark.it("/readyz deve responder 503 enquanto o pool não estiver aquecido")
+    @mock.patch.object(health, "readiness", PoolReadiness())
+    def test_readyz_warming_up(self):
+        status, body = _run(health.readyz())
+
+        assert status == 503
+        assert body["status"] == "warming_up"
+
+    @pytest.mark.it("/readyz deve responder 200 com o banco acessível e o pool aquecido")
+    @mock.patch.object(health, "settings", mock.MagicMock(READINESS_TIMEOUT=1))
+    def test_readyz_ready(self):
+        state = PoolReadiness()
+        state.ready = True
+        with mock.patch.object(health, "readiness", state), \
+                mock.patch.object(health.session, "engine", create_engine("sqlite://")), \
+                mock.patch.object(health.session, "get_pool_stats", return_value={"idle": 2}):
+            status, body = _run(health.readyz())
+
+        assert status == 200
+        assert body == {"status": "ready", "pool": {"idle": 2}}
+
+    @pytest.mark.it("/readyz deve responder 503 se o banco não responder")
+    @mock.patch.object(health, "settings", mock.MagicMock(READINESS_TIMEOUT=1))
+    @mock.patch.object(health, "ping", side_effect=ConnectionError("recusada"))
+    def test_readyz_db_down(self, _):
+        state = PoolReadiness()
+        state.ready = True
+        with mock.patch.object(health, "readiness", state):
+            status, body = _run(health.readyz())
+
+        assert status == 503
+        assert "recusada" in body["error"]
@@ -0,0 +1,53 @@
+import sys
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+import asyncio
+from app.api import metrics as metrics_api
+from app.db.pool_metrics import PoolMetrics
+
+
+@pytest.mark.describe("GET /metrics")
+class TestMetricsRoute:
+
+    @pytest.mark.it("Deve expor as métricas do pool no formato do Prometheus")
+    def test_render_pool_metrics(self):
+        pool_metrics = PoolMetrics(buckets=(0.01,))
+        pool_metrics.increment("checkouts")
+        pool_metrics.observe_wait(0.5)
+        stats = {**pool_metrics.snapshot(), "size": 5, "checked_out": 1, "idle": 4, "overflow": 0}
+
+        body = metrics_api.render_pool_metrics(stats)
+
+        assert "db_pool_checkouts_total 1" in body
+        assert "db_pool_checked_out 1" in body
+        assert 'db_pool_wait_seconds_bucket{le="0.01"} 0' in body
+        assert 'db_pool_wait_seconds_bucket{le="+Inf"} 1' in body
+        assert "db_pool_wait_seconds_count 1" in body
+
+    @pytest.mark.it("Deve responder em text/plain com as métricas HTTP e do pool")
+    def test_metrics_endpoint(self):
+        with mock.patch.object(metrics_api.session, "get_pool_stats", return_value=PoolMetrics().snapshot()):
+            response = asyncio.run(metrics_api.metrics())
+
+        assert response.media_type.startswith("text/plain; version=0.0.4")
+        assert b"# TYPE http_requests_total counter" in response.body
+        assert b"db_pool_checkouts_total 0" in response.body
@@ -7,10 +7,21 @@ mock_settings = mock.MagicMock()
 mock_settings.SECRET_KEY = "fake"
 mock_settings.ALGORITHM = "HS256"
 mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
 sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
 
-from fastapi import HTTPException
-from app.api.orders import create, list_all, get, update, delete
+from fastapi import HTTPException, Response
+from app.api.orders import create, create_batch, list_all, get, update, delete, export
 
 
 @pytest.mark.describe("Testes para rotas de pedidos")
@@ -38,46 +49,75 @@ class TestOrderRoutes:
 
         assert exc.value.status_code == 403
 
+    @pytest.mark.it("Deve criar lote de pedidos e relatar o resultado de cada um")
+    @mock.patch("app.api.orders.create_orders_batch")
+    def test_create_batch(self, mock_create_orders_batch):
+        mock_create_orders_batch.return_value = [
+            {"index": 0, "order": "pedido", "status_code": None, "error": None},
+            {"index": 1, "order": None, "status_code": 400, "error": "Estoque insuficiente"},
+        ]
+        mock_user = mock.MagicMock()
+        mock_user.client.id = 7
+        batch = mock.MagicMock(atomic=False)
+        mock_db = mock.MagicMock()
+
+        result = create_batch(batch=batch, db=mock_db, current_user=mock_user)
+
+        mock_create_orders_batch.assert_called_once_with(mock_db, 7, batch.orders, atomic=False)
+        assert result["created"] == 1
+        assert result["failed"] == 1
+        assert [r["success"] for r in result["results"]] == [True, False]
+
+    @pytest.mark.it("Deve negar lote de pedidos se usuário não for cliente")
+    def test_create_batch_no_client(self):
+        with pytest.raises(HTTPException) as exc:
+            create_batch(batch=mock.MagicMock(), db=mock.MagicMock(), current_user=mock.MagicMock(client=None))
+        assert exc.value.status_code == 403
+
     @pytest.mark.it("Admin deve listar todos os pedidos")
-    @mock.patch("app.api.orders.list_orders", return_value=["pedido1", "pedido2"])
+    @mock.patch("app.api.orders.list_orders")
     def test_list_all_admin(self, mock_list_orders):
+        orders = [mock.MagicMock(id=1), mock.MagicMock(id=2)]
+        mock_list_orders.return_value = orders
         mock_user = mock.MagicMock(is_admin=True)
         mock_db = mock.MagicMock()
 
-        result = list_all(skip=0, limit=10, db=mock_db, current_user=mock_user)
+        result = list_all(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=10, db=mock_db, current_user=mock_user)
 
-        mock_list_orders.assert_called_once_with(mock_db, 0, 10)
-        assert result == ["pedido1", "pedido2"]
+        mock_list_orders.assert_called_once_with(mock_db, 0, 10, cursor=None)
+        assert result == orders
 
     @pytest.mark.it("Cliente deve listar apenas seus próprios pedidos")
-    def test_list_all_cliente(self):
+    @mock.patch("app.api.orders.list_orders")
+    def test_list_all_cliente(self, mock_list_orders):
+        orders = [mock.MagicMock(id=1, client_id=7)]
+        mock_list_orders.return_value = orders
         mock_user = mock.MagicMock(is_admin=False)
         mock_user.client.id = 7
         mock_db = mock.MagicMock()
 
-        mock_query = mock_db.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.offset.return_value.limit.return_value.all.return_value = ["pedido_cliente"]
+        result = list_all(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=10, db=mock_db, current_user=mock_user)
 
-        result = list_all(skip=0, limit=10, db=mock_db, current_user=mock_user)
-
-        assert result == ["pedido_cliente"]
+        mock_list_orders.assert_called_once_with(mock_db, 0, 10, client_id=7, cursor=None)
+        assert result == orders
 
     @pytest.mark.it("Deve negar listagem se cliente não associado")
     def test_list_all_forbidden(self):
         mock_user = mock.MagicMock(is_admin=False, client=None)
 
         with pytest.raises(HTTPException) as exc:
-            list_all(skip=0, limit=10, db=mock.MagicMock(), current_user=mock_user)
+            list_all(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=10, db=mock.MagicMock(), current_user=mock_user)
 
         assert exc.value.status_code == 403
 
     @pytest.mark.it("Admin pode acessar qualquer pedido")
-    @mock.patch("app.api.orders.get_order_by_id", return_value="pedido_admin")
+    @mock.patch("app.api.orders.get_order_by_id")
     def test_get_order_admin(self, mock_get_order):
+        mock_order = mock.MagicMock(client_id=3)
+        mock_get_order.return_value = mock_order
         mock_user = mock.MagicMock(is_admin=True)
-        result = get(id=1, db=mock.MagicMock(), current_user=mock_user)
-        assert result == "pedido_admin"
+        result = get(id=1, request=mock.MagicMock(headers={}), response=Response(), db=mock.MagicMock(), current_user=mock_user)
+        assert result == mock_order
 
     @pytest.mark.it("Cliente pode acessar seu próprio pedido")
     @mock.patch("app.api.orders.get_order_by_id")
@@ -87,7 +127,7 @@ class TestOrderRoutes:
         mock_user = mock.MagicMock(is_admin=False)
         mock_user.client.id = 7
 
-        result = get(id=5, db=mock.MagicMock(), current_user=mock_user)
+        result = get(id=5, request=mock.MagicMock(headers={}), response=Response(), db=mock.MagicMock(), current_user=mock_user)
         assert result == mock_order
 
     @pytest.mark.it("Deve negar acesso ao pedido de outro cliente")
@@ -98,7 +138,7 @@ class TestOrderRoutes:
         mock_user.client.id = 99
 
         with pytest.raises(HTTPException) as exc:
-            get(id=2, db=mock.MagicMock(), current_user=mock_user)
+            get(id=2, request=mock.MagicMock(headers={}), response=Response(), db=mock.MagicMock(), current_user=mock_user)
 
         assert exc.value.status_code == 403
 
@@ -124,3 +164,161 @@ class TestOrderRoutes:
 
         mock_delete_order.assert_called_once()
         assert result == {"message": "Pedido excluído com sucesso"}
+
+
+    @pytest.mark.it("Admin deve exportar pedidos em stream com os filtros")
+    @mock.patch("app.api.orders.export_orders", return_value=iter(["linha\n"]))
+    def test_export_admin(self, mock_export_orders):
+        result = export(request=mock.MagicMock(headers={}), format="ndjson", start=None, end=None, status="pending", current_user=mock.MagicMock(is_admin=True))
+
+        assert mock_export_orders.call_args.args[1:] == ("ndjson", None, None, "pending")
+        assert result.media_type == "application/x-ndjson"
+        assert result.headers["content-disposition"] == 'attachment; filename="pedidos.ndjson"'
+
+    @pytest.mark.it("Deve negar exportação se não for admin")
+    def test_export_not_admin(self):
+        with pytest.raises(HTTPException) as exc:
+            export(request=mock.MagicMock(headers={}), format="csv", current_user=mock.MagicMock(is_admin=False))
+        assert exc.value.status_code == 403
+
+@pytest.fixture
+def seeded_db():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base, User, Client, Product, Order, OrderItem
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    user = User(email="c@c.com", cpf="1", hashed_password="x")
+    session.add(user)
+    session.flush()
+    client = Client(name="C", address="R", phone_number="9", user_id=user.id)
+    product = Product(description="P", sale_price=1.0, barcode="1", section="s", stock=100)
+    session.add_all([client, product])
+    session.flush()
+    for _ in range(30):
+        order = Order(client_id=client.id)
+        order.items = [OrderItem(product_id=product.id, quantity=1, price=1.0) for _ in range(3)]
+        session.add(order)
+    session.commit()
+    client_id = client.id
+    session.expunge_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    yield session, client_id, statements
+    session.close()
+
+
+@pytest.mark.describe("Quantidade de consultas nas rotas de pedidos")
+class TestOrderQueryCount:
+
+    def _count(self, session, statements, call):
+        from app.schemas.orders import OrderOut
+        session.expunge_all()
+        statements.clear()
+        result = call()
+        for order in result if isinstance(result, list) else [result]:
+            OrderOut.model_validate(order)
+        return len(statements)
+
+    @pytest.mark.it("Listagem deve ter número de consultas constante independentemente do tamanho da página")
+    def test_list_constant_queries(self, seeded_db):
+        session, client_id, statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+        owner = mock.MagicMock(is_admin=False)
+        owner.client.id = client_id
+
+        small = self._count(session, statements, lambda: list_all(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=2, db=session, current_user=admin))
+        large = self._count(session, statements, lambda: list_all(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=30, db=session, current_user=admin))
+        own = self._count(session, statements, lambda: list_all(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=30, db=session, current_user=owner))
+
+        assert small == large == own == 2
+
+    @pytest.mark.it("Detalhe do pedido deve carregar os itens na mesma consulta")
+    def test_detail_single_query(self, seeded_db):
+        session, _client_id, statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+
+        assert self._count(session, statements, lambda: get(id=1, request=mock.MagicMock(headers={}), response=Response(), db=session, current_user=admin)) == 1
+
+    @pytest.mark.it("Detalhe com If-None-Match atual deve responder 304 consultando só a versão")
+    def test_detail_not_modified(self, seeded_db):
+        session, _client_id, statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+        response = Response()
+        get(id=1, request=mock.MagicMock(headers={}), response=response, db=session, current_user=admin)
+        etag = response.headers["ETag"]
+
+        session.expunge_all()
+        statements.clear()
+        request = mock.MagicMock(headers={"if-none-match": etag})
+        result = get(id=1, request=request, response=Response(), db=session, current_user=admin)
+
+        assert result.status_code == 304
+        assert result.headers["ETag"] == etag
+        assert len(statements) == 1
+        assert "order_items" not in statements[0]
+
+    @pytest.mark.it("Detalhe deve mudar o ETag quando o status muda")
+    def test_detail_etag_changes(self, seeded_db):
+        from app.db.base import Order
+        session, _client_id, _statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+        before, after = Response(), Response()
+        get(id=1, request=mock.MagicMock(headers={}), response=before, db=session, current_user=admin)
+        session.query(Order).filter(Order.id == 1).update({"status": "shipped"})
+        session.commit()
+        request = mock.MagicMock(headers={"if-none-match": before.headers["ETag"]})
+        result = get(id=1, request=request, response=after, db=session, current_user=admin)
+
+        assert result.status == "shipped"
+        assert after.headers["ETag"] != before.headers["ETag"]
+
+    @pytest.mark.it("Cliente sem acesso não deve receber 304 de pedido alheio")
+    def test_detail_not_modified_forbidden(self, seeded_db):
+        session, _client_id, _statements = seeded_db
+        response = Response()
+        get(id=1, request=mock.MagicMock(headers={}), response=response, db=session, current_user=mock.MagicMock(is_admin=True))
+        other = mock.MagicMock(is_admin=False)
+        other.client.id = 999
+        request = mock.MagicMock(headers={"if-none-match": response.headers["ETag"]})
+
+        with pytest.raises(HTTPException) as exc:
+            get(id=1, request=request, response=Response(), db=session, current_user=other)
+        assert exc.value.status_code == 403
+
+    @pytest.mark.it("Listagem com If-None-Match atual deve responder 304 consultando só as versões")
+    def test_list_not_modified(self, seeded_db):
+        session, _client_id, statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+        response = Response()
+        list_all(request=mock.MagicMock(headers={}), response=response, skip=0, limit=5, db=session, current_user=admin)
+        request = mock.MagicMock(headers={"if-none-match": f'W/{response.headers["ETag"]}'})
+
+        session.expunge_all()
+        statements.clear()
+        result = list_all(request=request, response=Response(), skip=0, limit=5, db=session, current_user=admin)
+
+        assert result.status_code == 304
+        assert result.headers["X-Next-Cursor"] == response.headers["X-Next-Cursor"]
+        assert len(statements) == 1
+        assert "order_items" not in statements[0]
+
+    @pytest.mark.it("Listagem com If-None-Match desatualizado deve retornar a página com o novo ETag")
+    def test_list_modified(self, seeded_db):
+        from app.db.base import Order
+        session, _client_id, _statements = seeded_db
+        admin = mock.MagicMock(is_admin=True)
+        before, after = Response(), Response()
+        list_all(request=mock.MagicMock(headers={}), response=before, skip=0, limit=5, db=session, current_user=admin)
+        session.query(Order).filter(Order.id == 2).update({"status": "shipped"})
+        session.commit()
+        request = mock.MagicMock(headers={"if-none-match": before.headers["ETag"]})
+
+        result = list_all(request=request, response=after, skip=0, limit=5, db=session, current_user=admin)
+
+        assert [order.status for order in result][1] == "shipped"
+        assert after.headers["ETag"] != before.headers["ETag"]
@@ -7,36 +7,62 @@ mock_settings = mock.MagicMock()
 mock_settings.SECRET_KEY = "fake"
 mock_settings.ALGORITHM = "HS256"
 mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
 sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
 
-from fastapi import HTTPException
-from app.api.products import list_products, get, create, update, delete
+from fastapi import HTTPException, Response
+from app.schemas.products import ProductOut
+from app.api.products import list_products, get, create, update, delete, import_file
 
 
 @pytest.mark.describe("Testes para rotas de produtos")
 class TestProductRoutes:
 
     @pytest.mark.it("Deve listar produtos com filtros")
-    @mock.patch("app.api.products.get_products", return_value=["produto1", "produto2"])
+    @mock.patch("app.api.products.get_products_cached", return_value=["produto1", "produto2"])
     def test_list_products(self, mock_get_products):
         mock_db = mock.MagicMock()
-        result = list_products(skip=0, limit=10, category="bebidas", price=10, available=True, db=mock_db)
-        mock_get_products.assert_called_once_with(mock_db, 0, 10, "bebidas", 10, True)
+        result = list_products(request=mock.MagicMock(headers={}), response=Response(), skip=0, limit=10, category="bebidas", price=10, available=True, db=mock_db)
+        mock_get_products.assert_called_once_with(mock_db, 0, 10, "bebidas", 10, True, cursor=None)
         assert result == ["produto1", "produto2"]
 
     @pytest.mark.it("Deve retornar produto por ID se existir")
-    @mock.patch("app.api.products.get_product_by_id", return_value="produto")
+    @mock.patch("app.api.products.get_product_cached", return_value="produto")
     def test_get_product_success(self, mock_get_product_by_id):
         mock_db = mock.MagicMock()
-        result = get(id=1, db=mock_db)
+        result = get(id=1, request=mock.MagicMock(headers={}), response=Response(), db=mock_db)
         mock_get_product_by_id.assert_called_once_with(mock_db, 1)
         assert result == "produto"
 
+    @pytest.mark.it("Deve responder 304 se o If-None-Match conferir com o produto")
+    @mock.patch("app.api.products.get_product_cached")
+    def test_get_product_not_modified(self, mock_get_product_cached):
+        mock_get_product_cached.return_value = ProductOut(
+            id=1, description="d", sale_price=1.0, barcode="b", section="s", stock=1, is_available=True,
+        )
+        response = Response()
+        get(id=1, request=mock.MagicMock(headers={}), response=response, db=mock.MagicMock())
+        request = mock.MagicMock(headers={"if-none-match": response.headers["ETag"]})
+
+        result = get(id=1, request=request, response=Response(), db=mock.MagicMock())
+
+        assert result.status_code == 304
+
     @pytest.mark.it("Deve lançar 404 se produto não encontrado")
-    @mock.patch("app.api.products.get_product_by_id", return_value=None)
+    @mock.patch("app.api.products.get_product_cached", return_value=None)
     def test_get_product_not_found(self, mock_get_product_by_id):
         with pytest.raises(HTTPException) as exc:
-            get(id=1, db=mock.MagicMock())
+            get(id=1, request=mock.MagicMock(headers={}), response=Response(), db=mock.MagicMock())
         assert exc.value.status_code == 404
         assert exc.value.detail == "Produto não encontrado"
 
@@ -113,3 +139,27 @@ class TestProductRoutes:
         with pytest.raises(HTTPException) as exc:
             delete(id=1, db=mock.MagicMock(), current_user=mock_user)
         assert exc.value.status_code == 404
+
+    @pytest.mark.it("Deve importar arquivo deduzindo o formato se for admin")
+    @mock.patch("app.api.products.import_products", return_value={"processed": 0})
+    def test_import_file_admin(self, mock_import_products):
+        mock_db = mock.MagicMock()
+        upload = mock.MagicMock(filename="catalogo.csv", content_type="text/csv")
+
+        result = import_file(file=upload, format=None, db=mock_db, current_user=mock.MagicMock(is_admin=True))
+
+        mock_import_products.assert_called_once_with(mock_db, upload.file, "csv")
+        assert result == {"processed": 0}
+
+    @pytest.mark.it("Deve rejeitar importação de formato não suportado")
+    def test_import_file_bad_format(self):
+        upload = mock.MagicMock(filename="catalogo.xlsx", content_type="application/octet-stream")
+        with pytest.raises(HTTPException) as exc:
+            import_file(file=upload, format=None, db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=True))
+        assert exc.value.status_code == 400
+
+    @pytest.mark.it("Deve negar importação se não for admin")
+    def test_import_file_not_admin(self):
+        with pytest.raises(HTTPException) as exc:
+            import_file(file=mock.MagicMock(), format="csv", db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=False))
+        assert exc.value.status_code == 403
@@ -0,0 +1,105 @@
+import sys
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api import clients, orders, products
+from app.api.auth import get_current_user, get_current_user_read
+from app.crud.products import invalidate_products
+from app.db.base import Base, User, Client, Product, Order, OrderItem
+from app.db.session import get_db, get_read_db
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    with SessionLocal() as db:
+        admin = User(email="a@a.com", cpf="0", hashed_password="x", is_admin=True)
+        db.add(admin)
+        db.flush()
+        for i in range(1, 6):
+            user = User(email=f"{i}@c.com", cpf=str(i), hashed_password="x")
+            db.add(user)
+            db.flush()
+            db.add(Client(name=f"C{i}", address="R", phone_number=str(i), user_id=user.id))
+            db.add(Product(description=f"P{i}", sale_price=i, barcode=str(i), section="s", stock=100))
+        db.flush()
+        for i in range(1, 6):
+            db.add(Order(client_id=i, items=[OrderItem(product_id=p, quantity=1, price=p) for p in range(1, 4)]))
+        db.commit()
+
+    def override_get_db():
+        with SessionLocal() as db:
+            yield db
+
+    with SessionLocal(expire_on_commit=False) as db:
+        admin = db.get(User, 1)
+
+    app = FastAPI()
+    for router in (products.router, orders.router, clients.router):
+        app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[get_current_user_read] = lambda: admin
+
+    invalidate_products()
+    client = TestClient(app)
+    client.engine = engine
+    yield client
+    invalidate_products()
+
+
+@pytest.mark.describe("Orçamento de consultas por rota")
+class TestQueryBudget:
+
+    @pytest.mark.it("Listagens: número constante de consultas por página")
+    @pytest.mark.parametrize("path, budget", [
+        ("/products/", 1),
+        ("/clients/", 1),
+        ("/orders/", 2),
+    ])
+    def test_listings(self, client, query_budget, path, budget):
+        with query_budget(client.engine, budget):
+            response = client.get(path)
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+    @pytest.mark.it("Detalhe: uma consulta, sem carregamento tardio dos relacionamentos")
+    @pytest.mark.parametrize("path", ["/products/1", "/clients/1", "/orders/1"])
+    def test_detail(self, client, query_budget, path):
+        with query_budget(client.engine, 1):
+            response = client.get(path)
+        assert response.status_code == 200
+
+    @pytest.mark.it("Listagem de pedidos: a quantidade de consultas não cresce com a página")
+    def test_orders_no_n_plus_one(self, client, query_budget):
+        with query_budget(client.engine, 2) as profile:
+            client.get("/orders/?limit=1")
+        with query_budget(client.engine, profile.count):
+            client.get("/orders/?limit=5")
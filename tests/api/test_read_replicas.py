@@ -0,0 +1,137 @@
+import sys
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api import clients, products
+from app.api.auth import get_current_user, get_current_user_read
+from app.db import session
+from app.db.base import Base, User, Client, Product
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token
+from app.crud.products import invalidate_products
+from app.db.replicas import REPLICA_SESSION, RecentWrites, ReadYourWritesMiddleware, Replica, ReplicaSet
+
+
+def _database(name, **options):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, **options)
+    with factory() as db:
+        db.add(User(id=1, email="a@a.com", cpf="0", hashed_password="x", is_admin=True))
+        db.add(Client(id=1, name=name, address="R", phone_number="9", user_id=1))
+        db.add(Product(id=1, description=name, sale_price=1, barcode="1", section="s", stock=1))
+        db.commit()
+    return engine, factory
+
+
+@pytest.fixture
+def client(monkeypatch):
+    _, primary = _database("primário")
+    replica_engine, replica_factory = _database("réplica", info={REPLICA_SESSION: True})
+    replica = Replica("replica-1", replica_engine, replica_factory)
+    replicas = ReplicaSet([replica], max_lag=5, stale_after=15)
+    recent_writes = RecentWrites(window=5)
+    monkeypatch.setattr(session, "SessionLocal", primary)
+    monkeypatch.setattr(session, "replica_set", replicas)
+    monkeypatch.setattr(session, "recent_writes", recent_writes)
+
+    def get_primary_db():
+        with session.SessionLocal() as db:
+            yield db
+
+    with primary(expire_on_commit=False) as db:
+        admin = db.get(User, 1)
+
+    app = FastAPI()
+    app.include_router(clients.router)
+    app.include_router(products.router)
+    app.add_middleware(ReadYourWritesMiddleware, recent_writes=recent_writes)
+    app.dependency_overrides[session.get_db] = get_primary_db
+    app.dependency_overrides[get_current_user] = lambda: admin
+    app.dependency_overrides[get_current_user_read] = lambda: admin
+    test_client = TestClient(app)
+    test_client.replica = replica
+    invalidate_products()
+    yield test_client
+    invalidate_products()
+
+
+@pytest.mark.describe("Roteamento das leituras para réplicas")
+class TestReadReplicaRouting:
+
+    @pytest.mark.it("Deve ler do primário enquanto a réplica não foi verificada")
+    def test_unchecked_replica(self, client):
+        assert client.get("/clients/1").json()["name"] == "primário"
+
+    @pytest.mark.it("Deve ler da réplica saudável e voltar ao primário se ela atrasar")
+    def test_lag_fallback(self, client):
+        client.replica.check()
+        assert client.get("/clients/1").json()["name"] == "réplica"
+
+        client.replica.lag = 60
+        assert client.get("/clients/1").json()["name"] == "primário"
+
+    @pytest.mark.it("Deve ler do primário logo após uma escrita do mesmo cliente")
+    def test_read_your_writes(self, client):
+        client.replica.check()
+        writer = {"Authorization": "Bearer escritor"}
+        update = {"name": "novo", "address": "R", "phone_number": "9"}
+
+        assert client.put("/clients/1", json=update, headers=writer).status_code == 200
+        client.cookies.clear()
+
+        assert client.get("/clients/1", headers=writer).json()["name"] == "novo"
+        assert client.get("/clients/1", headers={"Authorization": "Bearer outro"}).json()["name"] == "réplica"
+
+    @pytest.mark.it("Não deve servir ao escritor o produto antigo lido da réplica depois da invalidação")
+    def test_product_cache_read_your_writes(self, client):
+        client.replica.check()
+        writer = {"Authorization": "Bearer escritor"}
+
+        assert client.put("/products/1", json={"description": "novo"}, headers=writer).status_code == 200
+        client.cookies.clear()
+
+        # Outro cliente lê da réplica atrasada logo depois da invalidação
+        assert client.get("/products/1", headers={"Authorization": "Bearer outro"}).json()["description"] == "réplica"
+        assert client.get("/products/1", headers=writer).json()["description"] == "novo"
+
+    @pytest.mark.it("Deve resolver o usuário na sessão de leitura da rota, sem abrir outra no primário")
+    def test_current_user_on_read_session(self, client, monkeypatch):
+        opened = []
+        factory = session.SessionLocal
+        monkeypatch.setattr(session, "SessionLocal", lambda **kwargs: opened.append(1) or factory(**kwargs))
+        client.app.dependency_overrides.pop(get_current_user)
+        client.app.dependency_overrides.pop(get_current_user_read)
+        auth = {"Authorization": f"Bearer {create_access_token({'sub': 'a@a.com'})}"}
+
+        principal_cache.clear()
+        assert client.get("/clients/1", headers=auth).json()["name"] == "primário"
+        assert len(opened) == 1
+
+        client.replica.check()
+        principal_cache.clear()
+        assert client.get("/clients/1", headers=auth).json()["name"] == "réplica"
+        assert len(opened) == 1
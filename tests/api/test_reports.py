@@ -0,0 +1,62 @@
+import sys
+import pytest
+from unittest import mock
+
+# Mock do settings
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "fake"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+from datetime import date
+from fastapi import HTTPException
+from app.api.reports import daily, by_product, by_section
+
+
+@pytest.mark.describe("Rotas de relatórios de vendas")
+class TestReportsRoutes:
+
+    @pytest.mark.it("Deve retornar as vendas por dia para administradores")
+    @mock.patch("app.api.reports.sales_by_day", return_value=["dia"])
+    def test_daily_admin(self, mock_sales):
+        mock_db = mock.MagicMock()
+
+        result = daily(start=date(2024, 5, 1), end=None, db=mock_db, current_user=mock.MagicMock(is_admin=True))
+
+        mock_sales.assert_called_once_with(mock_db, date(2024, 5, 1), None)
+        assert result == ["dia"]
+
+    @pytest.mark.it("Deve repassar seção e limite ao relatório por produto")
+    @mock.patch("app.api.reports.sales_by_product", return_value=["produto"])
+    def test_by_product(self, mock_sales):
+        mock_db = mock.MagicMock()
+
+        result = by_product(start=None, end=None, section="roupas", limit=5, db=mock_db, current_user=mock.MagicMock(is_admin=True))
+
+        mock_sales.assert_called_once_with(mock_db, None, None, section="roupas", limit=5)
+        assert result == ["produto"]
+
+    @pytest.mark.it("Deve negar acesso a quem não é administrador")
+    @pytest.mark.parametrize("route", [daily, by_section])
+    def test_forbidden(self, route):
+        with pytest.raises(HTTPException) as exc:
+            route(start=None, end=None, db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=False))
+        assert exc.value.status_code == 403
+
+    @pytest.mark.it("Deve rejeitar período com start posterior a end")
+    def test_invalid_period(self):
+        with pytest.raises(HTTPException) as exc:
+            by_section(start=date(2024, 5, 2), end=date(2024, 5, 1), db=mock.MagicMock(), current_user=mock.MagicMock(is_admin=True))
+        assert exc.value.status_code == 400
@@ -7,9 +7,20 @@ mock_settings = mock.MagicMock()
 mock_settings.SECRET_KEY = "fake"
 mock_settings.ALGORITHM = "HS256"
 mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
 sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from app.api.users import list_users, get_user, register, login, refresh_token
 
 
@@ -17,18 +28,20 @@ from app.api.users import list_users, get_user, register, login, refresh_token
 class TestAuthUsersRoutes:
 
     @pytest.mark.it("Deve listar usuários se for admin")
-    def test_list_users_admin(self):
+    @mock.patch("app.api.users.get_users", return_value=["user1", "user2"])
+    def test_list_users_admin(self, mock_get_users):
         mock_user = mock.MagicMock(is_admin=True)
         mock_db = mock.MagicMock()
-        mock_db.query.return_value.all.return_value = ["user1", "user2"]
 
-        result = list_users(current_user=mock_user, db=mock_db)
+        result = list_users(response=Response(), current_user=mock_user, db=mock_db)
+
+        mock_get_users.assert_called_once_with(mock_db, 0, None, cursor=None)
         assert result == ["user1", "user2"]
 
     @pytest.mark.it("Deve negar listagem se não for admin")
     def test_list_users_forbidden(self):
         with pytest.raises(HTTPException) as exc:
-            list_users(current_user=mock.MagicMock(is_admin=False), db=mock.MagicMock())
+            list_users(response=Response(), current_user=mock.MagicMock(is_admin=False), db=mock.MagicMock())
         assert exc.value.status_code == 403
 
     @pytest.mark.it("Deve buscar usuário por ID")
@@ -90,9 +103,10 @@ class TestAuthUsersRoutes:
 
     @pytest.mark.it("Deve fazer login com credenciais válidas")
     @mock.patch("app.api.users.create_access_token", return_value="token")
+    @mock.patch("app.api.users.password_needs_rehash", return_value=False)
     @mock.patch("app.api.users.verify_password", return_value=True)
     @mock.patch("app.api.users.get_user_by_email")
-    def test_login_success(self, mock_get_user, mock_verify, mock_create_token):
+    def test_login_success(self, mock_get_user, mock_verify, mock_needs_rehash, mock_create_token):
         mock_user = mock.MagicMock(email="x@x.com", hashed_password="hashed")
         mock_get_user.return_value = mock_user
 
@@ -100,6 +114,24 @@ class TestAuthUsersRoutes:
         result = login(form_data=form, db=mock.MagicMock())
         assert result == {"access_token": "token", "token_type": "bearer"}
 
+    @pytest.mark.it("Deve regravar o hash no login se o custo do bcrypt mudou")
+    @mock.patch("app.api.users.create_access_token", return_value="token")
+    @mock.patch("app.api.users.get_password_hash", return_value="novo_hash")
+    @mock.patch("app.api.users.password_needs_rehash", return_value=True)
+    @mock.patch("app.api.users.verify_password", return_value=True)
+    @mock.patch("app.api.users.get_user_by_email")
+    def test_login_rehash(self, mock_get_user, mock_verify, mock_needs_rehash, mock_hash, mock_create_token):
+        mock_user = mock.MagicMock(email="x@x.com", hashed_password="hash_antigo")
+        mock_get_user.return_value = mock_user
+        mock_db = mock.MagicMock()
+
+        form = mock.MagicMock(username="x@x.com", password="123")
+        login(form_data=form, db=mock_db)
+
+        mock_hash.assert_called_once_with("123")
+        assert mock_user.hashed_password == "novo_hash"
+        mock_db.commit.assert_called_once()
+
     @pytest.mark.it("Deve retornar erro no login se credenciais inválidas")
     @mock.patch("app.api.users.verify_password", return_value=False)
     @mock.patch("app.api.auth.get_user_by_email")
@@ -0,0 +1,21 @@
+import pytest
+from contextlib import contextmanager
+from app.db.profiler import record_queries
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Verifica o máximo de comandos SQL executados em um bloco:
+
+        with query_budget(engine, 2) as profile:
+            client.get("/orders/")
+    """
+
+    @contextmanager
+    def budget(engine, max_queries: int):
+        with record_queries(engine) as profile:
+            yield profile
+        profile.assert_budget(max_queries)
+
+    return budget
@@ -0,0 +1,66 @@
+import pytest
+from app.core.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.describe("TTLCache")
+class TestTTLCache:
+
+    @pytest.mark.it("Deve retornar valores armazenados e contar hits e misses")
+    def test_get_set(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    @pytest.mark.it("Deve expirar entradas após o TTL")
+    def test_ttl(self):
+        timer = FakeTimer()
+        cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+        cache.set("a", 1)
+        cache.set("b", 2, expires_at=20)
+
+        timer.now = 5
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.expirations == 1
+
+    @pytest.mark.it("Deve descartar a entrada menos usada ao exceder maxsize")
+    def test_lru(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    @pytest.mark.it("Deve invalidar entradas por chave e por predicado")
+    def test_invalidate(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set(("list", 1), 1)
+        cache.set(("list", 2), 2)
+        cache.set(("item", 1), 3)
+
+        assert cache.invalidate(("item", 1)) is True
+        assert cache.invalidate_where(lambda key: key[0] == "list") == 2
+        assert len(cache) == 0
+
+    @pytest.mark.it("Não deve armazenar nada com maxsize zero")
+    def test_disabled(self):
+        cache = TTLCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.metrics import RequestMetrics, RequestStats, MetricsMiddleware, instrument_engine, current_request
+
+
+@pytest.fixture
+def client():
+    metrics = RequestMetrics()
+    engine = instrument_engine(create_engine("sqlite://"), metrics)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/items/{id}")
+    def get_item(id: int):
+        with engine.connect() as conn:
+            for _ in range(id):
+                conn.execute(text("SELECT 1"))
+        return {"id": id}
+
+    @app.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=418)
+
+    client = TestClient(app)
+    client.metrics = metrics
+    client.engine = engine
+    return client
+
+
+@pytest.mark.describe("Métricas HTTP por rota")
+class TestRequestMetrics:
+
+    @pytest.mark.it("Deve agrupar pelo template da rota e contar por status")
+    def test_route_and_status(self, client):
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/fail")
+        client.get("/nada")
+
+        metrics = client.metrics
+        assert metrics.requests[("GET", "/items/{id}", 200)] == 2
+        assert metrics.requests[("GET", "/fail", 418)] == 1
+        assert metrics.requests[("GET", "<unmatched>", 404)] == 1
+        assert metrics.in_progress == {"GET": 0}
+        assert sum(metrics.latency[("GET", "/items/{id}")].counts) == 2
+
+    @pytest.mark.it("Deve contar comandos SQL e tempo de banco por requisição")
+    def test_sql_per_request(self, client):
+        client.get("/items/3")
+        client.get("/items/1")
+
+        statements = client.metrics.statements[("GET", "/items/{id}")]
+        assert statements.sum == 4
+        assert dict(statements.cumulative())["1.0"] == 1
+        assert client.metrics.db_seconds[("GET", "/items/{id}")].sum > 0
+
+    @pytest.mark.it("Deve separar comandos SQL executados fora de requisições")
+    def test_untracked(self, client):
+        with client.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert current_request.get() is None
+        assert client.metrics.untracked_statements == 1
+
+    @pytest.mark.it("Deve expor no formato texto do Prometheus")
+    def test_render(self):
+        metrics = RequestMetrics(latency_buckets=(0.1, 1.0), statement_buckets=(1,))
+        stats = RequestStats({})
+        stats.statements = 2
+        metrics.start("GET")
+        metrics.finish("GET", 200, 0.5, stats)
+
+        body = metrics.render()
+
+        assert 'http_requests_total{method="GET",route="<unmatched>",status="200"} 1' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="<unmatched>",le="0.1"} 0' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="<unmatched>",le="1.0"} 1' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="<unmatched>",le="+Inf"} 1' in body
+        assert 'http_request_db_statements_sum{method="GET",route="<unmatched>"} 2' in body
+        assert "# TYPE http_requests_in_progress gauge" in body
@@ -0,0 +1,118 @@
+import sys
+import pytest
+from unittest import mock
+
+mock_settings = mock.MagicMock()
+mock_settings.SECRET_KEY = "testsecret"
+mock_settings.ALGORITHM = "HS256"
+mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
+
+sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base, User, Client
+from app.api.auth import get_current_user
+from app.core.principal_cache import principal_cache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="a@a.com", cpf="1", hashed_password="x")
+    session.add(user)
+    session.flush()
+    session.add(Client(name="A", address="R", phone_number="9", user_id=user.id))
+    session.commit()
+    session.close()
+    principal_cache.clear()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    Session = sessionmaker(bind=engine)
+    yield Session, statements
+    principal_cache.clear()
+
+
+@pytest.mark.describe("Cache de principals em get_current_user")
+class TestPrincipalCache:
+
+    @pytest.mark.it("Deve consultar o banco apenas no primeiro acesso")
+    @mock.patch("app.api.auth.decode_token", return_value={"sub": "a@a.com"})
+    def test_cache_hit_skips_query(self, _, db):
+        Session, statements = db
+        hits, misses = principal_cache.hits, principal_cache.misses
+
+        with Session() as session:
+            get_current_user(token="t", db=session)
+        queries_after_miss = len(statements)
+
+        with Session() as session:
+            user = get_current_user(token="t", db=session)
+            assert user.email == "a@a.com"
+            assert len(statements) == queries_after_miss
+            assert user.client.name == "A"
+
+        assert principal_cache.hits - hits == 1
+        assert principal_cache.misses - misses == 1
+
+    @pytest.mark.it("Deve invalidar o principal quando o usuário é promovido")
+    @mock.patch("app.api.auth.decode_token", return_value={"sub": "a@a.com"})
+    def test_invalidate_on_promotion(self, _, db):
+        Session, _statements = db
+
+        with Session() as session:
+            get_current_user(token="t", db=session)
+        assert principal_cache.get("a@a.com") is not None
+
+        with Session() as session:
+            session.query(User).one().is_admin = True
+            session.flush()
+            assert principal_cache.get("a@a.com") is not None
+            session.commit()
+        assert principal_cache.get("a@a.com") is None
+
+        with Session() as session:
+            assert get_current_user(token="t", db=session).is_admin is True
+
+    @pytest.mark.it("Deve invalidar o e-mail antigo quando o usuário troca de e-mail")
+    @mock.patch("app.api.auth.decode_token", return_value={"sub": "a@a.com"})
+    def test_invalidate_on_email_change(self, _, db):
+        Session, _statements = db
+
+        with Session() as session:
+            get_current_user(token="t", db=session)
+
+        with Session() as session:
+            session.query(User).one().email = "b@b.com"
+            session.commit()
+
+        assert principal_cache.get("a@a.com") is None
+
+    @pytest.mark.it("Não deve invalidar se a transação for desfeita")
+    @mock.patch("app.api.auth.decode_token", return_value={"sub": "a@a.com"})
+    def test_rollback_keeps_entry(self, _, db):
+        Session, _statements = db
+
+        with Session() as session:
+            get_current_user(token="t", db=session)
+
+        with Session() as session:
+            session.query(User).one().is_active = False
+            session.flush()
+            session.rollback()
+
+        assert principal_cache.get("a@a.com") is not None
@@ -6,10 +6,38 @@ mock_settings = mock.MagicMock()
 mock_settings.SECRET_KEY = "testsecret"
 mock_settings.ALGORITHM = "HS256"
 mock_settings.DATABASE_URL = "postgresql://fake"
+mock_settings.BCRYPT_ROUNDS = 4
+mock_settings.PASSWORD_HASH_WORKERS = 2
+mock_settings.PASSWORD_HASH_MAX_PENDING = 8
+mock_settings.PRINCIPAL_CACHE_SIZE = 100
+mock_settings.PRINCIPAL_CACHE_TTL = 60
+mock_settings.TOKEN_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_SIZE = 100
+mock_settings.PRODUCT_CACHE_TTL = 30
+mock_settings.FAST_JSON = False
+mock_settings.METRICS_ENABLED = False
+mock_settings.SQL_PROFILER_ENABLED = False
 
 sys.modules["app.settings"] = mock.MagicMock(settings=mock_settings)
 
-from app.core.security import get_password_hash, verify_password
+import asyncio
+import threading
+import time
+from sqlalchemy.util.concurrency import greenlet_spawn
+from datetime import timedelta
+from jose import jwt, JWTError
+from app.core.security import (
+    PasswordHasher,
+    PasswordHasherBusy,
+    _token_digest,
+    create_access_token,
+    decode_token,
+    get_password_hash,
+    password_needs_rehash,
+    pwd_context,
+    token_cache,
+    verify_password,
+)
 
 
 @pytest.mark.describe("get_password_hash")
@@ -70,4 +98,101 @@ class TestVerifyPassword:
         with mock.patch("app.core.security.pwd_context.verify", return_value=False) as mock_verify:
             result = verify_password("senha123", "hashed")
             mock_verify.assert_called_once_with("senha123", "hashed")
-            assert result is False
\ No newline at end of file
+            assert result is False
+
+
+@pytest.mark.describe("PasswordHasher")
+class TestPasswordHasher:
+    @pytest.mark.it("Deve executar o hash fora da thread da requisição")
+    def test_runs_in_pool(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=1)
+        result = hasher.run(lambda: threading.current_thread().name)
+        hasher.shutdown()
+        assert result.startswith("password-hasher")
+
+    @pytest.mark.it("Deve falhar imediatamente quando a fila estiver cheia")
+    def test_busy_when_full(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=1)
+        release = threading.Event()
+        first = hasher.submit(release.wait)
+        second = hasher.submit(release.wait)
+
+        with pytest.raises(PasswordHasherBusy):
+            hasher.submit(release.wait)
+
+        release.set()
+        first.result()
+        second.result()
+        assert hasher.run(lambda: "ok") == "ok"
+        hasher.shutdown()
+
+    @pytest.mark.it("Deve aguardar o hash sem bloquear o event loop dentro de run_sync")
+    def test_run_in_greenlet(self):
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.005)
+
+        async def login():
+            ticker = asyncio.create_task(tick())
+            result = await greenlet_spawn(verify_password, "senha", "hashed")
+            ticker.cancel()
+            return result
+
+        def slow_verify(plain, hashed):
+            time.sleep(0.05)
+            return True
+
+        with mock.patch("app.core.security.pwd_context.verify", side_effect=slow_verify):
+            assert asyncio.run(login()) is True
+        assert len(ticks) >= 3
+
+
+@pytest.mark.describe("password_needs_rehash")
+class TestPasswordNeedsRehash:
+    @pytest.mark.it("Deve indicar rehash apenas para hashes com custo diferente do configurado")
+    def test_needs_rehash(self):
+        other_cost = pwd_context.handler("bcrypt").using(rounds=5).hash("senha")
+        assert password_needs_rehash(other_cost) is True
+        assert password_needs_rehash(pwd_context.hash("senha")) is False
+
+
+
+@pytest.mark.describe("decode_token")
+class TestDecodeToken:
+    def setup_method(self):
+        token_cache.clear()
+
+    @pytest.mark.it("Deve verificar o token uma única vez e servir os claims do cache")
+    def test_memoized(self):
+        token = create_access_token({"sub": "a@a.com"})
+
+        with mock.patch("app.core.security.jwt.decode", wraps=jwt.decode) as mock_decode:
+            first = decode_token(token)
+            second = decode_token(token)
+
+        assert mock_decode.call_count == 1
+        assert first == second
+        assert second["sub"] == "a@a.com"
+
+    @pytest.mark.it("Deve expirar a entrada do cache no exp do token")
+    def test_expires_at_exp(self):
+        token = create_access_token({"sub": "a@a.com"}, expires_delta=timedelta(seconds=30))
+        claims = decode_token(token)
+
+        with mock.patch.object(token_cache, "timer", return_value=claims["exp"]):
+            assert token_cache.get(_token_digest(token)) is None
+
+    @pytest.mark.it("Não deve armazenar tokens inválidos")
+    def test_invalid_token_not_cached(self):
+        with pytest.raises(JWTError):
+            decode_token("token.invalido")
+        assert len(token_cache) == 0
+
+    @pytest.mark.it("Não deve permitir que o chamador altere os claims em cache")
+    def test_returns_copy(self):
+        token = create_access_token({"sub": "a@a.com"})
+        decode_token(token)["sub"] = "outro"
+        assert decode_token(token)["sub"] == "a@a.com"
@@ -3,12 +3,16 @@ from unittest import mock
 from app.db.models.clients import Client
 from app.schemas.clients import ClientCreate
 from app.crud.clients import (
+    CLIENT_OPTIONS,
     get_client_by_id,
+    get_clients,
     get_client_by_name,
     get_client_by_address,
     get_client_by_phone_number,
     get_client_by_user_id,
     create_client,
+    search_clients,
+    _search_query,
 )
 
 
@@ -22,17 +26,38 @@ class TestGetClientById:
         expected_client = mock.MagicMock()
 
         mock_db.query.return_value = mock_query
+        mock_query.options.return_value = mock_query
         mock_query.filter.return_value = mock_filter
         mock_filter.first.return_value = expected_client
 
         result = get_client_by_id(mock_db, 1)
 
         mock_db.query.assert_called_once_with(Client)
+        mock_query.options.assert_called_once_with(*CLIENT_OPTIONS)
         mock_query.filter.assert_called_once()
         mock_filter.first.assert_called_once()
         assert result == expected_client
 
 
+@pytest.mark.describe("get_clients")
+class TestGetClients:
+    @pytest.mark.it("Deve listar clientes com o usuário carregado na mesma consulta")
+    def test_get_clients(self):
+        mock_db = mock.MagicMock()
+        mock_query = mock_db.query.return_value
+        mock_query.options.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.limit.return_value.all.return_value = ["cliente"]
+
+        result = get_clients(mock_db, skip=0, limit=10, name="Jo")
+
+        mock_db.query.assert_called_once_with(Client)
+        mock_query.options.assert_called_once_with(*CLIENT_OPTIONS)
+        mock_query.filter.assert_called_once()
+        assert result == ["cliente"]
+
+
 @pytest.mark.describe("get_client_by_name")
 class TestGetClientByName:
     @pytest.mark.it("Deve retornar lista de clientes por nome")
@@ -138,3 +163,78 @@ class TestCreateClient:
         mock_db.refresh.assert_called_once_with(mock_client)
         assert result == mock_client
 
+
+
+@pytest.fixture
+def sqlite_db():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base, User
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    rows = [("Maria Silva", "Rua das Flores"), ("João 50%", "Av. Brasil"), ("Ana", "Rua Marinho")]
+    for i, (name, address) in enumerate(rows):
+        user = User(email=f"{i}@c.com", cpf=str(i), hashed_password="x")
+        session.add(user)
+        session.flush()
+        session.add(Client(name=name, address=address, phone_number=str(i), user_id=user.id))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.describe("search_clients")
+class TestSearchClients:
+    @pytest.mark.it("Deve buscar por nome ou endereço com ILIKE fora do Postgres")
+    def test_search_fallback(self, sqlite_db):
+        result = search_clients(sqlite_db, "mari")
+
+        assert [c.name for c in result] == ["Maria Silva", "Ana"]
+
+    @pytest.mark.it("Deve tratar % e _ do termo como literais")
+    def test_search_escapes_wildcards(self, sqlite_db):
+        assert [c.name for c in search_clients(sqlite_db, "50%")] == ["João 50%"]
+        assert search_clients(sqlite_db, "_") == []
+
+    @pytest.mark.it("Deve paginar os resultados")
+    def test_search_paginates(self, sqlite_db):
+        assert [c.name for c in search_clients(sqlite_db, "r", skip=1, limit=1)] == ["João 50%"]
+
+    @pytest.mark.it("Deve ordenar por similaridade trigram no Postgres")
+    def test_search_postgres_query(self, sqlite_db):
+        from sqlalchemy.dialects import postgresql
+
+        sql = str(_search_query(sqlite_db, "mari", "postgresql").statement.compile(dialect=postgresql.dialect()))
+
+        assert "clients.name %% " in sql
+        assert "clients.address ILIKE" in sql
+        assert "ORDER BY greatest(similarity(clients.name" in sql
+
+    @pytest.mark.it("Deve declarar índices GIN trigram apenas para o Postgres")
+    def test_trigram_indexes(self, sqlite_db):
+        from sqlalchemy import inspect
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.schema import CreateIndex
+
+        index = next(i for i in Client.__table__.indexes if i.name == "ix_clients_name_trgm")
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+        assert "USING gin (name gin_trgm_ops)" in ddl
+        names = {i["name"] for i in inspect(sqlite_db.get_bind()).get_indexes("clients")}
+        assert "ix_clients_name_trgm" not in names
+
+
+@pytest.mark.describe("get_clients_out")
+class TestGetClientsOut:
+    @pytest.mark.it("Deve montar os mesmos ClientOut da listagem ORM")
+    def test_matches_orm_listing(self, sqlite_db):
+        from app.crud.clients import get_clients_out
+        from app.schemas.clients import ClientOut
+
+        fast = get_clients_out(sqlite_db, 0, 10, name="a")
+        expected = [ClientOut.model_validate(client) for client in get_clients(sqlite_db, 0, 10, name="a")]
+
+        assert len(fast) == 2
+        assert [client.model_dump() for client in fast] == [client.model_dump() for client in expected]
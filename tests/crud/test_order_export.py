@@ -0,0 +1,86 @@
+import json
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base, User, Client, Product, Order, OrderItem
+from app.crud.order_export import export_orders
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        user = User(email="c@c.com", cpf="1", hashed_password="x")
+        session.add(user)
+        session.flush()
+        client = Client(name="C", address="R", phone_number="9", user_id=user.id)
+        product = Product(description="P", sale_price=2.0, barcode="1", section="s", stock=100)
+        session.add_all([client, product])
+        session.flush()
+        for day, status in [(3, "pending"), (1, "shipped"), (2, "pending")]:
+            order = Order(client_id=client.id, status=status, created_at=datetime(2024, 1, day))
+            order.items = [OrderItem(product_id=product.id, quantity=q, price=2.0) for q in (1, 2)]
+            session.add(order)
+        session.add(Order(client_id=client.id, created_at=datetime(2024, 1, 4)))
+        session.commit()
+    factory.engine = engine
+    return factory
+
+
+@pytest.mark.describe("Exportação de pedidos")
+class TestExportOrders:
+
+    @pytest.mark.it("Deve exportar uma linha CSV por item, na ordem de criação")
+    def test_csv(self, session_factory):
+        lines = "".join(export_orders(session_factory, "csv")).splitlines()
+
+        assert lines[0] == "order_id,client_id,status,created_at,item_id,product_id,quantity,price"
+        assert lines[1] == "2,1,shipped,2024-01-01T00:00:00,3,1,1,2.0"
+        assert [line.split(",")[0] for line in lines[1:]] == ["2", "2", "3", "3", "1", "1", "4"]
+        assert lines[-1] == "4,1,pending,2024-01-04T00:00:00,,,,"
+
+    @pytest.mark.it("Deve exportar um objeto NDJSON por pedido com os itens aninhados")
+    def test_ndjson(self, session_factory):
+        orders = [json.loads(line) for line in "".join(export_orders(session_factory, "ndjson", batch_size=1)).splitlines()]
+
+        assert [o["id"] for o in orders] == [2, 3, 1, 4]
+        assert orders[0]["items"] == [
+            {"id": 3, "product_id": 1, "quantity": 1, "price": 2.0},
+            {"id": 4, "product_id": 1, "quantity": 2, "price": 2.0},
+        ]
+        assert orders[-1]["items"] == []
+
+    @pytest.mark.it("Deve exportar pedidos sem created_at com o campo vazio (CSV) ou null (NDJSON)")
+    def test_null_created_at(self, session_factory):
+        from sqlalchemy import update
+        with session_factory() as session:
+            session.execute(update(Order).where(Order.id == 4).values(created_at=None))
+            session.commit()
+
+        lines = "".join(export_orders(session_factory, "csv")).splitlines()
+        assert "4,1,pending,,,,," in lines
+        orders = [json.loads(line) for line in "".join(export_orders(session_factory, "ndjson")).splitlines()]
+        assert next(o for o in orders if o["id"] == 4)["created_at"] is None
+
+    @pytest.mark.it("Deve filtrar por período e status")
+    def test_filters(self, session_factory):
+        chunks = export_orders(session_factory, "ndjson", start=datetime(2024, 1, 2), end=datetime(2024, 1, 4), status="pending")
+        orders = [json.loads(line) for line in "".join(chunks).splitlines()]
+
+        assert [o["id"] for o in orders] == [3, 1]
+
+    @pytest.mark.it("Deve gerar em blocos sob demanda com uma única consulta")
+    def test_streams_in_batches(self, session_factory):
+        statements = []
+        event.listen(session_factory.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        chunks = export_orders(session_factory, "csv", batch_size=2)
+        assert statements == []
+        first = next(chunks)
+
+        assert first.count("\n") == 3
+        assert len(statements) == 1
+        assert len(list(chunks)) == 3
@@ -1,7 +1,16 @@
 import pytest
 from unittest import mock
 from fastapi import HTTPException
-from app.crud.orders import Order, get_order_by_id, create_order, list_orders, update_order, delete_order
+from app.crud.orders import (
+    Order,
+    ORDER_DETAIL_OPTIONS,
+    ORDER_LIST_OPTIONS,
+    get_order_by_id,
+    create_order,
+    list_orders,
+    update_order,
+    delete_order,
+)
 
 
 @pytest.mark.describe("create_order")
@@ -9,16 +18,16 @@ class TestCreateOrder:
     @pytest.mark.it("Deve criar pedido com item válido e estoque suficiente")
     def test_create_order_success(self):
         mock_db = mock.MagicMock()
-        mock_product = mock.MagicMock(stock=10, description="Produto X", sale_price=50)
+        mock_product = mock.MagicMock(id=1, stock=10, description="Produto X", sale_price=50)
         mock_order = mock.MagicMock(id=123)
 
         mock_item = mock.MagicMock(product_id=1, quantity=2)
         mock_order_data = mock.MagicMock(items=[mock_item])
 
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
+        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product]
+        mock_db.execute.return_value.all.return_value = [(1, 8, True)]
 
-        with mock.patch("app.crud.orders.Order", return_value=mock_order), \
-             mock.patch("app.crud.orders.OrderItem"):
+        with mock.patch("app.crud.orders.Order", return_value=mock_order):
             result = create_order(mock_db, client_id=1, order_data=mock_order_data)
 
         mock_db.add.assert_any_call(mock_order)
@@ -33,7 +42,7 @@ class TestCreateOrder:
         mock_item = mock.MagicMock(product_id=1, quantity=2)
         mock_order_data = mock.MagicMock(items=[mock_item])
 
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.query.return_value.filter.return_value.all.return_value = []
 
         with mock.patch("app.crud.orders.Order"):
             with pytest.raises(HTTPException) as e:
@@ -46,8 +55,8 @@ class TestCreateOrder:
     def test_create_order_stock_zero(self):
         mock_db = mock.MagicMock()
 
-        mock_product = mock.MagicMock(stock=0, description="Produto Z")
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
+        mock_product = mock.MagicMock(id=1, stock=0, description="Produto Z")
+        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product]
 
         mock_item = mock.MagicMock(product_id=1, quantity=1)
         mock_order_data = mock.MagicMock(items=[mock_item])
@@ -63,8 +72,8 @@ class TestCreateOrder:
     def test_create_order_insufficient_stock(self):
         mock_db = mock.MagicMock()
 
-        mock_product = mock.MagicMock(stock=1, description="Produto Y")
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
+        mock_product = mock.MagicMock(id=1, stock=1, description="Produto Y")
+        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product]
 
         mock_item = mock.MagicMock(product_id=1, quantity=2)
         mock_order_data = mock.MagicMock(items=[mock_item])
@@ -76,6 +85,108 @@ class TestCreateOrder:
         assert e.value.status_code == 400
         assert "insuficiente" in e.value.detail
 
+    @pytest.mark.it("Deve carregar os produtos em uma consulta e inserir os itens em lote")
+    def test_create_order_set_based(self):
+        mock_db = mock.MagicMock()
+        products = [
+            mock.MagicMock(id=1, stock=10, description="A", sale_price=5),
+            mock.MagicMock(id=2, stock=10, description="B", sale_price=7),
+        ]
+        mock_db.query.return_value.filter.return_value.all.return_value = products
+        mock_db.execute.return_value.all.return_value = [(1, 8, True), (2, 6, True)]
+
+        items = [
+            mock.MagicMock(product_id=2, quantity=1),
+            mock.MagicMock(product_id=1, quantity=2),
+            mock.MagicMock(product_id=2, quantity=3),
+        ]
+        mock_order_data = mock.MagicMock(items=items)
+
+        with mock.patch("app.crud.orders.Order", return_value=mock.MagicMock(id=9)):
+            create_order(mock_db, 1, mock_order_data)
+
+        mock_db.query.assert_called_once()
+        # baixa de estoque, itens e resumo de vendas
+        assert mock_db.execute.call_count == 3
+        rows = mock_db.execute.call_args_list[1].args[1]
+        assert [(row["product_id"], row["quantity"], row["price"]) for row in rows] == [(2, 1, 7), (1, 2, 5), (2, 3, 7)]
+        assert all(row["order_id"] == 9 for row in rows)
+
+    @pytest.mark.it("Deve baixar o estoque com um único UPDATE condicional")
+    def test_create_order_conditional_update(self):
+        mock_db = mock.MagicMock()
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            mock.MagicMock(id=1, stock=10, description="A", sale_price=5),
+        ]
+        mock_db.execute.return_value.all.return_value = [(1, 0, False)]
+
+        with mock.patch("app.crud.orders.Order"):
+            create_order(mock_db, 1, mock.MagicMock(items=[mock.MagicMock(product_id=1, quantity=10)]))
+
+        sql = str(mock_db.execute.call_args_list[0].args[0])
+        assert sql.startswith("UPDATE products SET stock=")
+        assert "products.stock >= CASE products.id" in sql
+        assert "is_available=CASE WHEN" in sql
+        assert "RETURNING products.id, products.stock, products.is_available" in sql
+
+    @pytest.mark.it("Deve bloquear os produtos em ordem de id antes do UPDATE no Postgres")
+    def test_create_order_locks_in_id_order(self):
+        from sqlalchemy.dialects import postgresql
+
+        mock_db = mock.MagicMock()
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            mock.MagicMock(id=1, stock=10, description="A", sale_price=5),
+            mock.MagicMock(id=2, stock=10, description="B", sale_price=5),
+        ]
+        mock_db.execute.return_value.all.return_value = [(1, 9, True), (2, 9, True)]
+        items = [mock.MagicMock(product_id=2, quantity=1), mock.MagicMock(product_id=1, quantity=1)]
+
+        with mock.patch("app.crud.orders.Order"):
+            create_order(mock_db, 1, mock.MagicMock(items=items))
+
+        lock, update = (call.args[0] for call in mock_db.execute.call_args_list[:2])
+        sql = str(lock.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        assert sql.endswith("WHERE products.id IN (1, 2) ORDER BY products.id FOR UPDATE")
+        assert str(update).startswith("UPDATE products SET stock=")
+
+    @pytest.mark.it("Deve rejeitar e desfazer se o UPDATE não alterar algum produto")
+    def test_create_order_concurrent_oversell(self):
+        mock_db = mock.MagicMock()
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            mock.MagicMock(id=1, stock=10, description="A", sale_price=5),
+            mock.MagicMock(id=2, stock=10, description="B", sale_price=5),
+        ]
+        # Outro pedido consumiu o estoque do produto 2 entre a leitura e o UPDATE
+        mock_db.execute.return_value.all.return_value = [(1, 9, True)]
+        # O rollback expira os produtos: ler a descrição depois dispararia outro SELECT
+        products = mock_db.query.return_value.filter.return_value.all.return_value
+        mock_db.rollback.side_effect = lambda: setattr(products[1], "description", "expirado")
+        items = [mock.MagicMock(product_id=1, quantity=1), mock.MagicMock(product_id=2, quantity=5)]
+
+        with mock.patch("app.crud.orders.Order"):
+            with pytest.raises(HTTPException) as e:
+                create_order(mock_db, 1, mock.MagicMock(items=items))
+
+        assert e.value.status_code == 400
+        assert "'B'" in e.value.detail
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.it("Deve validar o estoque somando linhas do mesmo produto")
+    def test_create_order_aggregates_quantities(self):
+        mock_db = mock.MagicMock()
+        mock_db.query.return_value.filter.return_value.all.return_value = [mock.MagicMock(id=1, stock=3, description="A")]
+        items = [mock.MagicMock(product_id=1, quantity=2), mock.MagicMock(product_id=1, quantity=2)]
+
+        with mock.patch("app.crud.orders.Order"):
+            with pytest.raises(HTTPException) as e:
+                create_order(mock_db, 1, mock.MagicMock(items=items))
+
+        assert e.value.status_code == 400
+        assert "insuficiente" in e.value.detail
+        mock_db.execute.assert_not_called()
+
 @pytest.mark.describe("get_order_by_id")
 class TestGetOrderById:
     @pytest.mark.it("Deve retornar o pedido pelo ID")
@@ -86,12 +197,14 @@ class TestGetOrderById:
         expected_order = mock.MagicMock()
 
         mock_db.query.return_value = mock_query
+        mock_query.options.return_value = mock_query
         mock_query.filter.return_value = mock_filter
         mock_filter.first.return_value = expected_order
 
         result = get_order_by_id(mock_db, 1)
 
         mock_db.query.assert_called_once_with(Order)
+        mock_query.options.assert_called_once_with(*ORDER_DETAIL_OPTIONS)
         mock_query.filter.assert_called_once()
         mock_filter.first.assert_called_once()
         assert result == expected_order
@@ -106,17 +219,35 @@ class TestListOrders:
         expected_orders = [mock.MagicMock()]
 
         mock_db.query.return_value = mock_query
+        mock_query.options.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
         mock_query.offset.return_value = mock_offset
         mock_offset.limit.return_value.all.return_value = expected_orders
 
         result = list_orders(mock_db, skip=5, limit=20)
 
         mock_db.query.assert_called_once_with(Order)
+        mock_query.options.assert_called_once_with(*ORDER_LIST_OPTIONS)
+        mock_query.filter.assert_not_called()
         mock_query.offset.assert_called_once_with(5)
         mock_offset.limit.assert_called_once_with(20)
         mock_offset.limit.return_value.all.assert_called_once()
         assert result == expected_orders
 
+    @pytest.mark.it("Deve filtrar pelos pedidos do cliente quando informado")
+    def test_list_orders_by_client(self):
+        mock_db = mock.MagicMock()
+        mock_query = mock_db.query.return_value
+        mock_query.options.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.limit.return_value.all.return_value = ["pedido"]
+
+        result = list_orders(mock_db, 0, 10, client_id=7)
+
+        mock_query.filter.assert_called_once()
+        assert result == ["pedido"]
+
 @pytest.mark.describe("update_order")
 class TestUpdateOrder:
     @pytest.mark.it("Deve atualizar o status do pedido")
@@ -142,4 +273,119 @@ class TestDeleteOrder:
         delete_order(mock_db, mock_order)
 
         mock_db.delete.assert_called_once_with(mock_order)
-        mock_db.commit.assert_called_once()
\ No newline at end of file
+        mock_db.commit.assert_called_once()
+
+@pytest.fixture
+def batch_db():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base, User, Client, Product
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="c@c.com", cpf="1", hashed_password="x")
+    session.add(user)
+    session.flush()
+    session.add(Client(name="C", address="R", phone_number="9", user_id=user.id))
+    session.add_all([
+        Product(description="A", sale_price=2.0, barcode="a", section="s", stock=5),
+        Product(description="B", sale_price=3.0, barcode="b", section="s", stock=5),
+    ])
+    session.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def _order(*items):
+    from app.schemas.orders import OrderCreate
+    return OrderCreate(items=[{"product_id": product_id, "quantity": quantity} for product_id, quantity in items])
+
+
+def _stock(db):
+    from app.db.base import Product
+    db.expire_all()
+    return {product.id: product.stock for product in db.query(Product).order_by(Product.id)}
+
+
+@pytest.mark.describe("create_orders_batch")
+class TestCreateOrdersBatch:
+
+    @pytest.mark.it("Deve criar todos os pedidos com consultas em número constante")
+    def test_batch_success(self, batch_db):
+        from app.crud.orders import create_orders_batch
+
+        results = create_orders_batch(batch_db, 1, [_order((1, 1), (2, 1)) for _ in range(4)])
+
+        # produtos, baixa de estoque, pedidos, itens, resumo de vendas e
+        # recarga (pedidos + itens)
+        assert len(batch_db.statements) == 7
+        assert all(result["order"] is not None for result in results)
+        assert [len(result["order"].items) for result in results] == [2, 2, 2, 2]
+        assert results[0]["order"].items[1].price == 3.0
+        assert _stock(batch_db) == {1: 1, 2: 1}
+
+    @pytest.mark.it("Modo atômico: não deve gravar nada se algum pedido falhar")
+    def test_batch_atomic(self, batch_db):
+        from app.crud.orders import create_orders_batch, BATCH_ABORTED
+
+        results = create_orders_batch(batch_db, 1, [_order((1, 3)), _order((1, 3)), _order((9, 1))])
+
+        assert [r["status_code"] for r in results] == [BATCH_ABORTED[0], 400, 404]
+        assert all(r["order"] is None for r in results)
+        assert _stock(batch_db) == {1: 5, 2: 5}
+        assert batch_db.query(Order).count() == 0
+
+    @pytest.mark.it("Melhor esforço: deve gravar os válidos descontando o estoque reservado no lote")
+    def test_batch_best_effort(self, batch_db):
+        from app.crud.orders import create_orders_batch
+
+        results = create_orders_batch(batch_db, 1, [_order((1, 3)), _order((1, 3)), _order((1, 2))], atomic=False)
+
+        assert [r["order"] is not None for r in results] == [True, False, True]
+        assert results[1]["error"] == "Estoque insuficiente para 'A'"
+        assert _stock(batch_db) == {1: 0, 2: 5}
+
+    @pytest.mark.it("Deve revalidar com o estoque atual se outro pedido consumir o estoque")
+    def test_batch_concurrent_retry(self, batch_db):
+        from app.crud import orders as crud_orders
+
+        original = crud_orders.decrement_stock
+        calls = []
+
+        def racing(db, quantities):
+            if not calls:
+                # Outro pedido vende 4 unidades de A entre a leitura e o UPDATE
+                calls.append(1)
+                db.execute(crud_orders.update(crud_orders.Product).where(crud_orders.Product.id == 1).values(stock=1))
+                db.commit()
+            return original(db, quantities)
+
+        with mock.patch.object(crud_orders, "decrement_stock", side_effect=racing):
+            results = crud_orders.create_orders_batch(batch_db, 1, [_order((1, 1)), _order((1, 1))], atomic=False)
+
+        assert [r["order"] is not None for r in results] == [True, False]
+        assert _stock(batch_db) == {1: 0, 2: 5}
+
+
+@pytest.mark.describe("list_orders_out")
+class TestListOrdersOut:
+
+    @pytest.mark.it("Deve montar os mesmos OrderOut da listagem ORM em duas consultas")
+    def test_matches_orm_listing(self, batch_db):
+        from app.crud import orders as crud_orders
+        from app.schemas.orders import OrderOut
+
+        crud_orders.create_orders_batch(batch_db, 1, [_order((1, 1), (2, 2)), _order((2, 1))])
+        batch_db.expunge_all()
+        del batch_db.statements[:]
+
+        fast = crud_orders.list_orders_out(batch_db, 0, 10)
+
+        assert len(batch_db.statements) == 2
+        expected = [OrderOut.model_validate(order) for order in crud_orders.list_orders(batch_db, 0, 10)]
+        assert [order.model_dump() for order in fast] == [order.model_dump() for order in expected]
+        assert crud_orders.list_orders_out(batch_db, 0, 10, client_id=2) == []
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base, User, Client, Product, Order
+from app.crud.pagination import encode_cursor, decode_cursor, next_cursor, set_next_cursor, NEXT_CURSOR_HEADER
+from app.crud.products import PRODUCT_KEY, get_products
+from app.crud.orders import ORDER_KEY, list_orders
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="c@c.com", cpf="1", hashed_password="x")
+    session.add(user)
+    session.flush()
+    client = Client(name="C", address="R", phone_number="9", user_id=user.id)
+    session.add(client)
+    session.flush()
+    session.add_all([Product(description=f"P{i}", sale_price=i, barcode=str(i), section="s", stock=1) for i in range(25)])
+    # Vários pedidos com o mesmo created_at: o id desempata a ordenação
+    same_time = datetime(2024, 1, 1)
+    session.add_all([Order(client_id=client.id, created_at=same_time) for _ in range(7)])
+    session.add_all([Order(client_id=client.id, created_at=datetime(2023, 1, day)) for day in range(1, 6)])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _walk(fetch, limit, key):
+    seen, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        seen.extend(page)
+        cursor = next_cursor(page, limit, key)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.describe("Paginação por cursor")
+class TestPagination:
+
+    @pytest.mark.it("Deve codificar e decodificar o cursor com os tipos das colunas")
+    def test_roundtrip(self):
+        created_at = datetime(2024, 5, 1, 12, 30)
+        cursor = encode_cursor([created_at, 42])
+        assert decode_cursor(cursor, ORDER_KEY) == (created_at, 42)
+
+    @pytest.mark.it("Deve lançar 400 para cursor inválido")
+    @pytest.mark.parametrize("cursor", ["não-é-base64", encode_cursor([1, 2]), encode_cursor(["x"])])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, PRODUCT_KEY)
+        assert exc.value.status_code == 400
+
+    @pytest.mark.it("Deve percorrer todos os produtos sem repetir nem pular")
+    def test_walk_products(self, db):
+        seen = _walk(lambda cursor: get_products(db, limit=10, cursor=cursor), 10, PRODUCT_KEY)
+        assert [product.id for product in seen] == list(range(1, 26))
+
+    @pytest.mark.it("Deve percorrer os pedidos por (created_at, id) mesmo com empates")
+    def test_walk_orders(self, db):
+        seen = _walk(lambda cursor: list_orders(db, limit=3, cursor=cursor), 3, ORDER_KEY)
+        keys = [(order.created_at, order.id) for order in seen]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == 12
+
+    @pytest.mark.it("Deve publicar o cursor no header apenas se a página estiver cheia")
+    def test_set_next_cursor(self, db):
+        full = get_products(db, limit=5)
+        response = Response()
+        set_next_cursor(response, full, 5, PRODUCT_KEY)
+        assert decode_cursor(response.headers[NEXT_CURSOR_HEADER], PRODUCT_KEY) == (5,)
+
+        last = get_products(db, limit=5, cursor=encode_cursor([21]))
+        response = Response()
+        set_next_cursor(response, last, 5, PRODUCT_KEY)
+        assert NEXT_CURSOR_HEADER not in response.headers
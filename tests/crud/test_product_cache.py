@@ -0,0 +1,149 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base, User, Client, Product
+from app.schemas.orders import OrderCreate, OrderItemCreate
+from app.schemas.products import ProductCreate, ProductUpdate
+from app.crud.orders import create_order
+from app.crud.products import (
+    product_cache, product_cache_stats, invalidate_products, get_product_cached, get_products_cached,
+    get_product_by_id, create_product, update_product, delete_product,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="c@c.com", cpf="1", hashed_password="x")
+    session.add(user)
+    session.flush()
+    session.add(Client(name="C", address="R", phone_number="9", user_id=user.id))
+    session.add_all([Product(description=f"P{i}", sale_price=10 + i, barcode=str(i), section="s", stock=5) for i in range(3)])
+    session.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    invalidate_products()
+    session.statements = statements
+    yield session
+    session.close()
+    invalidate_products()
+
+
+@pytest.mark.describe("Cache do catálogo de produtos")
+class TestProductCache:
+
+    @pytest.mark.it("Deve servir a segunda leitura do cache sem consultar o banco")
+    def test_hit_skips_query(self, db):
+        first = get_products_cached(db, 0, 10, "s", None, True)
+        count = len(db.statements)
+        second = get_products_cached(db, 0, 10, "s", None, True)
+
+        assert len(db.statements) == count
+        assert [p.id for p in second] == [p.id for p in first]
+        assert get_product_cached(db, 1).description == "P0"
+        assert get_product_cached(db, 1).description == "P0"
+        assert len(db.statements) == count + 1
+
+    @pytest.mark.it("Deve normalizar a chave dos filtros")
+    def test_normalized_key(self, db):
+        get_products_cached(db, 0, 10, "", 20, None)
+        count = len(db.statements)
+        get_products_cached(db, 0, 10, None, 20.0, None)
+
+        assert len(db.statements) == count
+
+    @pytest.mark.it("Deve invalidar listagens ao criar produto")
+    def test_create_invalidates(self, db):
+        assert len(get_products_cached(db)) == 3
+        create_product(db, ProductCreate(description="Novo", sale_price=1, barcode="n", section="s", stock=1))
+
+        assert len(get_products_cached(db)) == 4
+
+    @pytest.mark.it("Deve invalidar o produto e as listagens ao atualizar")
+    def test_update_invalidates(self, db):
+        get_product_cached(db, 1)
+        get_products_cached(db)
+        update_product(db, get_product_by_id(db, 1), ProductUpdate(description="Alterado"))
+
+        assert get_product_cached(db, 1).description == "Alterado"
+        assert get_products_cached(db)[0].description == "Alterado"
+
+    @pytest.mark.it("Deve invalidar o produto ao remover")
+    def test_delete_invalidates(self, db):
+        get_product_cached(db, 3)
+        delete_product(db, get_product_by_id(db, 3))
+
+        assert get_product_cached(db, 3) is None
+        assert [p.id for p in get_products_cached(db)] == [1, 2]
+
+    @pytest.mark.it("Deve invalidar o estoque após criar pedido")
+    def test_order_invalidates_stock(self, db):
+        assert get_product_cached(db, 1).stock == 5
+        create_order(db, 1, OrderCreate(items=[OrderItemCreate(product_id=1, quantity=5)]))
+
+        product = get_product_cached(db, 1)
+        assert product.stock == 0
+        assert product.is_available is False
+
+    @pytest.mark.it("Não deve gravar leitura iniciada antes de uma invalidação")
+    def test_stale_read_not_stored(self, db, monkeypatch):
+        import app.crud.products as products
+
+        original = products.get_product_by_id
+
+        def racing(session, id):
+            product = original(session, id)
+            invalidate_products([id])
+            return product
+
+        monkeypatch.setattr(products, "get_product_by_id", racing)
+        get_product_cached(db, 1)
+
+        assert product_cache.get(("product", 1)) is None
+
+    @pytest.mark.it("Não deve preencher o cache com leituras de réplicas")
+    def test_replica_read_not_stored(self, db):
+        from app.db.replicas import REPLICA_SESSION
+
+        db.info[REPLICA_SESSION] = True
+        assert get_product_cached(db, 1).description == "P0"
+        assert len(get_products_cached(db)) == 3
+
+        assert product_cache.get(("product", 1)) is None
+        assert len(product_cache) == 0
+
+    @pytest.mark.it("Deve ignorar o cache nas leituras logo após uma escrita do cliente")
+    def test_read_your_writes_skips_cache(self, db):
+        from app.db.replicas import READ_YOUR_WRITES
+
+        # Entrada anterior à escrita, ainda no cache (ex.: de outro worker)
+        get_product_cached(db, 1)
+        db.query(Product).filter(Product.id == 1).update({"description": "Novo"})
+        db.commit()
+
+        db.info[READ_YOUR_WRITES] = True
+        assert get_product_cached(db, 1).description == "Novo"
+
+    @pytest.mark.it("Deve montar os snapshots a partir das colunas, iguais aos validados")
+    def test_snapshots_from_columns(self, db):
+        from app.crud.products import get_products
+        from app.schemas.products import ProductOut
+
+        snapshots = get_products_cached(db, 0, 10, "s", 12, None)
+        expected = [ProductOut.model_validate(p) for p in get_products(db, 0, 10, "s", 12, None)]
+
+        assert [p.model_dump() for p in snapshots] == [p.model_dump() for p in expected]
+
+    @pytest.mark.it("Deve expor estatísticas de acerto")
+    def test_stats(self, db):
+        before = product_cache_stats()
+        get_product_cached(db, 2)
+        get_product_cached(db, 2)
+        after = product_cache_stats()
+
+        assert after["hits"] - before["hits"] == 1
+        assert after["misses"] - before["misses"] == 1
+        assert 0 <= after["hit_ratio"] <= 1
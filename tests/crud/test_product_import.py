@@ -0,0 +1,147 @@
+import io
+import json
+import pytest
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base, Product
+from app.crud.products import product_cache
+from app.crud.product_import import detect_format, import_products, _load_copy, _load_insert
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Product(description="Antigo", sale_price=1, barcode="A", section="s", stock=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _csv(*lines):
+    return io.BytesIO("\n".join(("description,sale_price,barcode,section,stock,expiration_date,image",) + lines).encode())
+
+
+def _ndjson(*rows):
+    return io.BytesIO("\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows).encode())
+
+
+@pytest.mark.describe("Importação em massa de produtos")
+class TestImportProducts:
+
+    @pytest.mark.it("Deve inserir novos produtos e atualizar pelo código de barras")
+    def test_csv_upsert(self, db):
+        result = import_products(db, _csv(
+            "Novo,10.5,B,bebidas,3,2030-01-01,",
+            "Atualizado,2,A,roupas,0,,img.png",
+        ), "csv")
+
+        assert result == {"processed": 2, "imported": 2, "duplicates": 0, "failed": 0, "errors": [], "aborted": None}
+        products = {p.barcode: p for p in db.query(Product).all()}
+        assert products["B"].description == "Novo"
+        assert products["B"].expiration_date.isoformat() == "2030-01-01"
+        assert products["B"].image is None
+        assert products["A"].description == "Atualizado"
+        assert products["A"].is_available is False
+
+    @pytest.mark.it("Deve relatar erros por linha sem interromper a importação")
+    def test_row_errors(self, db):
+        result = import_products(db, _csv(
+            "Ok,1,C,s,1,,",
+            "Sem preço,,D,s,1,,",
+            "Estoque,1,E,s,muitos,,",
+        ), "csv")
+
+        assert result["imported"] == 1
+        assert result["failed"] == 2
+        assert [e["row"] for e in result["errors"]] == [3, 4]
+        assert result["errors"][0]["errors"] == ["sale_price: Input should be a valid number"]
+        assert db.query(Product).filter(Product.barcode == "D").first() is None
+
+    @pytest.mark.it("Deve importar NDJSON e relatar linhas que não são JSON válido")
+    def test_ndjson(self, db):
+        row = {"description": "N", "sale_price": 1, "barcode": "N", "section": "s", "stock": 2}
+        result = import_products(db, _ndjson(row, "{quebrado", "", "[1]"), "ndjson")
+
+        assert result["imported"] == 1
+        assert [e["row"] for e in result["errors"]] == [2, 4]
+        assert result["errors"][0]["errors"][0].startswith("JSON inválido")
+
+    @pytest.mark.it("Deve manter a última ocorrência de um código de barras repetido")
+    def test_duplicates(self, db):
+        result = import_products(db, _csv("Primeiro,1,X,s,1,,", "Segundo,2,X,s,1,,", "Outro,1,Y,s,1,,"), "csv")
+
+        assert db.query(Product).filter(Product.barcode == "X").one().description == "Segundo"
+        assert result["processed"] == 3
+        assert result["imported"] == 2
+        assert result["duplicates"] == 1
+
+    @pytest.mark.it("Deve gravar e confirmar em blocos e limitar o relatório de erros")
+    def test_chunks(self, db):
+        rows = [f"P{i},1,P{i},s,1,," for i in range(7)] + [",,,,,," for _ in range(5)]
+        with mock.patch.object(db, "commit", wraps=db.commit) as commit:
+            result = import_products(db, _csv(*rows), "csv", chunk_size=3, max_errors=2)
+
+        assert commit.call_count == 3
+        assert result["imported"] == 7
+        assert result["failed"] == 5
+        assert len(result["errors"]) == 2
+
+    @pytest.mark.it("Deve desfazer o bloco recusado pelo banco e relatar o que já foi gravado")
+    def test_chunk_db_error(self, db):
+        rows = [f"P{i},1,P{i},s,1,," for i in range(7)]
+        load = _load_insert
+        calls = []
+
+        def failing_load(session, chunk):
+            calls.append(chunk[0]["seq"])
+            if len(calls) == 2:
+                load(session, chunk)
+                raise OperationalError("INSERT", {}, Exception("disk full\nDETAIL: ..."))
+            return load(session, chunk)
+
+        with mock.patch("app.crud.product_import._load_insert", side_effect=failing_load):
+            result = import_products(db, _csv(*rows), "csv", chunk_size=3)
+
+        assert calls == [2, 5]
+        assert result["imported"] == 3
+        assert result["processed"] == 6
+        assert result["aborted"] == {"first_row": 5, "last_row": 7, "error": "Exception: disk full"}
+        assert sorted(p.barcode for p in db.query(Product).all()) == ["A", "P0", "P1", "P2"]
+
+    @pytest.mark.it("Deve invalidar o cache do catálogo após importar")
+    def test_invalidates_cache(self, db):
+        product_cache.set(("products", None, None, None, 0, 10, None), ())
+        import_products(db, _csv("Novo,1,Z,s,1,,"), "csv")
+
+        assert product_cache.get(("products", None, None, None, 0, 10, None)) is None
+
+    @pytest.mark.it("Postgres: deve usar COPY na staging e upsert com ON CONFLICT")
+    def test_copy_path(self):
+        db = mock.MagicMock()
+        cursor = db.connection.return_value.connection.dbapi_connection.cursor.return_value
+        row = {"seq": 2, "description": 'a "b"', "sale_price": 1.5, "barcode": "B", "section": "",
+               "stock": 3, "expiration_date": None, "image": None, "is_available": True}
+
+        db.execute.return_value.rowcount = 1
+        with mock.patch("app.crud.product_import.staging_table.create"):
+            assert _load_copy(db, [row]) == 1
+
+        sql, buffer = cursor.copy_expert.call_args.args
+        assert sql.startswith("COPY product_import_staging (seq, description, sale_price")
+        assert sql.endswith("WITH (FORMAT csv, FORCE_NULL (expiration_date, image))")
+        assert buffer.getvalue() == '2,"a ""b""",1.5,"B","",3,"","",True\r\n'
+        upsert = str(db.execute.call_args.args[0])
+        assert "SELECT DISTINCT ON (barcode)" in upsert
+        assert "ORDER BY barcode, seq DESC" in upsert
+        assert "ON CONFLICT (barcode) DO UPDATE SET description = EXCLUDED.description" in upsert
+
+    @pytest.mark.it("Deve deduzir o formato pelo nome ou content type")
+    def test_detect_format(self):
+        assert detect_format("catalogo.CSV", None) == "csv"
+        assert detect_format("catalogo.jsonl", None) == "ndjson"
+        assert detect_format(None, "application/x-ndjson") == "ndjson"
+        assert detect_format("catalogo.xlsx", "application/octet-stream") is None
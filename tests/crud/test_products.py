@@ -36,7 +36,8 @@ class TestGetProducts:
         mock_db.query.return_value = mock_query
         mock_query.filter.return_value = mock_filtered
         mock_filtered.filter.return_value = mock_filtered  # encadeamento
-        mock_filtered.offset.return_value.limit.return_value.all.return_value = expected_products
+        mock_filtered.order_by.return_value = mock_filtered
+        mock_filtered.limit.return_value.all.return_value = expected_products
 
         result = get_products(mock_db, skip=0, limit=10, category="livros", price=100.0, available=True)
 
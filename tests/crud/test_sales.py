@@ -0,0 +1,191 @@
+import pytest
+from datetime import date, datetime
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base, User, Client, Product, Order, OrderItem, SalesSummary
+from app.crud.sales import add_order, apply_sales, rebuild_sales_summary, sales_by_day, sales_by_product, sales_by_section
+from app.crud.orders import create_order, create_orders_batch, delete_order, get_order_by_id, update_order
+from app.schemas.orders import OrderCreate, OrderUpdate
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="c@c.com", cpf="1", hashed_password="x")
+    session.add(user)
+    session.flush()
+    session.add(Client(name="C", address="R", phone_number="9", user_id=user.id))
+    session.add_all([
+        Product(description="A", sale_price=2.0, barcode="a", section="roupas", stock=100),
+        Product(description="B", sale_price=3.0, barcode="b", section="roupas", stock=100),
+        Product(description="C", sale_price=10.0, barcode="c", section="bebidas", stock=100),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _order(*items):
+    return OrderCreate(items=[{"product_id": product_id, "quantity": quantity} for product_id, quantity in items])
+
+
+def _summary(db):
+    db.expire_all()
+    return {(row.day, row.product_id): (row.orders, row.quantity, row.revenue) for row in db.scalars(select(SalesSummary))}
+
+
+def _rebuilt(db):
+    incremental = _summary(db)
+    rebuild_sales_summary(db)
+    return incremental, _summary(db)
+
+
+@pytest.mark.describe("add_order")
+class TestAddOrder:
+    @pytest.mark.it("Deve somar itens do mesmo produto e contar o pedido uma vez")
+    def test_add_order_groups_items(self):
+        deltas = add_order({}, datetime(2024, 5, 1, 23, 59), [(1, 2, 5.0), (1, 1, 5.0), (2, 1, 3.0)])
+
+        assert deltas == {(date(2024, 5, 1), 1): [1, 3, 15.0], (date(2024, 5, 1), 2): [1, 1, 3.0]}
+
+    @pytest.mark.it("Deve descontar o pedido com sign=-1")
+    def test_add_order_negative(self):
+        deltas = add_order({}, datetime(2024, 5, 1), [(1, 2, 5.0)])
+        add_order(deltas, datetime(2024, 5, 1), [(1, 2, 5.0)], sign=-1)
+
+        assert deltas == {(date(2024, 5, 1), 1): [0, 0, 0.0]}
+
+    @pytest.mark.it("Deve ignorar pedidos sem created_at")
+    def test_add_order_without_date(self):
+        assert add_order({}, None, [(1, 2, 5.0)]) == {}
+
+
+@pytest.mark.describe("Resumo de vendas incremental")
+class TestIncrementalSummary:
+    @pytest.mark.it("Deve atualizar o resumo ao criar pedidos")
+    def test_create_order_updates_summary(self, db):
+        create_order(db, 1, _order((1, 2), (1, 1), (3, 1)))
+        create_order(db, 1, _order((1, 1)))
+
+        today = datetime.utcnow().date()
+        assert _summary(db) == {(today, 1): (2, 4, 8.0), (today, 3): (1, 1, 10.0)}
+
+    @pytest.mark.it("Deve atualizar o resumo do lote inteiro em um único comando")
+    def test_batch_updates_summary(self, db):
+        create_orders_batch(db, 1, [_order((1, 1), (2, 2)) for _ in range(3)])
+
+        incremental, rebuilt = _rebuilt(db)
+        assert incremental == rebuilt
+        assert incremental[(datetime.utcnow().date(), 2)] == (3, 6, 18.0)
+
+    @pytest.mark.it("Deve descontar pedidos cancelados e devolvê-los ao reativar")
+    def test_cancel_and_reactivate(self, db):
+        order = create_order(db, 1, _order((1, 1), (3, 2)))
+        create_order(db, 1, _order((3, 1)))
+
+        update_order(db, get_order_by_id(db, order.id), OrderUpdate(status="cancelado"))
+        today = datetime.utcnow().date()
+        assert _summary(db) == {(today, 3): (1, 1, 10.0)}
+        assert _rebuilt(db)[1] == {(today, 3): (1, 1, 10.0)}
+
+        update_order(db, get_order_by_id(db, order.id), OrderUpdate(status="pending"))
+        incremental, rebuilt = _rebuilt(db)
+        assert incremental == rebuilt == {(today, 1): (1, 1, 2.0), (today, 3): (2, 3, 30.0)}
+
+    @pytest.mark.it("Deve descontar pedidos removidos, exceto os já cancelados")
+    def test_delete_order(self, db):
+        first = create_order(db, 1, _order((1, 1)))
+        second = create_order(db, 1, _order((2, 1)))
+        update_order(db, get_order_by_id(db, second.id), OrderUpdate(status="cancelled"))
+
+        delete_order(db, get_order_by_id(db, first.id))
+        delete_order(db, get_order_by_id(db, second.id))
+
+        assert _summary(db) == {}
+
+    @pytest.mark.it("Deve remover só os pares (dia, produto) descontados que ficaram sem pedidos")
+    def test_apply_sales_removes_discounted_pairs(self, db):
+        first, second = date(2024, 5, 1), date(2024, 5, 2)
+        db.add_all([
+            SalesSummary(day=first, product_id=1, orders=1, quantity=1, revenue=2.0),
+            SalesSummary(day=second, product_id=2, orders=1, quantity=1, revenue=3.0),
+            SalesSummary(day=first, product_id=2, orders=0, quantity=0, revenue=0.0),
+        ])
+        db.commit()
+
+        apply_sales(db, {(first, 1): [-1, -1, -2.0], (second, 2): [-1, -1, -3.0]})
+        db.commit()
+
+        assert _summary(db) == {(first, 2): (0, 0, 0.0)}
+
+
+@pytest.mark.describe("rebuild_sales_summary")
+class TestRebuildSalesSummary:
+    @pytest.mark.it("Deve recalcular apenas os dias do período")
+    def test_rebuild_period(self, db):
+        for day, product_id in [(1, 1), (2, 1), (2, 2), (3, 3)]:
+            order = Order(client_id=1, created_at=datetime(2024, 5, day, 12))
+            db.add(order)
+            db.flush()
+            db.add(OrderItem(order_id=order.id, product_id=product_id, quantity=1, price=1.0))
+        db.add(SalesSummary(day=date(2024, 5, 1), product_id=1, orders=9, quantity=9, revenue=9.0))
+        db.commit()
+
+        rows = rebuild_sales_summary(db, start=date(2024, 5, 2), end=date(2024, 5, 3))
+
+        assert rows == 2
+        assert _summary(db) == {
+            (date(2024, 5, 1), 1): (9, 9, 9.0),
+            (date(2024, 5, 2), 1): (1, 1, 1.0),
+            (date(2024, 5, 2), 2): (1, 1, 1.0),
+        }
+
+    @pytest.mark.it("Deve ignorar pedidos antigos sem created_at, também ao cancelá-los")
+    def test_rebuild_without_date(self, db):
+        create_order(db, 1, _order((1, 1)))
+        legacy = Order(client_id=1)
+        db.add(legacy)
+        db.flush()
+        legacy.created_at = None
+        db.add(OrderItem(order_id=legacy.id, product_id=2, quantity=1, price=3.0))
+        db.commit()
+
+        today = datetime.utcnow().date()
+        assert rebuild_sales_summary(db) == 1
+        update_order(db, get_order_by_id(db, legacy.id), OrderUpdate(status="cancelado"))
+        delete_order(db, get_order_by_id(db, legacy.id))
+        assert _summary(db) == {(today, 1): (1, 1, 2.0)}
+
+
+@pytest.mark.describe("Relatórios de vendas")
+class TestSalesReports:
+    @pytest.fixture
+    def sales(self, db):
+        db.add_all([
+            SalesSummary(day=date(2024, 5, 1), product_id=1, orders=2, quantity=4, revenue=8.0),
+            SalesSummary(day=date(2024, 5, 1), product_id=3, orders=1, quantity=1, revenue=10.0),
+            SalesSummary(day=date(2024, 5, 2), product_id=2, orders=3, quantity=5, revenue=15.0),
+            SalesSummary(day=date(2024, 5, 3), product_id=1, orders=1, quantity=1, revenue=2.0),
+        ])
+        db.commit()
+        return db
+
+    @pytest.mark.it("Deve agregar por dia no período [start, end)")
+    def test_sales_by_day(self, sales):
+        rows = sales_by_day(sales, start=date(2024, 5, 1), end=date(2024, 5, 3))
+
+        assert [tuple(row) for row in rows] == [(date(2024, 5, 1), 5, 18.0), (date(2024, 5, 2), 5, 15.0)]
+
+    @pytest.mark.it("Deve ordenar produtos pela receita e filtrar por seção")
+    def test_sales_by_product(self, sales):
+        assert [row.product_id for row in sales_by_product(sales)] == [2, 1, 3]
+        rows = sales_by_product(sales, section="roupas", limit=1)
+        assert [tuple(row) for row in rows] == [(2, "B", "roupas", 3, 5, 15.0)]
+
+    @pytest.mark.it("Deve agregar por seção")
+    def test_sales_by_section(self, sales):
+        rows = sales_by_section(sales)
+
+        assert [tuple(row) for row in rows] == [("roupas", 10, 25.0), ("bebidas", 1, 10.0)]
@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from app.db.base import Base, Client, Product, Order, OrderItem
+from app.db.indexes import missing_indexes, apply_indexes, _concurrently
+
+
+def _index(model, name):
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+def _pg_ddl(index):
+    return str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.mark.describe("Índices das consultas frequentes")
+class TestIndexes:
+
+    @pytest.mark.it("Deve declarar os índices compostos e de chave estrangeira nos modelos")
+    def test_declared_indexes(self):
+        assert [c.name for c in _index(Product, "ix_products_section_available_price").columns] == ["section", "is_available", "sale_price"]
+        assert [c.name for c in _index(Order, "ix_orders_client_created_id").columns] == ["client_id", "created_at", "id"]
+        assert [c.name for c in _index(Order, "ix_orders_created_id").columns] == ["created_at", "id"]
+        assert OrderItem.__table__.c.order_id.index
+        assert Client.__table__.c.user_id.index
+        assert Client.__table__.c.phone_number.index
+
+    @pytest.mark.it("Deve paginar todos os pedidos (administradores) pelo índice, sem ordenar a tabela")
+    def test_admin_cursor_uses_index(self, engine):
+        from sqlalchemy import text
+        from sqlalchemy.orm import Session
+        from app.crud.orders import ORDER_KEY
+        from app.crud.pagination import encode_cursor, paginate
+
+        with Session(engine) as db:
+            cursor = encode_cursor((datetime(2024, 1, 1), 10))
+            query = paginate(db.query(Order.id), ORDER_KEY, 0, 10, cursor)
+            sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = " ".join(str(row[-1]) for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+        assert "ix_orders_created_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.it("Deve declarar índice parcial de produtos disponíveis")
+    def test_partial_index(self):
+        assert "WHERE is_available" in _pg_ddl(_index(Product, "ix_products_available_id"))
+
+    @pytest.mark.it("Deve criar apenas os índices que faltam em um banco existente")
+    def test_apply_missing(self, engine):
+        with engine.begin() as conn:
+            _index(Order, "ix_orders_client_created_id").drop(conn)
+            _index(OrderItem, "ix_order_items_order_id").drop(conn)
+
+        assert [index.name for index in missing_indexes(engine)] == ["ix_orders_client_created_id", "ix_order_items_order_id"]
+        assert apply_indexes(engine, dry_run=True) == ["ix_orders_client_created_id", "ix_order_items_order_id"]
+        assert missing_indexes(engine) != []
+
+        assert apply_indexes(engine) == ["ix_orders_client_created_id", "ix_order_items_order_id"]
+        assert missing_indexes(engine) == []
+        assert apply_indexes(engine) == []
+
+    @pytest.mark.it("Deve ignorar índices restritos ao Postgres e tabelas inexistentes")
+    def test_skip_other_dialects(self):
+        engine = create_engine("sqlite://")
+        Client.__table__.create(engine)
+
+        assert missing_indexes(engine) == []
+        names = {index["name"] for index in inspect(engine).get_indexes("clients")}
+        assert "ix_clients_name_trgm" not in names
+
+    @pytest.mark.it("Deve usar CREATE INDEX CONCURRENTLY apenas durante a aplicação no Postgres")
+    def test_concurrently(self):
+        index = _index(Order, "ix_orders_client_created_id")
+
+        with _concurrently(index, "postgresql"):
+            assert _pg_ddl(index).startswith("CREATE INDEX CONCURRENTLY")
+        assert not _pg_ddl(index).startswith("CREATE INDEX CONCURRENTLY")
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics, instrument_pool
+
+
+def _engine(**kwargs):
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, **kwargs)
+    return engine, instrument_pool(engine.pool, PoolMetrics())
+
+
+@pytest.mark.describe("PoolMetrics")
+class TestPoolMetrics:
+
+    @pytest.mark.it("Deve contar checkouts, checkins e conexões em uso")
+    def test_checkout_checkin(self):
+        engine, metrics = _engine(pool_size=2, max_overflow=0)
+
+        conn = engine.connect()
+        during = metrics.snapshot(engine.pool)
+        conn.close()
+        after = metrics.snapshot(engine.pool)
+
+        assert during["checkouts"] == 1
+        assert during["checked_out"] == 1
+        assert after["checkins"] == 1
+        assert after["checked_out"] == 0
+        assert after["idle"] == 1
+        assert after["wait_seconds"]["count"] == 1
+
+    @pytest.mark.it("Deve contar overflow e timeouts de checkout")
+    def test_overflow_and_timeout(self):
+        engine, metrics = _engine(pool_size=1, max_overflow=1, pool_timeout=0.01)
+
+        first = engine.connect()
+        second = engine.connect()
+        assert metrics.snapshot(engine.pool)["overflow"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["timeouts"] == 1
+        assert snapshot["wait_seconds"]["count"] == 3
+        assert snapshot["wait_seconds"]["buckets"]["+Inf"] == 3
+        first.close()
+        second.close()
+
+    @pytest.mark.it("Deve manter as métricas após engine.dispose()")
+    def test_dispose_keeps_metrics(self):
+        engine, metrics = _engine(pool_size=1, max_overflow=0)
+        engine.connect().close()
+
+        engine.dispose()
+        engine.connect().close()
+
+        assert engine.pool.metrics is metrics
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["checkouts"] == 2
+        assert snapshot["connects"] == 2
+        assert snapshot["wait_seconds"]["count"] == 2
+
+    @pytest.mark.it("Deve acumular o histograma de espera por bucket")
+    def test_wait_histogram(self):
+        metrics = PoolMetrics(buckets=(0.01, 0.1))
+        metrics.observe_wait(0.005)
+        metrics.observe_wait(0.05)
+        metrics.observe_wait(1.0)
+
+        buckets = metrics.snapshot()["wait_seconds"]["buckets"]
+        assert buckets == {"0.01": 1, "0.1": 2, "+Inf": 3}
@@ -0,0 +1,76 @@
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.db.profiler import QueryProfile, SQLProfilerMiddleware, fingerprint, profile_engine, record_queries
+
+
+@pytest.fixture
+def client():
+    engine = profile_engine(create_engine("sqlite://"), slow_query_ms=0)
+    app = FastAPI()
+    app.add_middleware(SQLProfilerMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/items/{id}")
+    def get_item(id: int):
+        with engine.connect() as conn:
+            for i in range(id):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"id": id}
+
+    client = TestClient(app)
+    client.engine = engine
+    return client
+
+
+@pytest.mark.describe("Profiler de SQL")
+class TestProfiler:
+
+    @pytest.mark.it("Deve normalizar literais, parâmetros e listas IN")
+    def test_fingerprint(self):
+        assert fingerprint("SELECT * FROM t WHERE id = 5 AND name = 'a''b'") == "SELECT * FROM t WHERE id = ? AND name = ?"
+        assert fingerprint("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)\n  AND x = :x") == "SELECT * FROM t WHERE id IN (...) AND x = ?"
+        assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (...)"
+        assert fingerprint("SELECT col_1, c::text FROM t LIMIT $1") == "SELECT col_1, c::text FROM t LIMIT ?"
+
+    @pytest.mark.it("Deve agrupar por fingerprint e apontar repetições")
+    def test_profile(self):
+        profile = QueryProfile()
+        for i in range(4):
+            profile.record(f"SELECT * FROM items WHERE order_id = {i}", 0.001)
+        profile.record("SELECT * FROM orders", 0.002)
+
+        assert profile.count == 5
+        assert profile.repeated(3) == [("SELECT * FROM items WHERE order_id = ?", 4)]
+        assert profile.repeated(5) == []
+
+    @pytest.mark.it("Deve registrar consultas lentas e prováveis N+1 com a rota")
+    def test_logs(self, client, caplog):
+        with caplog.at_level(logging.WARNING, logger="app.db.profiler"):
+            client.get("/items/3")
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any(m.startswith("Consulta lenta") and "/items/{id}: SELECT ?" in m for m in messages)
+        assert "Provável N+1 em GET /items/{id}: 3x SELECT ?" in messages
+
+    @pytest.mark.it("Não deve apontar N+1 abaixo do limite")
+    def test_below_threshold(self, client, caplog):
+        with caplog.at_level(logging.WARNING, logger="app.db.profiler"):
+            client.get("/items/2")
+
+        assert not any("N+1" in record.getMessage() for record in caplog.records)
+
+    @pytest.mark.it("Deve verificar o orçamento de consultas de um bloco")
+    def test_budget(self, client, query_budget):
+        with query_budget(client.engine, 2) as profile:
+            client.get("/items/2")
+        assert profile.count == 2
+
+        with pytest.raises(AssertionError, match="Orçamento de 1 consultas excedido"):
+            with query_budget(client.engine, 1):
+                client.get("/items/2")
+
+        with record_queries(client.engine) as profile:
+            pass
+        assert profile.count == 0
@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from app.db.replicas import (
+    WRITE_COOKIE, RecentWrites, ReadYourWritesMiddleware, Replica, ReplicaSet, replica_urls, wrote_recently,
+)
+
+
+def _replica(name, healthy=True, lag=0.0, checked_at=0.0):
+    replica = Replica(name, engine=None, session_factory=None)
+    replica.healthy, replica.lag, replica.checked_at = healthy, lag, checked_at
+    return replica
+
+
+@pytest.mark.describe("Réplicas de leitura")
+class TestReplicaSet:
+
+    @pytest.mark.it("Deve ler a lista de URLs separadas por vírgula")
+    def test_replica_urls(self):
+        assert replica_urls("") == []
+        assert replica_urls(" postgresql://a , postgresql://b,") == ["postgresql://a", "postgresql://b"]
+
+    @pytest.mark.it("Deve alternar em round-robin entre as réplicas utilizáveis")
+    def test_round_robin(self):
+        replicas = ReplicaSet([_replica("a"), _replica("b")], max_lag=5, stale_after=15, timer=lambda: 1)
+
+        assert [replicas.pick().name for _ in range(4)] == ["a", "b", "a", "b"]
+        assert replicas.replica_reads == 4
+
+    @pytest.mark.it("Deve ignorar réplicas fora do ar, atrasadas ou sem verificação recente")
+    def test_fallback(self):
+        replicas = ReplicaSet(
+            [_replica("down", healthy=False), _replica("lagging", lag=10), _replica("stale", checked_at=-100), _replica("ok")],
+            max_lag=5, stale_after=15, timer=lambda: 1,
+        )
+        assert {replicas.pick().name for _ in range(4)} == {"ok"}
+
+        replicas.replicas[-1].lag = 6
+        assert replicas.pick() is None
+        assert replicas.primary_reads == 1
+
+    @pytest.mark.it("Deve contar as leituras sem perder incrementos entre threads")
+    def test_counters_threadsafe(self):
+        replicas = ReplicaSet([_replica("a")], max_lag=5, stale_after=15, timer=lambda: 1)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: replicas.pick(), range(4000)))
+            list(executor.map(lambda _: replicas.increment("primary_reads"), range(4000)))
+
+        assert replicas.snapshot()["replica_reads"] == 4000
+        assert replicas.snapshot()["primary_reads"] == 4000
+
+    @pytest.mark.it("Não deve usar réplicas ainda não verificadas")
+    def test_unchecked(self):
+        replicas = ReplicaSet([Replica("new", engine=None, session_factory=None)], max_lag=5, stale_after=15)
+        assert replicas.pick() is None
+
+    @pytest.mark.it("Deve verificar saúde e atraso de cada réplica")
+    def test_check(self):
+        healthy = Replica("ok", create_engine("sqlite://"), None)
+        broken = Replica("broken", mock.MagicMock(connect=mock.MagicMock(side_effect=OSError("recusada"))), None)
+        replicas = ReplicaSet([healthy, broken], max_lag=5, stale_after=15)
+
+        replicas.check()
+
+        assert (healthy.healthy, healthy.lag) == (True, 0.0)
+        assert broken.healthy is False and broken.last_error == "OSError: recusada"
+        assert replicas.pick() is healthy
+
+    @pytest.mark.it("Deve verificar as réplicas periodicamente em segundo plano")
+    def test_monitor(self):
+        replicas = ReplicaSet([], max_lag=5, stale_after=15)
+        replicas.check = mock.MagicMock()
+        sleep = mock.AsyncMock(side_effect=[None, asyncio.CancelledError()])
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(replicas.monitor(5, sleep=sleep))
+
+        assert replicas.check.call_count == 2
+        sleep.assert_awaited_with(5)
+
+
+@pytest.fixture
+def client():
+    recent_writes = RecentWrites(window=5)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, recent_writes=recent_writes)
+
+    @app.get("/items")
+    def read(request: Request):
+        return {"primary": wrote_recently(request, recent_writes)}
+
+    @app.post("/items")
+    def write():
+        return {}
+
+    @app.post("/fail", status_code=400)
+    def fail():
+        return {}
+
+    return TestClient(app)
+
+
+@pytest.mark.describe("Leia-o-que-escreveu")
+class TestReadYourWrites:
+
+    @pytest.mark.it("Deve mandar ao primário as leituras de quem escreveu há pouco")
+    def test_after_write(self, client):
+        alice, bob = {"Authorization": "Bearer alice"}, {"Authorization": "Bearer bob"}
+        assert client.get("/items", headers=alice).json() == {"primary": False}
+
+        response = client.post("/items", headers=alice)
+
+        assert WRITE_COOKIE in response.cookies
+        client.cookies.clear()
+        assert client.get("/items", headers=alice).json() == {"primary": True}
+        assert client.get("/items", headers=bob).json() == {"primary": False}
+
+    @pytest.mark.it("Deve reconhecer o cookie da escrita feita em outro worker")
+    def test_cookie(self, client):
+        import time
+        client.cookies.set(WRITE_COOKIE, str(time.time() + 5))
+        assert client.get("/items").json() == {"primary": True}
+
+        client.cookies.set(WRITE_COOKIE, str(time.time() - 1))
+        assert client.get("/items").json() == {"primary": False}
+
+    @pytest.mark.it("Não deve considerar escritas que falharam")
+    def test_failed_write(self, client):
+        response = client.post("/fail", headers={"Authorization": "Bearer carol"})
+
+        assert WRITE_COOKIE not in response.cookies
+        assert client.get("/items", headers={"Authorization": "Bearer carol"}).json() == {"primary": False}
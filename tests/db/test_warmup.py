@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import pytest
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from app.db.warmup import PoolReadiness, warm_up, warm_pool
+
+
+@pytest.mark.describe("Aquecimento do pool")
+class TestWarmUp:
+
+    @pytest.mark.it("Deve deixar as conexões abertas ociosas no pool")
+    def test_warm_pool(self):
+        engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+
+        warm_pool(engine, 3)
+
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+
+    @pytest.mark.it("Deve marcar o worker como pronto após aquecer")
+    def test_ready(self):
+        engine = create_engine("sqlite://", poolclass=QueuePool)
+        state = PoolReadiness()
+
+        assert asyncio.run(warm_up(engine, connections=2, state=state)) is True
+        assert state.ready is True
+        assert state.attempts == 1
+
+    @pytest.mark.it("Deve tentar de novo com backoff exponencial assíncrono")
+    def test_backoff(self, caplog):
+        engine = mock.MagicMock()
+        engine.connect.side_effect = [ConnectionError("recusada")] * 3 + [mock.MagicMock()] * 2
+        sleep = mock.AsyncMock()
+        state = PoolReadiness()
+
+        with caplog.at_level(logging.WARNING, logger="app.db.warmup"):
+            result = asyncio.run(warm_up(engine, connections=2, initial_delay=1, max_delay=3, state=state, sleep=sleep))
+
+        assert result is True
+        assert [c.args[0] for c in sleep.await_args_list] == [1, 2, 3]
+        assert len(caplog.records) == 3
+        assert "recusada" in caplog.records[0].getMessage()
+        assert state.attempts == 4
+        assert state.last_error is None
+
+    @pytest.mark.it("Deve desistir após max_attempts sem marcar como pronto")
+    def test_max_attempts(self):
+        engine = mock.MagicMock()
+        engine.connect.side_effect = ConnectionError("recusada")
+        state = PoolReadiness()
+
+        result = asyncio.run(warm_up(engine, max_attempts=2, state=state, sleep=mock.AsyncMock()))
+
+        assert result is False
+        assert state.ready is False
+        assert "recusada" in state.last_error